@@ -1,9 +1,10 @@
 # backend/config/settings.py
 
-import os
 from datetime import timedelta
 from pathlib import Path
 
+from decouple import config
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # SECURITY WARNING: keep the secret key used in production secret!
@@ -42,6 +43,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -65,12 +67,83 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database
-DATABASES = {
-    'default': {
+# DB_MOTOR=sqlite (por defecto) o postgresql; los valores se leen del entorno
+# o de un archivo .env junto a manage.py (python-decouple)
+DB_MOTOR = config('DB_MOTOR', default='sqlite')
+
+if DB_MOTOR == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NOMBRE', default='agromax'),
+            'USER': config('DB_USUARIO', default='agromax'),
+            'PASSWORD': config('DB_CLAVE', default=''),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PUERTO', default=5432, cast=int),
+            # Conexiones persistentes por proceso, verificadas antes de reutilizarlas.
+            # Con un pool externo (pgbouncer en modo transaction) usar DB_CONN_MAX_AGE=0.
+            'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+            'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+            'OPTIONS': {
+                'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
+            },
+            'TEST': {'NAME': config('DB_NOMBRE_PRUEBAS', default='test_agromax')},
+        }
+    }
+elif DB_MOTOR == 'sqlite':
+    # core.db.sqlite3 abre las transacciones con BEGIN IMMEDIATE (con reintentos)
+    DATABASES = {
+        'default': {
+            'ENGINE': 'core.db.sqlite3',
+            'NAME': config('DB_NOMBRE', default=str(BASE_DIR / 'db.sqlite3')),
+            'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=0, cast=int),
+        }
+    }
+else:
+    raise ValueError(f'DB_MOTOR debe ser sqlite o postgresql, no {DB_MOTOR!r}')
+
+# Réplica de solo lectura para reportes, exportaciones y listados
+# (core.db.router). Con PostgreSQL, DB_REPLICA es el host de una réplica por
+# streaming; con SQLite, la ruta de la copia que mantiene
+# `manage.py sincronizar_replica --cada N`. Vacío = todo va a la primaria.
+DB_REPLICA = config('DB_REPLICA', default='')
+
+if DB_REPLICA and DB_MOTOR == 'postgresql':
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': DB_REPLICA,
+        'PORT': config('DB_REPLICA_PUERTO', default=DATABASES['default']['PORT'], cast=int),
+        'TEST': {'MIRROR': 'default'},
+    }
+elif DB_REPLICA:
+    DATABASES['replica'] = {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': f'file:{DB_REPLICA}?mode=ro',
+        # Conexión nueva por petición: así se ve la última copia sincronizada
+        'CONN_MAX_AGE': 0,
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_ROUTERS = ['core.db.router.RouterReplica']
+
+# Segundos que las lecturas de un usuario van a la primaria después de que
+# escribió; debe cubrir el retraso de la réplica (el intervalo de
+# sincronizar_replica con SQLite)
+REPLICA_FIJAR_SEGUNDOS = config('REPLICA_FIJAR_SEGUNDOS', default=60, cast=int)
+
+# Perfil de producción de SQLite, aplicado a cada conexión nueva
+# (core.db.conexiones.aplicar_pragmas); no afecta a PostgreSQL
+SQLITE_PRAGMAS = {
+    'journal_mode': config('SQLITE_JOURNAL_MODE', default='WAL'),
+    'synchronous': config('SQLITE_SYNCHRONOUS', default='NORMAL'),
+    'busy_timeout': config('SQLITE_BUSY_TIMEOUT_MS', default=5000, cast=int),
+    'cache_size': -config('SQLITE_CACHE_KIB', default=64 * 1024, cast=int),
+    'mmap_size': config('SQLITE_MMAP_BYTES', default=256 * 1024 * 1024, cast=int),
+    'temp_store': 'MEMORY',
 }
+# Reintentos de BEGIN IMMEDIATE si el bloqueo sigue ocupado tras busy_timeout
+SQLITE_REINTENTOS_ESCRITURA = config('SQLITE_REINTENTOS_ESCRITURA', default=5, cast=int)
+SQLITE_ESPERA_REINTENTO = config('SQLITE_ESPERA_REINTENTO', default=0.05, cast=float)
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -108,7 +181,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.JWTRolAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -128,8 +201,15 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    # Tokens con claims de rol y versión de permisos (core.authentication)
+    'TOKEN_OBTAIN_SERIALIZER': 'core.serializers.TokenRolObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'core.serializers.TokenRolRefreshSerializer',
 }
 
+# Segundos que cada proceso confía en la versión de permisos de un usuario
+# antes de volver a consultarla (revocación de tokens tras un cambio de rol)
+PERMISOS_CACHE_SEGUNDOS = config('PERMISOS_CACHE_SEGUNDOS', default=60, cast=int)
+
 # CORS Settings (desarrollo)
 CORS_ALLOWED_ORIGINS = [
     'http://localhost:5173',  # Vite default port
@@ -138,4 +218,49 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 # Usuario personalizado
-AUTH_USER_MODEL = 'core.Usuario'
\ No newline at end of file
+AUTH_USER_MODEL = 'core.Usuario'
+
+# Cálculo de nómina: procesos usados para liquidar una quincena (1 = en serie)
+NOMINA_PROCESOS = config('NOMINA_PROCESOS', default=1, cast=int)
+
+# Auditoría: los eventos se escriben primero en un spool local y un hilo del
+# proceso los inserta por lotes (core.services.auditoria). Con
+# AUDITORIA_ASINCRONA=0 se insertan en la misma petición.
+AUDITORIA_ASINCRONA = config('AUDITORIA_ASINCRONA', default=True, cast=bool)
+AUDITORIA_LOTE = config('AUDITORIA_LOTE', default=100, cast=int)
+AUDITORIA_INTERVALO = config('AUDITORIA_INTERVALO', default=2.0, cast=float)
+AUDITORIA_SPOOL_DIR = config('AUDITORIA_SPOOL_DIR', default=str(BASE_DIR / 'auditoria_spool'))
+AUDITORIA_SEGMENTO_BYTES = 4 * 1024 * 1024
+AUDITORIA_FSYNC = config('AUDITORIA_FSYNC', default=False, cast=bool)
+# Entradas más antiguas que la retención se mueven con `manage.py archivar_auditoria`
+# a archivos comprimidos por día; /api/auditoria/?incluir_archivo=1 las incluye
+AUDITORIA_RETENCION_DIAS = config('AUDITORIA_RETENCION_DIAS', default=180, cast=int)
+AUDITORIA_ARCHIVO_DIR = config('AUDITORIA_ARCHIVO_DIR', default=str(BASE_DIR / 'auditoria_archivo'))
+
+# Cache de respuestas de catálogos. Las claves llevan las versiones de los
+# catálogos (core.services.versiones), así que un cambio nunca sirve datos viejos.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'catalogos': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'agromax-catalogos',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+    # Usuarios fijados a la primaria después de escribir (core.db.router): la
+    # marca la pone el proceso que atendió la escritura y la leen todos, así
+    # que no puede ser LocMem. Por defecto, archivos en disco (un servidor);
+    # con varios servidores, una caché común, p. ej.
+    # REPLICA_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+    # REPLICA_CACHE_LOCATION=redis://127.0.0.1:6379/1
+    'replica': {
+        'BACKEND': config(
+            'REPLICA_CACHE_BACKEND',
+            default='django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': config('REPLICA_CACHE_LOCATION', default=str(BASE_DIR / 'cache_replica')),
+        'TIMEOUT': REPLICA_FIJAR_SEGUNDOS,
+    },
+}
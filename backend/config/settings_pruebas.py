@@ -0,0 +1,18 @@
+# backend/config/settings_pruebas.py
+
+import tempfile
+
+from .settings import *  # noqa: F401,F403
+
+# Pruebas: auditoría en la misma petición y archivos fuera del proyecto
+AUDITORIA_ASINCRONA = False
+AUDITORIA_SPOOL_DIR = tempfile.mkdtemp(prefix='agromax-spool-')
+AUDITORIA_ARCHIVO_DIR = tempfile.mkdtemp(prefix='agromax-archivo-')
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Réplica espejo de la base de pruebas: el router usa una segunda conexión.
+# Solo la usan las pruebas marcadas con @pytest.mark.replica (core/tests/conftest.py)
+DATABASES.setdefault('replica', {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}})  # noqa: F405
+if CACHES['replica']['BACKEND'].endswith('FileBasedCache'):  # noqa: F405
+    CACHES['replica']['LOCATION'] = tempfile.mkdtemp(prefix='agromax-replica-')  # noqa: F405
@@ -4,9 +4,9 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from .models import (
     Usuario, Rol, TipoContrato, Trabajador,
-    UnidadMedida, Labor, ListaPrecios, VariablesNomina,
-    Quincena, RegistroLabor, Nomina, DetalleNomina,
-    Prestamo, CuotaPrestamo, AuditoriaLog
+    UnidadMedida, Labor, ListaPrecios, VariablesNomina, DiaCalendario,
+    Quincena, RegistroLabor, Nomina, DetalleNomina, NominaPendiente,
+    Prestamo, CuotaPrestamo, AuditoriaLog, VersionCatalogo
 )
 
 # ============================================================================
@@ -27,9 +27,10 @@ class UsuarioAdmin(BaseUserAdmin):
     
     fieldsets = BaseUserAdmin.fieldsets + (
         ('Información Adicional', {
-            'fields': ('rol', 'es_activo', 'ultimo_acceso')
+            'fields': ('rol', 'es_activo', 'ultimo_acceso', 'version_permisos', 'version_sesion')
         }),
     )
+    readonly_fields = ['version_permisos', 'version_sesion']
 
 
 # ============================================================================
@@ -101,10 +102,18 @@ class VariablesNominaAdmin(admin.ModelAdmin):
 # QUINCENAS Y REGISTROS
 # ============================================================================
 
+@admin.register(DiaCalendario)
+class DiaCalendarioAdmin(admin.ModelAdmin):
+    list_display = ['fecha', 'es_domingo', 'es_festivo', 'nombre_festivo']
+    list_filter = ['es_domingo', 'es_festivo']
+    date_hierarchy = 'fecha'
+
+
 @admin.register(Quincena)
 class QuincenaAdmin(admin.ModelAdmin):
-    list_display = ['__str__', 'fecha_inicio', 'fecha_fin', 'fecha_cierre_registro', 'estado']
+    list_display = ['__str__', 'fecha_inicio', 'fecha_fin', 'fecha_cierre_registro', 'estado', 'total_registros']
     list_filter = ['estado', 'año', 'mes']
+    readonly_fields = ['total_registros']
     date_hierarchy = 'fecha_inicio'
 
 
@@ -135,6 +144,12 @@ class DetalleNominaAdmin(admin.ModelAdmin):
     list_filter = ['tipo', 'concepto']
 
 
+@admin.register(NominaPendiente)
+class NominaPendienteAdmin(admin.ModelAdmin):
+    list_display = ['trabajador', 'quincena', 'created_at']
+    list_filter = ['quincena']
+
+
 # ============================================================================
 # PRÉSTAMOS
 # ============================================================================
@@ -169,4 +184,12 @@ class AuditoriaLogAdmin(admin.ModelAdmin):
         return False
     
     def has_change_permission(self, request, obj=None):
-        return False
\ No newline at end of file
+        return False
+
+@admin.register(VersionCatalogo)
+class VersionCatalogoAdmin(admin.ModelAdmin):
+    list_display = ['nombre', 'version', 'updated_at']
+    readonly_fields = ['nombre', 'version', 'updated_at']
+    
+    def has_add_permission(self, request):
+        return False
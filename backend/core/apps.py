@@ -0,0 +1,16 @@
+# backend/core/apps.py
+
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        # Registrar receivers de señales
+        from . import signals  # noqa: F401
+
+        from django.db.backends.signals import connection_created
+        from .db.conexiones import aplicar_pragmas
+        connection_created.connect(aplicar_pragmas, dispatch_uid='core_aplicar_pragmas')
@@ -0,0 +1,91 @@
+# backend/core/authentication.py
+
+from django.utils.functional import cached_property
+from rest_framework import permissions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import Rol
+from .services.permisos import estado_permisos
+
+CLAIM_ROL = 'rol'
+CLAIM_VERSION = 'pv'
+CLAIM_SESION = 'sv'
+
+
+def agregar_claims(token, usuario):
+    """
+    Agrega al token el username, el rol y las versiones de permisos y de
+    sesión del usuario
+    """
+    token['username'] = usuario.username
+    token[CLAIM_ROL] = usuario.rol.nombre if usuario.rol_id else None
+    token[CLAIM_VERSION] = usuario.version_permisos
+    token[CLAIM_SESION] = usuario.version_sesion
+    return token
+
+
+class UsuarioToken(TokenUser):
+    """Usuario autenticado construido solo con los claims del token"""
+
+    @cached_property
+    def rol_nombre(self):
+        return self.token.get(CLAIM_ROL)
+
+    @cached_property
+    def rol(self):
+        """Rol sin guardar con el nombre del claim (solo para leer .nombre)"""
+        return Rol(nombre=self.rol_nombre) if self.rol_nombre else None
+
+    def __str__(self):
+        return self.username or f'Usuario {self.id}'
+
+
+class JWTRolAuthentication(JWTAuthentication):
+    """
+    Autenticación JWT que confía en los claims de rol del token.
+    Las lecturas (GET, HEAD, OPTIONS) no consultan el Usuario: se responde
+    con un UsuarioToken. Las escrituras sí lo cargan porque se guarda como
+    created_by/updated_by, pero el rol sale del claim.
+    En ambos casos la versión de permisos del token se compara con la del
+    usuario (services.permisos) para rechazar tokens de usuarios a los que
+    se les cambió el rol o se desactivaron.
+    Los tokens emitidos sin la versión de permisos se rechazan: no se podrían
+    revocar.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        token = self.get_validated_token(raw_token)
+
+        self.verificar_version(token)
+        if request.method in permissions.SAFE_METHODS:
+            return UsuarioToken(token), token
+
+        usuario = self.get_user(token)
+        usuario.rol_nombre = token.get(CLAIM_ROL)
+        return usuario, token
+
+    def verificar_version(self, token):
+        if CLAIM_VERSION not in token:
+            raise InvalidToken('Token sin versión de permisos, inicie sesión de nuevo')
+        try:
+            usuario_id = token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('El token no identifica al usuario')
+
+        version, activo = estado_permisos(usuario_id)
+        if not activo:
+            raise AuthenticationFailed('Usuario inactivo o inexistente', code='user_inactive')
+        if version != token[CLAIM_VERSION]:
+            raise AuthenticationFailed(
+                'Los permisos del usuario cambiaron, refresque el token',
+                code='permisos_desactualizados'
+            )
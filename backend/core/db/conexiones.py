@@ -0,0 +1,61 @@
+# backend/core/db/conexiones.py
+
+import random
+import time
+
+from django.conf import settings
+from django.db import OperationalError
+
+from core.db.router import ALIAS_REPLICA
+
+# Mensajes de SQLite cuando otro proceso tiene el bloqueo de escritura
+ERRORES_BLOQUEO = ('database is locked', 'database is busy')
+
+# PRAGMAs que escriben en el archivo; no aplican a la réplica de solo lectura
+PRAGMAS_ESCRITURA = {'journal_mode', 'synchronous'}
+
+
+def pragmas_sqlite(solo_lectura=False):
+    """PRAGMAs de settings.SQLITE_PRAGMAS como sentencias SQL"""
+    sentencias = [
+        f'PRAGMA {nombre} = {valor}'
+        for nombre, valor in getattr(settings, 'SQLITE_PRAGMAS', {}).items()
+        if not (solo_lectura and nombre in PRAGMAS_ESCRITURA)
+    ]
+    if solo_lectura:
+        sentencias.append('PRAGMA query_only = ON')
+    return sentencias
+
+
+def aplicar_pragmas(sender, connection, **kwargs):
+    """
+    Receptor de connection_created: WAL (los lectores no bloquean al
+    escritor ni al revés), synchronous=NORMAL, mmap, cache y busy_timeout.
+    La réplica (core.db.router) solo recibe los de lectura y query_only.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for sentencia in pragmas_sqlite(solo_lectura=connection.alias == ALIAS_REPLICA):
+            cursor.execute(sentencia)
+
+
+def es_bloqueo(error):
+    return any(mensaje in str(error) for mensaje in ERRORES_BLOQUEO)
+
+
+def con_reintentos(operacion, excepciones=(OperationalError,)):
+    """
+    Ejecuta operacion() y la repite con espera exponencial (con variación
+    aleatoria) mientras falle porque la base de datos está bloqueada.
+    Solo debe usarse con operaciones que no dejaron nada a medias, como BEGIN.
+    """
+    reintentos = getattr(settings, 'SQLITE_REINTENTOS_ESCRITURA', 5)
+    espera = getattr(settings, 'SQLITE_ESPERA_REINTENTO', 0.05)
+    for intento in range(reintentos + 1):
+        try:
+            return operacion()
+        except excepciones as error:
+            if intento == reintentos or not es_bloqueo(error):
+                raise
+            time.sleep(espera * (2 ** intento) * random.uniform(0.5, 1.5))
@@ -0,0 +1,109 @@
+# backend/core/db/router.py
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+
+ALIAS_PRIMARIA = 'default'
+ALIAS_REPLICA = 'replica'
+
+# Caché compartida por todos los procesos (settings.CACHES['replica'])
+CACHE_FIJADOS = 'replica'
+
+# Estado de la petición en curso: {'replica': lecturas a la réplica, 'escribio': hubo escrituras}
+_estado = ContextVar('estado_replica', default=None)
+
+
+def replica_configurada():
+    return ALIAS_REPLICA in settings.DATABASES
+
+
+# ============================================================================
+# ESTADO POR PETICIÓN
+# ============================================================================
+
+@contextmanager
+def peticion():
+    """Estado de enrutamiento de una petición (lo abre ReplicaMiddleware)"""
+    estado = {'replica': False, 'escribio': False}
+    token = _estado.set(estado)
+    try:
+        yield estado
+    finally:
+        _estado.reset(token)
+
+
+def usar_replica():
+    """
+    Manda a la réplica las lecturas siguientes de la petición. Retorna False
+    (y no cambia nada) si no hay réplica o la petición ya escribió.
+    """
+    estado = _estado.get()
+    if estado is None or estado['escribio'] or not replica_configurada():
+        return False
+    estado['replica'] = True
+    return True
+
+
+def leyendo_replica():
+    estado = _estado.get()
+    return bool(estado and estado['replica'] and not estado['escribio'])
+
+
+# ============================================================================
+# FIJAR A LA PRIMARIA DESPUÉS DE ESCRIBIR
+# ============================================================================
+
+def clave_fijada(usuario_id):
+    return f'replica:fijada:{usuario_id}'
+
+
+def fijar_primaria(usuario_id):
+    """
+    Las lecturas del usuario van a la primaria durante REPLICA_FIJAR_SEGUNDOS,
+    para que vea sus propios cambios aunque la réplica vaya atrasada. La
+    marca va en una caché compartida: la siguiente petición del usuario
+    puede llegar a otro proceso o servidor.
+    """
+    if not replica_configurada():
+        return
+    caches[CACHE_FIJADOS].set(clave_fijada(usuario_id), True, settings.REPLICA_FIJAR_SEGUNDOS)
+
+
+def fijado_a_primaria(usuario_id):
+    return bool(caches[CACHE_FIJADOS].get(clave_fijada(usuario_id)))
+
+
+# ============================================================================
+# ROUTER
+# ============================================================================
+
+class RouterReplica:
+    """
+    Lecturas a la réplica solo cuando la petición lo pidió con usar_replica();
+    todo lo demás (y toda escritura) va a la primaria. La primera escritura
+    de la petición la fija a la primaria hasta el final.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not leyendo_replica():
+            return None
+        instancia = hints.get('instance')
+        if instancia is not None and instancia._state.db:
+            return instancia._state.db
+        return ALIAS_REPLICA
+
+    def db_for_write(self, model, **hints):
+        estado = _estado.get()
+        if estado is not None:
+            estado['escribio'] = True
+        return ALIAS_PRIMARIA
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Son la misma base de datos (la réplica es una copia)
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == ALIAS_PRIMARIA
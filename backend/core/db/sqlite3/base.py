@@ -0,0 +1,18 @@
+# backend/core/db/sqlite3/base.py
+
+from django.db.backends.sqlite3 import base
+
+from core.db.conexiones import con_reintentos
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite de Django con transacciones BEGIN IMMEDIATE: el bloqueo de
+    escritura se toma al abrir la transacción, donde se puede reintentar
+    sin perder trabajo, en lugar de fallar con "database is locked" al
+    pasar de lectura a escritura a mitad de la transacción.
+    """
+
+    def _start_transaction_under_autocommit(self):
+        cursor = self.cursor()
+        con_reintentos(lambda: cursor.execute('BEGIN IMMEDIATE'))
@@ -1,8 +1,8 @@
 # backend/core/filters.py
 
 from django_filters import rest_framework as filters
-from django.db import models 
 from .models import Trabajador, Labor, RegistroLabor, Nomina, Prestamo
+from .services import busqueda
 
 class TrabajadorFilter(filters.FilterSet):
     estado = filters.ChoiceFilter(choices=Trabajador.ESTADO_CHOICES)
@@ -14,11 +14,8 @@ class TrabajadorFilter(filters.FilterSet):
         fields = ['estado', 'tipo_contrato']
     
     def filter_search(self, queryset, name, value):
-        return queryset.filter(
-            models.Q(nombres__icontains=value) |
-            models.Q(apellidos__icontains=value) |
-            models.Q(numero_documento__icontains=value)
-        )
+        # Índice FTS: sin tildes y por prefijo (services.busqueda)
+        return busqueda.filtrar(queryset, value)
 
 
 class LaborFilter(filters.FilterSet):
@@ -0,0 +1,74 @@
+# backend/core/management/commands/archivar_auditoria.py
+
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from core.models import AuditoriaLog
+from core.services.archivo_auditoria import ArchivoAuditoria, CAMPOS_ARCHIVO
+
+
+class Command(BaseCommand):
+    help = (
+        'Mueve las entradas de AuditoriaLog más antiguas que la retención a '
+        'archivos JSON lines comprimidos por día, con un índice de particiones. '
+        'Siguen disponibles en /api/auditoria/?incluir_archivo=1.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias', type=int, default=settings.AUDITORIA_RETENCION_DIAS,
+            help='Días que se conservan en la tabla (por defecto AUDITORIA_RETENCION_DIAS)'
+        )
+        parser.add_argument(
+            '--directorio',
+            help='Directorio del archivo (por defecto AUDITORIA_ARCHIVO_DIR)'
+        )
+        parser.add_argument(
+            '--lote', type=int, default=5000,
+            help='Entradas leídas y borradas por lote (por defecto 5000)'
+        )
+        parser.add_argument(
+            '--simular', action='store_true',
+            help='Solo contar las entradas que se archivarían'
+        )
+
+    def handle(self, *args, **options):
+        if options['dias'] < 0:
+            raise CommandError('--dias no puede ser negativo')
+        if options['lote'] < 1:
+            raise CommandError('--lote debe ser mayor que cero')
+
+        limite = timezone.now() - timedelta(days=options['dias'])
+        antiguas = AuditoriaLog.objects.filter(created_at__lt=limite)
+        if options['simular']:
+            self.stdout.write(f'{antiguas.count()} entradas anteriores a {limite:%Y-%m-%d %H:%M} por archivar')
+            return
+
+        archivo = ArchivoAuditoria(options['directorio'])
+        particiones = archivo.indice()
+        total = 0
+        while True:
+            filas = list(
+                antiguas.order_by('created_at', 'id').values(*CAMPOS_ARCHIVO)[:options['lote']]
+            )
+            if not filas:
+                break
+            for dia, filas_dia in groupby(filas, key=lambda fila: archivo.dia(fila['created_at'])):
+                archivo.agregar(particiones, dia, list(filas_dia))
+            # Primero el archivo y el índice en disco, después el borrado: si el
+            # proceso se cae entre ambos, la siguiente ejecución repite las filas
+            # y la lectura descarta los ids repetidos.
+            archivo.guardar_indice(particiones)
+            with transaction.atomic():
+                AuditoriaLog.objects.filter(id__in=[fila['id'] for fila in filas]).delete()
+            total += len(filas)
+            self.stdout.write(f'  {total} entradas archivadas')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'¡Archivo actualizado! {total} entradas movidas a {archivo.directorio} '
+            f'({len(particiones)} días archivados)'
+        ))
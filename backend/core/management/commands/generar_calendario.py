@@ -0,0 +1,44 @@
+# backend/core/management/commands/generar_calendario.py
+
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from core.models import DiaCalendario
+from core.services.calendario import generar_dias
+
+
+class Command(BaseCommand):
+    help = 'Precalcula los domingos y festivos de Colombia para los próximos años'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--desde', type=int, default=None,
+            help='Año inicial (por defecto el año actual)'
+        )
+        parser.add_argument(
+            '--años', type=int, default=10,
+            help='Cantidad de años a generar (por defecto 10)'
+        )
+
+    def handle(self, *args, **options):
+        desde = options['desde'] or timezone.now().year
+        hasta = desde + options['años'] - 1
+        self.stdout.write(f'Generando calendario {desde}-{hasta}...')
+
+        dias = []
+        for año in range(desde, hasta + 1):
+            dias.extend(generar_dias(año))
+
+        with transaction.atomic():
+            DiaCalendario.objects.filter(
+                fecha__gte=date(desde, 1, 1),
+                fecha__lte=date(hasta, 12, 31)
+            ).delete()
+            DiaCalendario.objects.bulk_create(dias)
+
+        festivos = sum(1 for dia in dias if dia.es_festivo)
+        self.stdout.write(self.style.SUCCESS(
+            f'¡Calendario generado! {len(dias)} días ({festivos} festivos)'
+        ))
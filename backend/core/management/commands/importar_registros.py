@@ -0,0 +1,249 @@
+# backend/core/management/commands/importar_registros.py
+
+import csv
+import time
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction, DatabaseError
+from core.models import Usuario, Trabajador, Labor, Quincena, RegistroLabor
+from core.services.registros import insertar_registros
+
+COLUMNAS_REQUERIDAS = ['numero_documento', 'codigo_labor', 'fecha', 'cantidad']
+ALIAS_COLUMNAS = {
+    'documento': 'numero_documento',
+    'cedula': 'numero_documento',
+    'labor': 'codigo_labor',
+    'codigo': 'codigo_labor',
+}
+FORMATOS_FECHA = ['%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y']
+MAX_ERRORES_MOSTRADOS = 20
+
+
+class FilaInvalida(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Importa registros de labores desde un archivo CSV o XLSX con las columnas '
+        'numero_documento, codigo_labor, fecha, cantidad y observaciones (opcional). '
+        'Lee el archivo fila por fila e inserta por lotes; no valida la fecha de '
+        'cierre de la quincena para permitir cargas históricas.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Ruta del archivo .csv o .xlsx')
+        parser.add_argument(
+            '--lote', type=int, default=1000,
+            help='Filas por bulk_create (por defecto 1000)'
+        )
+        parser.add_argument('--hoja', help='Hoja del archivo XLSX (por defecto la activa)')
+        parser.add_argument(
+            '--delimitador', default=',',
+            help='Separador de columnas del CSV (por defecto ",")'
+        )
+        parser.add_argument('--usuario', help='Username que quedará como created_by')
+        parser.add_argument(
+            '--detener-en-error', action='store_true',
+            help='Revertir toda la importación si un lote falla al insertar'
+        )
+
+    def handle(self, *args, **options):
+        ruta = Path(options['archivo'])
+        if not ruta.exists():
+            raise CommandError(f'No existe el archivo {ruta}')
+        if options['lote'] < 1:
+            raise CommandError('--lote debe ser mayor que cero')
+
+        usuario = None
+        if options['usuario']:
+            usuario = Usuario.objects.filter(username=options['usuario']).first()
+            if usuario is None:
+                raise CommandError(f"No existe el usuario {options['usuario']}")
+
+        # Diccionarios de referencia cargados una sola vez
+        self.stdout.write('Cargando trabajadores, labores y quincenas...')
+        self.trabajadores = dict(Trabajador.objects.values_list('numero_documento', 'id'))
+        self.labores = dict(Labor.objects.values_list('codigo', 'id'))
+        self.quincenas = list(
+            Quincena.objects.values_list('fecha_inicio', 'fecha_fin', 'id')
+        )
+        self.quincena_por_fecha = {}
+
+        self.usuario = usuario
+        self.lote = options['lote']
+        self.detener = options['detener_en_error']
+        self.leidas = 0
+        self.insertadas = 0
+        self.errores = 0
+        self.inicio = time.monotonic()
+
+        self.stdout.write(f'Importando {ruta}...')
+        filas = self.leer_filas(ruta, options)
+        if self.detener:
+            with transaction.atomic():
+                self.importar(filas)
+        else:
+            self.importar(filas)
+
+        duracion = time.monotonic() - self.inicio
+        self.stdout.write(self.style.SUCCESS(
+            f'¡Importación terminada! {self.insertadas} registros insertados, '
+            f'{self.errores} filas rechazadas de {self.leidas} leídas en {duracion:.1f}s '
+            f'({self.velocidad():.0f} filas/s)'
+        ))
+
+    # ------------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------------
+
+    def leer_filas(self, ruta, options):
+        """Genera (numero_linea, {columna: valor}) sin cargar el archivo completo"""
+        if ruta.suffix.lower() == '.xlsx':
+            yield from self.leer_xlsx(ruta, options['hoja'])
+        else:
+            yield from self.leer_csv(ruta, options['delimitador'])
+
+    def leer_csv(self, ruta, delimitador):
+        with open(ruta, newline='', encoding='utf-8-sig') as archivo:
+            lector = csv.reader(archivo, delimiter=delimitador)
+            columnas = self.normalizar_columnas(next(lector, []))
+            for numero, valores in enumerate(lector, start=2):
+                yield numero, dict(zip(columnas, valores))
+
+    def leer_xlsx(self, ruta, hoja):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise CommandError('Para importar archivos .xlsx instale openpyxl')
+
+        libro = load_workbook(ruta, read_only=True, data_only=True)
+        try:
+            hoja = libro[hoja] if hoja else libro.active
+            filas = hoja.iter_rows(values_only=True)
+            columnas = self.normalizar_columnas(next(filas, ()))
+            for numero, valores in enumerate(filas, start=2):
+                yield numero, dict(zip(columnas, valores))
+        finally:
+            libro.close()
+
+    def normalizar_columnas(self, encabezado):
+        columnas = [str(columna or '').strip().lower() for columna in encabezado]
+        columnas = [ALIAS_COLUMNAS.get(columna, columna) for columna in columnas]
+        faltantes = [columna for columna in COLUMNAS_REQUERIDAS if columna not in columnas]
+        if faltantes:
+            raise CommandError(f"Faltan columnas en el archivo: {', '.join(faltantes)}")
+        return columnas
+
+    # ------------------------------------------------------------------------
+    # Conversión
+    # ------------------------------------------------------------------------
+
+    def construir_registro(self, fila):
+        documento = str(fila.get('numero_documento') or '').strip()
+        if documento.endswith('.0'):  # cédulas leídas como número desde Excel
+            documento = documento[:-2]
+        trabajador_id = self.trabajadores.get(documento)
+        if trabajador_id is None:
+            raise FilaInvalida(f'trabajador {documento!r} no existe')
+
+        codigo = str(fila.get('codigo_labor') or '').strip()
+        labor_id = self.labores.get(codigo)
+        if labor_id is None:
+            raise FilaInvalida(f'labor {codigo!r} no existe')
+
+        fecha = self.convertir_fecha(fila.get('fecha'))
+        quincena_id = self.buscar_quincena(fecha)
+        if quincena_id is None:
+            raise FilaInvalida(f'no hay quincena para la fecha {fecha}')
+
+        try:
+            cantidad = Decimal(str(fila.get('cantidad')).strip().replace(',', '.'))
+        except InvalidOperation:
+            raise FilaInvalida(f"cantidad {fila.get('cantidad')!r} no es un número")
+        if not cantidad.is_finite() or cantidad < Decimal('0.01'):
+            raise FilaInvalida(f'cantidad {cantidad} debe ser mayor o igual a 0.01')
+
+        return RegistroLabor(
+            trabajador_id=trabajador_id,
+            labor_id=labor_id,
+            quincena_id=quincena_id,
+            fecha=fecha,
+            cantidad=cantidad.quantize(Decimal('0.01')),
+            observaciones=str(fila.get('observaciones') or '').strip(),
+            created_by=self.usuario,
+        )
+
+    def convertir_fecha(self, valor):
+        if isinstance(valor, datetime):
+            return valor.date()
+        if isinstance(valor, date):
+            return valor
+        texto = str(valor or '').strip()
+        for formato in FORMATOS_FECHA:
+            try:
+                return datetime.strptime(texto, formato).date()
+            except ValueError:
+                continue
+        raise FilaInvalida(f'fecha {texto!r} no reconocida')
+
+    def buscar_quincena(self, fecha):
+        if fecha not in self.quincena_por_fecha:
+            self.quincena_por_fecha[fecha] = next(
+                (pk for inicio, fin, pk in self.quincenas if inicio <= fecha <= fin),
+                None
+            )
+        return self.quincena_por_fecha[fecha]
+
+    # ------------------------------------------------------------------------
+    # Inserción
+    # ------------------------------------------------------------------------
+
+    def importar(self, filas):
+        pendientes = []
+        for numero, fila in filas:
+            self.leidas += 1
+            try:
+                pendientes.append(self.construir_registro(fila))
+            except FilaInvalida as exc:
+                self.rechazar(numero, exc)
+
+            if len(pendientes) >= self.lote:
+                self.insertar(pendientes)
+                pendientes = []
+        if pendientes:
+            self.insertar(pendientes)
+
+    def insertar(self, registros):
+        """Inserta un lote dentro de un savepoint"""
+        try:
+            with transaction.atomic():
+                insertar_registros(registros, batch_size=self.lote)
+        except DatabaseError as exc:
+            if self.detener:
+                raise CommandError(f'Error insertando lote: {exc}')
+            self.errores += len(registros)
+            self.stdout.write(self.style.ERROR(
+                f'Lote de {len(registros)} filas rechazado: {exc}'
+            ))
+            return
+
+        self.insertadas += len(registros)
+        self.stdout.write(
+            f'  {self.leidas} filas leídas, {self.insertadas} insertadas '
+            f'({self.velocidad():.0f} filas/s)'
+        )
+
+    def rechazar(self, numero, motivo):
+        self.errores += 1
+        if self.errores <= MAX_ERRORES_MOSTRADOS:
+            self.stdout.write(self.style.WARNING(f'  Fila {numero}: {motivo}'))
+        elif self.errores == MAX_ERRORES_MOSTRADOS + 1:
+            self.stdout.write(self.style.WARNING('  (se omiten más errores)'))
+
+    def velocidad(self):
+        duracion = time.monotonic() - self.inicio
+        return self.leidas / duracion if duracion else 0
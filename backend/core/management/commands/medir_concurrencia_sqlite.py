@@ -0,0 +1,172 @@
+# backend/core/management/commands/medir_concurrencia_sqlite.py
+
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from core.db.conexiones import con_reintentos, es_bloqueo, pragmas_sqlite
+
+# Perfil por defecto de Django: journal DELETE, BEGIN diferido, espera de 5 s
+PERFIL_DEFECTO = {
+    'pragmas': ['PRAGMA journal_mode = DELETE', 'PRAGMA synchronous = FULL'],
+    'begin': 'BEGIN',
+    'reintentar': False,
+}
+
+ESQUEMA = [
+    'CREATE TABLE registro (id INTEGER PRIMARY KEY, trabajador_id INTEGER, '
+    'fecha TEXT, cantidad REAL)',
+    'CREATE INDEX registro_fecha ON registro (fecha, trabajador_id)',
+    'CREATE TABLE quincena (id INTEGER PRIMARY KEY, total_registros INTEGER)',
+    'INSERT INTO quincena VALUES (1, 0)',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara lecturas y escrituras concurrentes sobre un archivo SQLite '
+        'temporal con el perfil por defecto y con el perfil de producción '
+        '(SQLITE_PRAGMAS y BEGIN IMMEDIATE con reintentos). No toca la base de datos del proyecto.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--segundos', type=float, default=5, help='Duración de cada perfil')
+        parser.add_argument('--escritores', type=int, default=4, help='Hilos que escriben')
+        parser.add_argument('--lectores', type=int, default=4, help='Hilos que leen')
+        parser.add_argument('--filas', type=int, default=20000, help='Filas iniciales')
+
+    def handle(self, *args, **options):
+        if options['escritores'] < 1 or options['lectores'] < 0:
+            raise CommandError('Se necesita al menos un escritor')
+
+        perfil_produccion = {
+            'pragmas': pragmas_sqlite(), 'begin': 'BEGIN IMMEDIATE', 'reintentar': True,
+        }
+        resultados = []
+        with tempfile.TemporaryDirectory() as directorio:
+            for nombre, perfil in [('defecto', PERFIL_DEFECTO), ('producción', perfil_produccion)]:
+                ruta = Path(directorio) / f'{nombre}.sqlite3'
+                self.preparar(ruta, perfil, options['filas'])
+                self.stdout.write(f'Midiendo perfil {nombre}...')
+                resultados.append((nombre, self.medir(ruta, perfil, options)))
+
+        self.stdout.write('')
+        self.stdout.write(
+            f"{'perfil':<12}{'escrituras/s':>14}{'bloqueos':>10}{'lecturas/s':>12}"
+            f"{'lectura p95':>13}{'escritura p95':>15}"
+        )
+        for nombre, r in resultados:
+            self.stdout.write(
+                f"{nombre:<12}{r['escrituras'] / r['segundos']:>14.0f}{r['bloqueos']:>10}"
+                f"{r['lecturas'] / r['segundos']:>12.0f}{r['lectura_p95']:>11.2f}ms"
+                f"{r['escritura_p95']:>13.2f}ms"
+            )
+
+    # ------------------------------------------------------------------------
+    # Medición
+    # ------------------------------------------------------------------------
+
+    def conectar(self, ruta, perfil):
+        conexion = sqlite3.connect(ruta, timeout=5, isolation_level=None, check_same_thread=False)
+        for sentencia in perfil['pragmas']:
+            conexion.execute(sentencia)
+        return conexion
+
+    def preparar(self, ruta, perfil, filas):
+        conexion = self.conectar(ruta, perfil)
+        for sentencia in ESQUEMA:
+            conexion.execute(sentencia)
+        conexion.execute('BEGIN')
+        conexion.executemany(
+            'INSERT INTO registro (trabajador_id, fecha, cantidad) VALUES (?, ?, ?)',
+            [(i % 500, f'2026-01-{i % 28 + 1:02d}', i % 50) for i in range(filas)]
+        )
+        conexion.execute('COMMIT')
+        conexion.close()
+
+    def medir(self, ruta, perfil, options):
+        fin = time.monotonic() + options['segundos']
+        resultado = {'escrituras': 0, 'bloqueos': 0, 'lecturas': 0}
+        tiempos_lectura, tiempos_escritura = [], []
+        lock = threading.Lock()
+
+        def escritor(numero):
+            conexion = self.conectar(ruta, perfil)
+            contador = 0
+            while time.monotonic() < fin:
+                contador += 1
+                inicio = time.perf_counter()
+                try:
+                    self.escribir(conexion, perfil, numero * 1000 + contador % 1000)
+                except sqlite3.OperationalError as error:
+                    if conexion.in_transaction:
+                        conexion.execute('ROLLBACK')
+                    if not es_bloqueo(error):
+                        raise
+                    with lock:
+                        resultado['bloqueos'] += 1
+                    continue
+                with lock:
+                    resultado['escrituras'] += 1
+                    tiempos_escritura.append(time.perf_counter() - inicio)
+            conexion.close()
+
+        def lector():
+            conexion = self.conectar(ruta, perfil)
+            while time.monotonic() < fin:
+                inicio = time.perf_counter()
+                try:
+                    conexion.execute(
+                        'SELECT trabajador_id, SUM(cantidad) FROM registro '
+                        'WHERE fecha >= ? GROUP BY trabajador_id', ['2026-01-20']
+                    ).fetchall()
+                except sqlite3.OperationalError as error:
+                    if not es_bloqueo(error):
+                        raise
+                    with lock:
+                        resultado['bloqueos'] += 1
+                    continue
+                with lock:
+                    resultado['lecturas'] += 1
+                    tiempos_lectura.append(time.perf_counter() - inicio)
+            conexion.close()
+
+        hilos = [threading.Thread(target=escritor, args=(n,)) for n in range(options['escritores'])]
+        hilos += [threading.Thread(target=lector) for _ in range(options['lectores'])]
+        inicio = time.monotonic()
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        resultado['segundos'] = time.monotonic() - inicio
+        resultado['lectura_p95'] = percentil_ms(tiempos_lectura, 95)
+        resultado['escritura_p95'] = percentil_ms(tiempos_escritura, 95)
+        return resultado
+
+    def escribir(self, conexion, perfil, trabajador_id):
+        """Como guardar un registro: lee (validación), inserta y suma el total"""
+        if perfil['reintentar']:
+            con_reintentos(lambda: conexion.execute(perfil['begin']), (sqlite3.OperationalError,))
+        else:
+            conexion.execute(perfil['begin'])
+        conexion.execute(
+            'SELECT COUNT(*) FROM registro WHERE trabajador_id = ? AND fecha = ?',
+            [trabajador_id, '2026-01-15']
+        ).fetchone()
+        conexion.execute(
+            'INSERT INTO registro (trabajador_id, fecha, cantidad) VALUES (?, ?, ?)',
+            [trabajador_id, '2026-01-15', 1]
+        )
+        conexion.execute('UPDATE quincena SET total_registros = total_registros + 1 WHERE id = 1')
+        conexion.execute('COMMIT')
+
+
+def percentil_ms(tiempos, percentil):
+    if len(tiempos) < 2:
+        return sum(tiempos) * 1000
+    return statistics.quantiles(tiempos, n=100)[percentil - 1] * 1000
@@ -0,0 +1,30 @@
+# backend/core/management/commands/recalcular_totales_quincena.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from core.services.registros import recalcular_totales
+
+
+class Command(BaseCommand):
+    help = 'Recalcula Quincena.total_registros desde RegistroLabor con una consulta agrupada'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verificar', action='store_true',
+            help='Solo reportar las quincenas desfasadas, sin corregirlas'
+        )
+
+    def handle(self, *args, **options):
+        guardar = not options['verificar']
+        with transaction.atomic():
+            desfasadas = recalcular_totales(guardar=guardar)
+
+        for quincena, anterior, real in desfasadas:
+            self.stdout.write(f'  {quincena}: {anterior} -> {real}')
+
+        if not desfasadas:
+            self.stdout.write(self.style.SUCCESS('Todos los totales están al día'))
+        elif guardar:
+            self.stdout.write(self.style.SUCCESS(f'{len(desfasadas)} quincenas corregidas'))
+        else:
+            self.stdout.write(self.style.WARNING(f'{len(desfasadas)} quincenas desfasadas'))
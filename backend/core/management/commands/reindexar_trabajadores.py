@@ -0,0 +1,27 @@
+# backend/core/management/commands/reindexar_trabajadores.py
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from core.services import busqueda
+
+
+class Command(BaseCommand):
+    help = (
+        'Reconstruye el índice de búsqueda de trabajadores (FTS5 en SQLite). Necesario '
+        'después de cargar trabajadores con bulk_create o SQL directo.'
+    )
+
+    def handle(self, *args, **options):
+        busqueda.olvidar_motor()
+        if busqueda.motor() == busqueda.TRIGRAMAS:
+            self.stdout.write(self.style.SUCCESS(
+                'PostgreSQL mantiene el índice de trigramas; no hay nada que reconstruir'
+            ))
+            return
+        if not busqueda.fts_disponible():
+            raise CommandError(
+                'La base de datos no tiene índice de búsqueda; se usan consultas normales'
+            )
+        with transaction.atomic():
+            total = busqueda.reconstruir()
+        self.stdout.write(self.style.SUCCESS(f'{total} trabajadores indexados'))
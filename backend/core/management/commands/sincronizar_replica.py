@@ -0,0 +1,76 @@
+# backend/core/management/commands/sincronizar_replica.py
+
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.db.router import ALIAS_PRIMARIA
+
+
+class Command(BaseCommand):
+    help = (
+        'Copia la base de datos SQLite a la réplica de solo lectura (DB_REPLICA) con '
+        'la API de backup de SQLite. La réplica se actualiza en una sola transacción '
+        'sobre el mismo archivo; con --cada se repite en un ciclo.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cada', type=float, default=0,
+            help='Segundos entre copias (0 = una sola copia)'
+        )
+
+    def handle(self, *args, **options):
+        if connections[ALIAS_PRIMARIA].vendor != 'sqlite':
+            raise CommandError(
+                'Solo aplica a SQLite; con PostgreSQL la réplica se mantiene por streaming'
+            )
+        if not settings.DB_REPLICA:
+            raise CommandError('DB_REPLICA no está configurado')
+
+        origen = Path(settings.DATABASES[ALIAS_PRIMARIA]['NAME'])
+        destino = Path(settings.DB_REPLICA)
+        if origen.resolve() == destino.resolve():
+            raise CommandError('DB_REPLICA debe ser un archivo distinto de la base de datos')
+
+        while True:
+            inicio = time.monotonic()
+            self.copiar(origen, destino)
+            self.stdout.write(self.style.SUCCESS(
+                f'Réplica actualizada en {time.monotonic() - inicio:.2f}s '
+                f'({destino.stat().st_size / 1024 / 1024:.1f} MiB)'
+            ))
+            if not options['cada']:
+                break
+            time.sleep(max(0, options['cada'] - (time.monotonic() - inicio)))
+
+    def copiar(self, origen, destino):
+        """
+        backup() lee una instantánea consistente sin bloquear a los escritores
+        (WAL). Se pasa por un archivo intermedio en modo DELETE (la copia
+        directa heredaría el modo WAL de la primaria y mode=ro necesita la
+        réplica sin -wal ni -shm), y de ahí a la réplica con otro backup():
+        SQLite la escribe con bloqueo exclusivo, así los lectores esperan
+        (busy_timeout) y nunca ven una copia a medias. Se escribe dentro del
+        archivo en lugar de reemplazarlo porque Windows no deja reemplazar un
+        archivo abierto por las conexiones de la réplica.
+        """
+        temporal = destino.with_name(destino.name + '.tmp')
+        temporal.unlink(missing_ok=True)
+        espera = settings.SQLITE_PRAGMAS.get('busy_timeout', 5000) / 1000
+        try:
+            with closing(sqlite3.connect(temporal)) as intermedia:
+                with closing(sqlite3.connect(origen)) as fuente:
+                    fuente.backup(intermedia)
+                intermedia.execute('PRAGMA journal_mode = DELETE')
+                with closing(sqlite3.connect(destino, timeout=espera)) as replica:
+                    # Réplicas creadas por versiones anteriores en modo WAL
+                    replica.execute('PRAGMA journal_mode = DELETE')
+                    intermedia.backup(replica)
+        finally:
+            temporal.unlink(missing_ok=True)
@@ -0,0 +1,22 @@
+# backend/core/middleware.py
+
+from core.db import router
+
+
+class ReplicaMiddleware:
+    """
+    Abre el estado de enrutamiento de cada petición (core.db.router). Si la
+    petición escribió, las lecturas del usuario quedan fijadas a la primaria
+    durante REPLICA_FIJAR_SEGUNDOS para que no lea de una réplica atrasada.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with router.peticion() as estado:
+            response = self.get_response(request)
+            usuario = getattr(request, 'user', None)
+            if estado['escribio'] and usuario is not None and usuario.is_authenticated:
+                router.fijar_primaria(usuario.pk)
+        return response
@@ -0,0 +1,31 @@
+# Generated by Django 5.0 on 2026-10-17 02:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NominaPendiente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('quincena', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nominas_pendientes', to='core.quincena')),
+                ('trabajador', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nominas_pendientes', to='core.trabajador')),
+            ],
+            options={
+                'verbose_name': 'Nómina Pendiente de Recálculo',
+                'verbose_name_plural': 'Nóminas Pendientes de Recálculo',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='nominapendiente',
+            constraint=models.UniqueConstraint(fields=('trabajador', 'quincena'), name='unique_nomina_pendiente_trabajador_quincena'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0 on 2026-10-17 02:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_nominapendiente'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiaCalendario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(unique=True)),
+                ('es_domingo', models.BooleanField(default=False)),
+                ('es_festivo', models.BooleanField(default=False)),
+                ('nombre_festivo', models.CharField(blank=True, max_length=100)),
+            ],
+            options={
+                'verbose_name': 'Día de Calendario',
+                'verbose_name_plural': 'Días de Calendario',
+                'ordering': ['fecha'],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0 on 2026-10-17 09:41
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def calcular_totales(apps, schema_editor):
+    Quincena = apps.get_model('core', 'Quincena')
+    RegistroLabor = apps.get_model('core', 'RegistroLabor')
+    totales = RegistroLabor.objects.order_by().values('quincena_id').annotate(total=Count('id'))
+    for fila in totales:
+        Quincena.objects.filter(pk=fila['quincena_id']).update(total_registros=fila['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_diacalendario'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quincena',
+            name='total_registros',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Mantenido por services.registros; se corrige con recalcular_totales_quincena'),
+        ),
+        migrations.RunPython(calcular_totales, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0 on 2026-10-17 02:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_quincena_total_registros'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auditorialog',
+            name='core_audito_created_403745_idx',
+        ),
+        migrations.AddIndex(
+            model_name='auditorialog',
+            index=models.Index(fields=['-created_at', '-id'], name='auditoria_cursor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registrolabor',
+            index=models.Index(fields=['-fecha', 'trabajador', 'id'], name='registro_cursor_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-17 02:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_versioncatalogo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='version_permisos',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Se incrementa al cambiar rol, estado o contraseña; invalida los tokens emitidos'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0 on 2026-10-17 02:35
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_usuario_version_permisos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditorialog',
+            name='evento',
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='auditorialog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0 on 2026-10-17 11:20
+
+from django.db import migrations
+
+IGNORAR = {'updated_at'}
+
+
+def compactar_entradas(apps, schema_editor):
+    """Deja en UPDATE solo los campos que cambiaron y en CREATE/DELETE los no vacíos"""
+    AuditoriaLog = apps.get_model('core', 'AuditoriaLog')
+    entradas = AuditoriaLog.objects.only(
+        'id', 'accion', 'datos_anteriores', 'datos_nuevos'
+    ).order_by('id')
+    ultimo = 0
+    while True:
+        lote = list(entradas.filter(id__gt=ultimo)[:2000])
+        if not lote:
+            break
+        ultimo = lote[-1].id
+        AuditoriaLog.objects.bulk_update(
+            [entrada for entrada in lote if compactar(entrada)],
+            ['datos_anteriores', 'datos_nuevos'],
+        )
+
+
+def compactar(entrada):
+    """True si la entrada cambió"""
+    anteriores, nuevos = entrada.datos_anteriores, entrada.datos_nuevos
+    if entrada.accion == 'UPDATE' and isinstance(anteriores, dict) and isinstance(nuevos, dict):
+        cambiados = [
+            clave for clave, valor in nuevos.items()
+            if clave not in IGNORAR and anteriores.get(clave) != valor
+        ]
+        entrada.datos_anteriores = {clave: anteriores.get(clave) for clave in cambiados}
+        entrada.datos_nuevos = {clave: nuevos[clave] for clave in cambiados}
+    elif entrada.accion in ('CREATE', 'DELETE'):
+        for campo in ('datos_anteriores', 'datos_nuevos'):
+            datos = getattr(entrada, campo)
+            if isinstance(datos, dict):
+                setattr(entrada, campo, {
+                    clave: valor for clave, valor in datos.items() if valor not in (None, '')
+                })
+    return (entrada.datos_anteriores, entrada.datos_nuevos) != (anteriores, nuevos)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_auditoria_evento'),
+    ]
+
+    operations = [
+        migrations.RunPython(compactar_entradas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.0 on 2026-10-17 13:05
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# Índice de búsqueda de trabajadores (core.services.busqueda). Solo SQLite con
+# FTS5; en otras bases de datos la búsqueda usa consultas normales.
+CREAR_TABLA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS core_trabajador_fts USING fts5(
+    nombre, documento,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3 4'
+)
+"""
+LLENAR_TABLA = """
+INSERT INTO core_trabajador_fts (rowid, nombre, documento)
+SELECT id, nombres || ' ' || apellidos, numero_documento FROM core_trabajador
+"""
+
+
+def crear_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute(CREAR_TABLA)
+        except OperationalError:
+            # SQLite compilado sin FTS5
+            return
+        cursor.execute(LLENAR_TABLA)
+
+
+def borrar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS core_trabajador_fts')
+
+
+def olvidar_motor(apps, schema_editor):
+    # El proceso que migra debe volver a detectar el motor de búsqueda
+    from core.services import busqueda
+    busqueda.olvidar_motor()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_compactar_auditoria'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, borrar_indice),
+        migrations.RunPython(olvidar_motor, olvidar_motor),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.0 on 2026-10-17 15:40
+
+from django.db import migrations, transaction
+from django.db.utils import DatabaseError
+
+# Índice de búsqueda de trabajadores en PostgreSQL (core.services.busqueda):
+# trigramas sobre el nombre completo en minúsculas y sin tildes. El LIKE por
+# prefijo del documento ya lo cubre el índice *_like del campo único.
+SENTENCIAS = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE EXTENSION IF NOT EXISTS unaccent',
+    # unaccent() no es IMMUTABLE y no puede usarse en un índice; esta envoltura sí
+    """
+    CREATE OR REPLACE FUNCTION core_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS core_trabajador_nombre_trgm ON core_trabajador
+    USING gin (core_unaccent(lower(nombres || ' ' || apellidos)) gin_trgm_ops)
+    """,
+]
+
+
+def crear_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            for sentencia in SENTENCIAS:
+                schema_editor.execute(sentencia)
+    except DatabaseError:
+        # Sin permiso para crear extensiones: la búsqueda usa consultas normales
+        pass
+
+
+def borrar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS core_trabajador_nombre_trgm')
+    schema_editor.execute('DROP FUNCTION IF EXISTS core_unaccent(text)')
+
+
+def olvidar_motor(apps, schema_editor):
+    # El proceso que migra debe volver a detectar el motor de búsqueda
+    from core.services import busqueda
+    busqueda.olvidar_motor()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_trabajador_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, borrar_indice),
+        migrations.RunPython(olvidar_motor, olvidar_motor),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-17 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_trabajador_trigramas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='version_sesion',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Se incrementa al cambiar estado o contraseña; los refresh tokens emitidos ya no sirven'),
+        ),
+    ]
@@ -2,6 +2,7 @@
 
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 
@@ -46,6 +47,14 @@ class Usuario(AbstractUser):
     )
     es_activo = models.BooleanField(default=True)
     ultimo_acceso = models.DateTimeField(null=True, blank=True)
+    version_permisos = models.PositiveIntegerField(
+        default=0, editable=False,
+        help_text="Se incrementa al cambiar rol, estado o contraseña; invalida los tokens emitidos"
+    )
+    version_sesion = models.PositiveIntegerField(
+        default=0, editable=False,
+        help_text="Se incrementa al cambiar estado o contraseña; los refresh tokens emitidos ya no sirven"
+    )
     
     class Meta:
         verbose_name = "Usuario"
@@ -325,6 +334,25 @@ class VariablesNomina(models.Model):
 # QUINCENAS Y REGISTROS
 # ============================================================================
 
+class DiaCalendario(models.Model):
+    """Domingos y festivos de Colombia precalculados (ver generar_calendario)"""
+    
+    fecha = models.DateField(unique=True)
+    es_domingo = models.BooleanField(default=False)
+    es_festivo = models.BooleanField(default=False)
+    nombre_festivo = models.CharField(max_length=100, blank=True)
+    
+    class Meta:
+        verbose_name = "Día de Calendario"
+        verbose_name_plural = "Días de Calendario"
+        ordering = ['fecha']
+        
+    def __str__(self):
+        if self.es_festivo:
+            return f"{self.fecha} - {self.nombre_festivo}"
+        return f"{self.fecha} - Domingo"
+
+
 class Quincena(models.Model):
     """Períodos de nómina (1-15, 16-fin de mes)"""
     
@@ -344,6 +372,10 @@ class Quincena(models.Model):
         help_text="15 días después de fecha_fin para permitir correcciones"
     )
     estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default='ABIERTA')
+    total_registros = models.PositiveIntegerField(
+        default=0, editable=False,
+        help_text="Mantenido por services.registros; se corrige con recalcular_totales_quincena"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -415,6 +447,8 @@ class RegistroLabor(models.Model):
         ordering = ['-fecha', 'trabajador']
         indexes = [
             models.Index(fields=['trabajador', 'quincena', 'fecha']),
+            # Orden de RegistroLaborPagination
+            models.Index(fields=['-fecha', 'trabajador', 'id'], name='registro_cursor_idx'),
         ]
         
     def __str__(self):
@@ -549,6 +583,35 @@ class DetalleNomina(models.Model):
         return f"{self.nomina.trabajador.nombre_completo} - {self.get_concepto_display()}"
 
 
+class NominaPendiente(models.Model):
+    """Pares (trabajador, quincena) cuya nómina debe recalcularse"""
+    
+    trabajador = models.ForeignKey(
+        Trabajador,
+        on_delete=models.CASCADE,
+        related_name='nominas_pendientes'
+    )
+    quincena = models.ForeignKey(
+        Quincena,
+        on_delete=models.CASCADE,
+        related_name='nominas_pendientes'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "Nómina Pendiente de Recálculo"
+        verbose_name_plural = "Nóminas Pendientes de Recálculo"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['trabajador', 'quincena'],
+                name='unique_nomina_pendiente_trabajador_quincena'
+            )
+        ]
+        
+    def __str__(self):
+        return f"{self.trabajador_id} - {self.quincena}"
+
+
 # ============================================================================
 # PRÉSTAMOS
 # ============================================================================
@@ -685,7 +748,11 @@ class AuditoriaLog(models.Model):
     datos_anteriores = models.JSONField(null=True, blank=True)
     datos_nuevos = models.JSONField(null=True, blank=True)
     ip_address = models.GenericIPAddressField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Identificador del evento en el spool del escritor asíncrono; hace
+    # idempotente la reinserción de un spool tras una caída
+    evento = models.UUIDField(unique=True, null=True, blank=True, editable=False)
+    # Momento del evento (no de la inserción, que puede ocurrir segundos después)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         verbose_name = "Log de Auditoría"
@@ -693,8 +760,28 @@ class AuditoriaLog(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['tabla_afectada', 'registro_id']),
-            models.Index(fields=['-created_at']),
+            # Orden de AuditoriaLogPagination
+            models.Index(fields=['-created_at', '-id'], name='auditoria_cursor_idx'),
         ]
         
     def __str__(self):
-        return f"{self.usuario} - {self.get_accion_display()} - {self.tabla_afectada} ({self.created_at})"
\ No newline at end of file
+        return f"{self.usuario} - {self.get_accion_display()} - {self.tabla_afectada} ({self.created_at})"
+
+# ============================================================================
+# VERSIONES DE CATÁLOGOS
+# ============================================================================
+
+class VersionCatalogo(models.Model):
+    """Contador que se incrementa cada vez que se escribe un modelo de catálogo"""
+    
+    nombre = models.CharField(max_length=50, unique=True)  # model_name del catálogo
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Versión de Catálogo"
+        verbose_name_plural = "Versiones de Catálogos"
+        ordering = ['nombre']
+        
+    def __str__(self):
+        return f"{self.nombre} v{self.version}"
@@ -0,0 +1,193 @@
+# backend/core/pagination.py
+
+import base64
+import heapq
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .models import Usuario
+from .services.archivo_auditoria import archivo_auditoria
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor sobre varias columnas: cada página filtra
+    "después de la última fila vista" en lugar de usar OFFSET, y no
+    ejecuta COUNT(*), así que la página N cuesta lo mismo que la primera.
+    ordering debe terminar en un campo único (id) y tener un índice con
+    el mismo orden.
+    """
+    ordering = ('-id',)
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Cursor inválido'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.modelo = queryset.model
+        valores, reverso = self.decodificar_cursor(request)
+
+        orden = [self.invertir(campo) for campo in self.ordering] if reverso else list(self.ordering)
+        queryset = queryset.order_by(*orden)
+        if valores is not None:
+            queryset = queryset.filter(self.despues_de(orden, valores))
+
+        filas = self.combinar(list(queryset[:self.page_size + 1]), valores, reverso, view)
+        hay_mas = len(filas) > self.page_size
+        filas = filas[:self.page_size]
+        if reverso:
+            filas.reverse()
+            self.has_next, self.has_previous = True, hay_mas
+        else:
+            self.has_next, self.has_previous = hay_mas, valores is not None
+
+        self.filas = filas
+        return filas
+
+    def combinar(self, filas, valores, reverso, view):
+        """Punto de extensión para agregar filas de otra fuente en el mismo orden"""
+        return filas
+
+    def get_page_size(self, request):
+        try:
+            tamaño = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(tamaño, 1), self.max_page_size)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.filas:
+            return None
+        return self.enlace(self.filas[-1], reverso=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.filas:
+            # Página vacía: volver al inicio
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.enlace(self.filas[0], reverso=True)
+
+    # ------------------------------------------------------------------------
+    # Cursor
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def invertir(campo):
+        return campo[1:] if campo.startswith('-') else f'-{campo}'
+
+    def campo_modelo(self, campo):
+        return self.modelo._meta.get_field(campo.lstrip('-'))
+
+    def despues_de(self, orden, valores):
+        """
+        Q de las filas que siguen a valores en el orden dado:
+        a >= x AND ((a > x) OR (a = x AND b > y) OR (a = x AND b = y AND c > z) ...)
+        La cota redundante sobre la primera columna permite que la base de
+        datos busque en el índice en lugar de recorrerlo desde el inicio.
+        """
+        condicion = Q(pk__in=[])
+        iguales = {}
+        for campo, valor in zip(orden, valores):
+            nombre = campo.lstrip('-')
+            operador = 'lt' if campo.startswith('-') else 'gt'
+            condicion |= Q(**iguales, **{f'{nombre}__{operador}': valor})
+            iguales[nombre] = valor
+
+        primero = orden[0]
+        operador = 'lte' if primero.startswith('-') else 'gte'
+        return Q(**{f'{primero.lstrip("-")}__{operador}': valores[0]}) & condicion
+
+    def enlace(self, fila, reverso):
+        valores = [
+            self.campo_modelo(campo).value_to_string(fila) for campo in self.ordering
+        ]
+        contenido = json.dumps({'v': valores, 'r': reverso}, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(contenido.encode()).decode()
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, cursor
+        )
+
+    def decodificar_cursor(self, request):
+        """Retorna (valores, reverso), o (None, False) sin cursor"""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            contenido = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            textos = contenido['v']
+            if len(textos) != len(self.ordering):
+                raise ValueError
+            valores = [
+                self.campo_modelo(campo).to_python(texto)
+                for campo, texto in zip(self.ordering, textos)
+            ]
+            return valores, bool(contenido.get('r'))
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class RegistroLaborPagination(KeysetPagination):
+    """Orden de RegistroLabor.Meta, desempatado por id"""
+    ordering = ('-fecha', 'trabajador_id', 'id')
+
+
+class AuditoriaLogPagination(KeysetPagination):
+    """Con ?incluir_archivo=1 continúa con las entradas archivadas"""
+    ordering = ('-created_at', '-id')
+
+    def combinar(self, filas, valores, reverso, view):
+        if not getattr(view, 'incluir_archivo', lambda: False)():
+            return filas
+        archivadas = archivo_auditoria.buscar(
+            filtros=view.filtros_archivo(),
+            despues_de=valores,
+            ascendente=reverso,
+            limite=self.page_size + 1,
+        )
+        if not archivadas:
+            return filas
+
+        # Un id en ambas fuentes (archivado pero aún no borrado) se toma de la tabla
+        ids = {fila.id for fila in filas}
+        archivadas = [fila for fila in archivadas if fila.id not in ids]
+        filas = list(heapq.merge(
+            filas, archivadas,
+            key=lambda fila: (fila.created_at, fila.id), reverse=not reverso,
+        ))[:self.page_size + 1]
+
+        # Un solo SELECT para los usuarios de las entradas archivadas
+        usuarios = Usuario.objects.select_related('rol').in_bulk(
+            {fila.usuario_id for fila in archivadas if fila.usuario_id}
+        )
+        for fila in archivadas:
+            fila.usuario = usuarios.get(fila.usuario_id)
+        return filas
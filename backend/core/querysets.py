@@ -0,0 +1,122 @@
+# backend/core/querysets.py
+
+from django.db.models import OuterRef, Prefetch, Subquery
+from django.utils import timezone
+
+from .models import Labor, ListaPrecios, DetalleNomina, CuotaPrestamo
+
+# ============================================================================
+# PLANES DE CONSULTA
+# Anotaciones que reemplazan las consultas por objeto de los serializers
+# (LaborListSerializer.get_precio_actual)
+# ============================================================================
+
+def precio_actual_subquery(labor_ref='pk'):
+    """Precio vigente hoy (sin fecha de fin) de la labor referenciada"""
+    return Subquery(
+        ListaPrecios.objects.filter(
+            labor=OuterRef(labor_ref),
+            fecha_inicio_vigencia__lte=timezone.now().date(),
+            fecha_fin_vigencia__isnull=True
+        ).order_by('-fecha_inicio_vigencia').values('precio')[:1]
+    )
+
+
+def labores_con_precio():
+    """Labores con unidad de medida y precio_vigente en la misma consulta"""
+    return Labor.objects.select_related('unidad_medida').annotate(
+        precio_vigente=precio_actual_subquery()
+    )
+
+
+def detalles_con_labor():
+    """Detalles de nómina con su labor (y precio_vigente) precargada"""
+    return DetalleNomina.objects.prefetch_related(
+        Prefetch('labor', queryset=labores_con_precio())
+    )
+
+
+def cuotas_con_quincena():
+    return CuotaPrestamo.objects.select_related('quincena')
+
+
+# ============================================================================
+# PLANES POR CAMPO ANIDADO
+# {campo del serializer: paso}; cada paso agrega al queryset lo necesario
+# para serializar ese campo sin consultas adicionales por fila.
+# ============================================================================
+
+def relacionar(*lookups):
+    """Paso de plan: select_related de los lookups"""
+    return lambda queryset: queryset.select_related(*lookups)
+
+
+def precargar(lookup, consulta=None):
+    """Paso de plan: prefetch_related del lookup, con consulta() si se da"""
+    def paso(queryset):
+        if consulta is None:
+            return queryset.prefetch_related(lookup)
+        return queryset.prefetch_related(Prefetch(lookup, queryset=consulta()))
+    return paso
+
+
+def optimizar(queryset, plan, expandidos=None):
+    """
+    Aplica los pasos del plan de los campos expandidos (None = todos), de
+    modo que solo se cargan las relaciones que se van a serializar.
+    """
+    for campo, paso in plan.items():
+        if expandidos is None or campo in expandidos:
+            queryset = paso(queryset)
+    return queryset
+
+
+PLAN_USUARIOS = {
+    'rol_info': relacionar('rol'),
+}
+
+PLAN_TRABAJADORES = {
+    'tipo_contrato_info': relacionar('tipo_contrato'),
+}
+
+PLAN_LABORES = {
+    'unidad_medida_info': relacionar('unidad_medida'),
+}
+
+PLAN_PRECIOS = {
+    'labor_info': precargar('labor', labores_con_precio),
+    'created_by_info': relacionar('created_by__rol'),
+}
+
+PLAN_VARIABLES = {
+    'created_by_info': relacionar('created_by__rol'),
+}
+
+# RegistroLaborSerializer: una consulta con los joins, más una por las
+# labores de la página.
+PLAN_REGISTROS = {
+    'trabajador_info': relacionar('trabajador__tipo_contrato'),
+    'labor_info': precargar('labor', labores_con_precio),
+    'quincena_info': relacionar('quincena'),
+    'created_by_info': relacionar('created_by__rol'),
+    'updated_by_info': relacionar('updated_by__rol'),
+}
+
+# NominaSerializer: una consulta con los joins y, con detalles, dos más
+# (detalles y sus labores) sin importar el tamaño de la página.
+PLAN_NOMINAS = {
+    'trabajador_info': relacionar('trabajador__tipo_contrato'),
+    'quincena_info': relacionar('quincena'),
+    'created_by_info': relacionar('created_by__rol'),
+    'detalles': precargar('detalles', detalles_con_labor),
+}
+
+PLAN_PRESTAMOS = {
+    'trabajador_info': relacionar('trabajador__tipo_contrato'),
+    'cuotas': precargar('cuotas', cuotas_con_quincena),
+    'created_by_info': relacionar('created_by__rol'),
+}
+
+PLAN_AUDITORIA = {
+    'usuario_info': relacionar('usuario__rol'),
+}
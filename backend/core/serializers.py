@@ -1,6 +1,9 @@
 # backend/core/serializers.py
 
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.contrib.auth import authenticate
 from .models import (
     Usuario, Rol, TipoContrato, Trabajador,
@@ -8,7 +11,45 @@ from .models import (
     Quincena, RegistroLabor, Nomina, DetalleNomina,
     Prestamo, CuotaPrestamo, AuditoriaLog
 )
-from decimal import Decimal
+from .services.prestamos import calcular_valor_cuota, generar_cuotas
+from .services.pendientes import marcar_por_prestamos
+from .services.versiones import incrementar, nombre_catalogo
+from .services.auditoria import registrar_creados, registrar_vista_sensible
+from .authentication import CLAIM_SESION, CLAIM_VERSION, agregar_claims
+from .permissions import nombre_rol
+
+# ============================================================================
+# CAMPOS
+# ============================================================================
+
+class PrecargadoRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField que resuelve la llave contra un mapa {pk: objeto}
+    del contexto (cargado una vez por request en los endpoints masivos).
+    Sin mapa en el contexto se comporta como el campo normal.
+    """
+    
+    def __init__(self, mapa_contexto, **kwargs):
+        self.mapa_contexto = mapa_contexto
+        super().__init__(**kwargs)
+    
+    def to_internal_value(self, data):
+        mapa = self.context.get(self.mapa_contexto)
+        if mapa is None:
+            return super().to_internal_value(data)
+        
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        
+        objeto = mapa.get(pk)
+        if objeto is None:
+            self.fail('does_not_exist', pk_value=data)
+        return objeto
+
 
 # ============================================================================
 # AUTENTICACIÓN
@@ -37,6 +78,50 @@ class LoginSerializer(serializers.Serializer):
         return data
 
 
+class TokenRolObtainPairSerializer(TokenObtainPairSerializer):
+    """Login JWT con el rol y la versión de permisos como claims"""
+    
+    @classmethod
+    def get_token(cls, user):
+        return agregar_claims(super().get_token(user), user)
+
+
+class TokenRolRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresca el token con el rol y la versión de permisos actuales del
+    usuario. Un cambio de rol solo obliga a refrescar; uno de contraseña o
+    de estado (version_sesion) invalida también el refresh token.
+    """
+    
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if CLAIM_VERSION not in refresh or CLAIM_SESION not in refresh:
+            # Emitido antes de las versiones: no se puede revocar
+            raise InvalidToken('Token sin versión de permisos, inicie sesión de nuevo')
+        usuario = Usuario.objects.select_related('rol').filter(
+            pk=refresh.get(jwt_settings.USER_ID_CLAIM)
+        ).first()
+        if usuario is None or not usuario.is_active:
+            raise InvalidToken('Usuario inactivo o inexistente')
+        if refresh[CLAIM_SESION] != usuario.version_sesion:
+            raise InvalidToken('La sesión se cerró (cambio de contraseña o de estado), inicie sesión de nuevo')
+        agregar_claims(refresh, usuario)
+        
+        data = {'access': str(refresh.access_token)}
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    # token_blacklist no está instalado
+                    pass
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        return data
+
+
 # ============================================================================
 # USUARIOS Y ROLES
 # ============================================================================
@@ -150,15 +235,16 @@ class TrabajadorDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
     
     def to_representation(self, instance):
-        """Ocultar cuenta bancaria según rol del usuario"""
+        """Ocultar cuenta bancaria según rol del usuario y auditar la cuenta completa"""
         data = super().to_representation(instance)
         request = self.context.get('request')
         
-        # Si no es SUPER_ADMIN, ocultar cuenta completa
         if request and hasattr(request, 'user'):
-            user = request.user
-            if not user.rol or user.rol.nombre != Rol.SUPER_ADMIN:
+            # Si no es SUPER_ADMIN, ocultar cuenta completa
+            if nombre_rol(request.user) != Rol.SUPER_ADMIN:
                 data['numero_cuenta_bancaria'] = instance.cuenta_oculta
+            elif data.get('numero_cuenta_bancaria'):
+                registrar_vista_sensible(request, instance, ['numero_cuenta_bancaria'])
         
         return data
 
@@ -212,7 +298,10 @@ class LaborListSerializer(serializers.ModelSerializer):
         ]
     
     def get_precio_actual(self, obj):
-        """Obtener precio vigente actual"""
+        """Obtener precio vigente actual (anotado por querysets.labores_con_precio)"""
+        if hasattr(obj, 'precio_vigente'):
+            return obj.precio_vigente
+        
         from django.utils import timezone
         precio = obj.precios.filter(
             fecha_inicio_vigencia__lte=timezone.now().date(),
@@ -292,11 +381,24 @@ class ListaPreciosCreateSerializer(serializers.ModelSerializer):
             fecha_fin_vigencia__isnull=True,
             fecha_inicio_vigencia__lt=fecha_inicio
         ).update(fecha_fin_vigencia=fecha_inicio)
+        # update() no envía señales
+        incrementar(nombre_catalogo(ListaPrecios))
         
         # Crear nuevo precio
         return super().create(validated_data)
 
 
+class PrecioConsultaSerializer(serializers.Serializer):
+    """Un par (labor, fecha) para resolver su precio vigente"""
+    labor = serializers.IntegerField(min_value=1)
+    fecha = serializers.DateField()
+
+
+class ResolverPreciosSerializer(serializers.Serializer):
+    """Consulta masiva de precios por (labor, fecha)"""
+    consultas = PrecioConsultaSerializer(many=True, allow_empty=False, max_length=5000)
+
+
 class VariablesNominaSerializer(serializers.ModelSerializer):
     nombre_display = serializers.CharField(source='get_nombre_display', read_only=True)
     created_by_info = UsuarioSerializer(source='created_by', read_only=True)
@@ -320,7 +422,6 @@ class VariablesNominaSerializer(serializers.ModelSerializer):
 class QuincenaSerializer(serializers.ModelSerializer):
     estado_display = serializers.CharField(source='get_estado_display', read_only=True)
     puede_registrar = serializers.BooleanField(read_only=True)
-    total_registros = serializers.SerializerMethodField()
     
     class Meta:
         model = Quincena
@@ -330,10 +431,7 @@ class QuincenaSerializer(serializers.ModelSerializer):
             'estado', 'estado_display', 'puede_registrar',
             'total_registros', 'created_at'
         ]
-        read_only_fields = ['created_at']
-    
-    def get_total_registros(self, obj):
-        return obj.registros.count()
+        read_only_fields = ['total_registros', 'created_at']
 
 
 class RegistroLaborSerializer(serializers.ModelSerializer):
@@ -357,6 +455,10 @@ class RegistroLaborSerializer(serializers.ModelSerializer):
 
 
 class RegistroLaborCreateUpdateSerializer(serializers.ModelSerializer):
+    trabajador = PrecargadoRelatedField('trabajadores', queryset=Trabajador.objects.all())
+    labor = PrecargadoRelatedField('labores', queryset=Labor.objects.all())
+    quincena = PrecargadoRelatedField('quincenas', queryset=Quincena.objects.all())
+    
     class Meta:
         model = RegistroLabor
         fields = ['trabajador', 'labor', 'quincena', 'fecha', 'cantidad', 'observaciones']
@@ -381,6 +483,14 @@ class RegistroLaborCreateUpdateSerializer(serializers.ModelSerializer):
         return data
 
 
+class RegistroLaborBatchSerializer(serializers.Serializer):
+    """Lote de registros de labores para carga masiva"""
+    registros = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=10000
+    )
+    todo_o_nada = serializers.BooleanField(default=False)
+
+
 # ============================================================================
 # NÓMINA
 # ============================================================================
@@ -426,6 +536,14 @@ class NominaSerializer(serializers.ModelSerializer):
         ]
 
 
+class NominaListSerializer(NominaSerializer):
+    """Serializer para listado (sin detalles)"""
+    detalles = None
+    
+    class Meta(NominaSerializer.Meta):
+        fields = [campo for campo in NominaSerializer.Meta.fields if campo != 'detalles']
+
+
 # ============================================================================
 # PRÉSTAMOS
 # ============================================================================
@@ -464,13 +582,36 @@ class PrestamoSerializer(serializers.ModelSerializer):
         read_only_fields = ['saldo_pendiente', 'created_at', 'created_by']
 
 
+class PrestamoBulkCreateSerializer(serializers.ListSerializer):
+    """Crea un lote de préstamos con un INSERT para préstamos y otro para cuotas"""
+    
+    def create(self, validated_data):
+        prestamos = [
+            Prestamo(**PrestamoCreateSerializer.preparar(datos))
+            for datos in validated_data
+        ]
+        Prestamo.objects.bulk_create(prestamos)
+        CuotaPrestamo.objects.bulk_create([
+            cuota
+            for prestamo in prestamos if prestamo.tipo_pago == 'CUOTAS'
+            for cuota in generar_cuotas(prestamo)
+        ])
+        # bulk_create no envía post_save: marcar y auditar a mano
+        marcar_por_prestamos({prestamo.trabajador_id for prestamo in prestamos})
+        registrar_creados(prestamos)
+        return prestamos
+
+
 class PrestamoCreateSerializer(serializers.ModelSerializer):
+    trabajador = PrecargadoRelatedField('trabajadores', queryset=Trabajador.objects.all())
+    
     class Meta:
         model = Prestamo
         fields = [
             'trabajador', 'monto_total', 'fecha_prestamo',
             'tipo_pago', 'numero_cuotas', 'observaciones'
         ]
+        list_serializer_class = PrestamoBulkCreateSerializer
     
     def validate(self, data):
         """Validar lógica de préstamos"""
@@ -486,32 +627,27 @@ class PrestamoCreateSerializer(serializers.ModelSerializer):
         
         return data
     
-    def create(self, validated_data):
-        """Crear préstamo y sus cuotas si aplica"""
+    @staticmethod
+    def preparar(validated_data):
+        """Completar valor de cuota y saldo pendiente"""
         tipo_pago = validated_data['tipo_pago']
         monto_total = validated_data['monto_total']
         numero_cuotas = validated_data.get('numero_cuotas')
         
         # Calcular valor de cuota si es a cuotas
         if tipo_pago == 'CUOTAS' and numero_cuotas:
-            validated_data['valor_cuota'] = monto_total / numero_cuotas
+            validated_data['valor_cuota'] = calcular_valor_cuota(monto_total, numero_cuotas)
         
         # Inicializar saldo pendiente
         validated_data['saldo_pendiente'] = monto_total
+        return validated_data
+    
+    def create(self, validated_data):
+        """Crear préstamo y sus cuotas (un solo INSERT) si aplica"""
+        prestamo = super().create(self.preparar(validated_data))
         
-        # Crear préstamo
-        prestamo = super().create(validated_data)
-        
-        # Crear cuotas si es a cuotas
-        if tipo_pago == 'CUOTAS':
-            valor_cuota = prestamo.valor_cuota
-            for i in range(1, numero_cuotas + 1):
-                CuotaPrestamo.objects.create(
-                    prestamo=prestamo,
-                    numero_cuota=i,
-                    valor_cuota=valor_cuota,
-                    estado='PENDIENTE'
-                )
+        if prestamo.tipo_pago == 'CUOTAS':
+            CuotaPrestamo.objects.bulk_create(generar_cuotas(prestamo))
         
         return prestamo
 
@@ -0,0 +1 @@
+# backend/core/services/__init__.py
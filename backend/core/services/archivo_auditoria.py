@@ -0,0 +1,165 @@
+# backend/core/services/archivo_auditoria.py
+
+import gzip
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.models import AuditoriaLog
+
+# Campos de AuditoriaLog que se guardan en el archivo
+CAMPOS_ARCHIVO = [
+    'id', 'usuario_id', 'accion', 'tabla_afectada', 'registro_id',
+    'datos_anteriores', 'datos_nuevos', 'ip_address', 'evento', 'created_at',
+]
+
+# Filtros de /api/auditoria/ -> campo en el archivo y en el índice
+FILTROS_ARCHIVO = {
+    'accion': ('accion', 'acciones'),
+    'tabla_afectada': ('tabla_afectada', 'tablas'),
+    'usuario': ('usuario_id', 'usuarios'),
+}
+
+
+class ArchivoAuditoria:
+    """
+    Entradas de AuditoriaLog movidas fuera de la tabla, en un archivo
+    JSON lines comprimido por día (AAAA/MM/auditoria-AAAA-MM-DD.jsonl.gz).
+    indice.json resume cada partición (filas, rango de fechas e ids,
+    acciones, tablas y usuarios) para leer solo las que pueden coincidir.
+    """
+    NOMBRE_INDICE = 'indice.json'
+
+    def __init__(self, directorio=None):
+        self._directorio = directorio
+
+    @property
+    def directorio(self):
+        return Path(self._directorio or settings.AUDITORIA_ARCHIVO_DIR)
+
+    # ------------------------------------------------------------------------
+    # Índice
+    # ------------------------------------------------------------------------
+
+    def indice(self):
+        ruta = self.directorio / self.NOMBRE_INDICE
+        if not ruta.exists():
+            return {}
+        with open(ruta, encoding='utf-8') as archivo:
+            return json.load(archivo)['particiones']
+
+    def guardar_indice(self, particiones):
+        """Reemplaza el índice de forma atómica"""
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        ruta = self.directorio / self.NOMBRE_INDICE
+        temporal = ruta.with_suffix('.tmp')
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump({'particiones': particiones}, archivo, indent=1, sort_keys=True)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, ruta)
+
+    # ------------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def dia(created_at):
+        return timezone.localdate(created_at).isoformat()
+
+    def agregar(self, particiones, dia, filas):
+        """
+        Agrega filas (dicts de CAMPOS_ARCHIVO) a la partición del día como un
+        miembro gzip nuevo y actualiza particiones (el índice en memoria).
+        """
+        relativa = f'{dia[:4]}/{dia[5:7]}/auditoria-{dia}.jsonl.gz'
+        ruta = self.directorio / relativa
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with open(ruta, 'ab') as crudo:
+            with gzip.GzipFile(fileobj=crudo, mode='wb') as archivo:
+                for fila in filas:
+                    # isoformat() con microsegundos (DjangoJSONEncoder los corta a
+                    # milisegundos): el cursor del listado compara created_at exacto
+                    fila = {**fila, 'created_at': fila['created_at'].isoformat()}
+                    linea = json.dumps(fila, cls=DjangoJSONEncoder, separators=(',', ':'))
+                    archivo.write(linea.encode('utf-8') + b'\n')
+            crudo.flush()
+            os.fsync(crudo.fileno())
+
+        fechas = [fila['created_at'].isoformat() for fila in filas]
+        ids = [fila['id'] for fila in filas]
+        particion = particiones.setdefault(dia, {
+            'archivo': relativa, 'filas': 0,
+            'desde': min(fechas), 'hasta': max(fechas),
+            'id_min': min(ids), 'id_max': max(ids),
+            'acciones': [], 'tablas': [], 'usuarios': [],
+        })
+        particion['filas'] += len(filas)
+        particion['desde'] = min(particion['desde'], *fechas)
+        particion['hasta'] = max(particion['hasta'], *fechas)
+        particion['id_min'] = min(particion['id_min'], *ids)
+        particion['id_max'] = max(particion['id_max'], *ids)
+        for campo, (columna, clave) in FILTROS_ARCHIVO.items():
+            valores = set(particion[clave]) | {fila[columna] for fila in filas}
+            particion[clave] = sorted(valores - {None}, key=str)
+
+    # ------------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------------
+
+    def leer_particion(self, particion):
+        """Filas de la partición como dicts, sin repetidos (por id)"""
+        vistos = set()
+        filas = []
+        with gzip.open(self.directorio / particion['archivo'], 'rt', encoding='utf-8') as archivo:
+            for linea in archivo:
+                fila = json.loads(linea)
+                if fila['id'] in vistos:
+                    continue
+                vistos.add(fila['id'])
+                fila['created_at'] = parse_datetime(fila['created_at'])
+                filas.append(fila)
+        return filas
+
+    def buscar(self, filtros=None, despues_de=None, ascendente=False, limite=None):
+        """
+        AuditoriaLog (sin guardar) del archivo en orden (created_at, id),
+        descendente por defecto. filtros: {accion|tabla_afectada|usuario: valor}.
+        despues_de: (created_at, id) de la última fila vista en ese orden.
+        """
+        filtros = {
+            FILTROS_ARCHIVO[campo]: str(valor)
+            for campo, valor in (filtros or {}).items() if campo in FILTROS_ARCHIVO
+        }
+        dia_cursor = self.dia(despues_de[0]) if despues_de else None
+
+        resultado = []
+        for dia, particion in sorted(self.indice().items(), reverse=not ascendente):
+            if dia_cursor and (dia < dia_cursor if ascendente else dia > dia_cursor):
+                continue
+            if any(valor not in map(str, particion[clave]) for (_, clave), valor in filtros.items()):
+                continue
+
+            filas = [
+                fila for fila in self.leer_particion(particion)
+                if all(str(fila[columna]) == valor for (columna, _), valor in filtros.items())
+            ]
+            if despues_de:
+                if ascendente:
+                    filas = [f for f in filas if (f['created_at'], f['id']) > tuple(despues_de)]
+                else:
+                    filas = [f for f in filas if (f['created_at'], f['id']) < tuple(despues_de)]
+            filas.sort(key=lambda f: (f['created_at'], f['id']), reverse=not ascendente)
+            resultado.extend(filas)
+            if limite is not None and len(resultado) >= limite:
+                break
+
+        return [AuditoriaLog(**fila) for fila in resultado[:limite]]
+
+
+archivo_auditoria = ArchivoAuditoria()
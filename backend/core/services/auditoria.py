@@ -0,0 +1,469 @@
+# backend/core/services/auditoria.py
+
+import atexit
+import ctypes
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connections, transaction
+from django.utils import timezone
+
+from core.models import AuditoriaLog
+
+logger = logging.getLogger(__name__)
+
+# Campos que nunca se copian a la auditoría
+CAMPOS_EXCLUIDOS = {'password'}
+
+# (usuario_id, ip) de la petición en curso; lo activan los viewsets de core
+_contexto = ContextVar('contexto_auditoria', default=None)
+
+# Espera entre reintentos de un lote que no se pudo insertar (segundos)
+REINTENTO_INICIAL = 1
+REINTENTO_MAXIMO = 60
+
+# Segundos que el proceso espera al salir a que se escriba lo encolado
+ESPERA_AL_SALIR = 10
+
+# Marca en la cola para que el hilo escritor termine
+_FIN = object()
+
+# Windows: OpenProcess / GetExitCodeProcess (os.kill(pid, 0) no sirve allí)
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+ERROR_ACCESS_DENIED = 5
+STILL_ACTIVE = 259
+
+
+# ============================================================================
+# CONTEXTO Y EVENTOS
+# ============================================================================
+
+def ip_cliente(request):
+    reenviada = request.META.get('HTTP_X_FORWARDED_FOR')
+    if reenviada:
+        return reenviada.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR') or '0.0.0.0'
+
+
+@contextmanager
+def contexto_auditoria(usuario_id, ip):
+    token = _contexto.set((usuario_id, ip))
+    try:
+        yield
+    finally:
+        _contexto.reset(token)
+
+
+def activar_contexto(usuario_id, ip):
+    """Como contexto_auditoria, para quien no puede usar with; retorna el token para desactivar"""
+    return _contexto.set((usuario_id, ip))
+
+
+def desactivar_contexto(token):
+    _contexto.reset(token)
+
+
+def contexto_activo():
+    return _contexto.get() is not None
+
+
+def instantanea(instancia):
+    """{attname: valor} JSON de los campos de la instancia"""
+    datos = {
+        campo.attname: campo.value_from_object(instancia)
+        for campo in instancia._meta.concrete_fields
+        if campo.attname not in CAMPOS_EXCLUIDOS
+    }
+    return a_json(datos)
+
+
+def a_json(datos):
+    if datos is None:
+        return None
+    datos = {clave: valor for clave, valor in datos.items() if clave not in CAMPOS_EXCLUIDOS}
+    return json.loads(json.dumps(datos, cls=DjangoJSONEncoder))
+
+
+def compactar(datos):
+    """Sin los campos vacíos (None o ''), que no aportan a la auditoría"""
+    if datos is None:
+        return None
+    return {clave: valor for clave, valor in datos.items() if valor not in (None, '')}
+
+
+def diferencias(anteriores, nuevos, ignorar=()):
+    """
+    (anteriores, nuevos) con solo los campos que cambiaron; ignorar son
+    campos que cambian solos (updated_at). Sin cambios retorna ({}, {}).
+    """
+    cambiados = [
+        clave for clave, valor in nuevos.items()
+        if clave not in ignorar and anteriores.get(clave) != valor
+    ]
+    return (
+        {clave: anteriores.get(clave) for clave in cambiados},
+        {clave: nuevos[clave] for clave in cambiados},
+    )
+
+
+def campos_automaticos(modelo):
+    return {
+        campo.attname for campo in modelo._meta.concrete_fields
+        if getattr(campo, 'auto_now', False)
+    }
+
+
+def registrar(accion, modelo, registro_id, datos_anteriores=None, datos_nuevos=None,
+              usuario_id=None, ip=None):
+    """
+    Encola un evento de auditoría cuando se confirma la transacción en curso.
+    Sin usuario/ip explícitos se usan los del contexto de la petición; fuera
+    de una petición auditada no hace nada.
+    """
+    contexto = _contexto.get()
+    if usuario_id is None and ip is None:
+        if contexto is None:
+            return
+        usuario_id, ip = contexto
+
+    evento = {
+        'evento': uuid.uuid4().hex,
+        'usuario_id': usuario_id,
+        'accion': accion,
+        'tabla_afectada': modelo._meta.db_table,
+        'registro_id': registro_id,
+        'datos_anteriores': datos_anteriores,
+        'datos_nuevos': datos_nuevos,
+        'ip_address': ip,
+        'created_at': timezone.now().isoformat(),
+    }
+    transaction.on_commit(lambda: escritor.registrar(evento))
+
+
+def registrar_creados(instancias):
+    """CREATE de instancias guardadas con bulk_create (que no envía señales)"""
+    if not contexto_activo():
+        return
+    for instancia in instancias:
+        registrar(
+            'CREATE', type(instancia), instancia.pk,
+            datos_nuevos=compactar(instantanea(instancia)),
+        )
+
+
+def registrar_vista_sensible(request, instancia, campos):
+    """VIEW_SENSITIVE: el usuario vio los campos sensibles de la instancia"""
+    registrar(
+        'VIEW_SENSITIVE', type(instancia), instancia.pk,
+        datos_nuevos={'campos': list(campos)},
+        usuario_id=request.user.pk, ip=ip_cliente(request),
+    )
+
+
+# ============================================================================
+# ESCRITOR EN SEGUNDO PLANO
+# ============================================================================
+
+class EscritorAuditoria:
+    """
+    Cola en memoria de eventos de auditoría que un hilo del proceso inserta
+    con bulk_create cuando hay AUDITORIA_LOTE eventos o pasan
+    AUDITORIA_INTERVALO segundos desde el primero del lote.
+    Cada evento se escribe antes en un segmento de spool (JSON lines) del
+    proceso; el segmento se borra cuando todos sus eventos están en la base
+    de datos. Un lote que falla se reintenta con espera creciente.
+    Al arrancar, el hilo reinserta los segmentos que dejaron procesos
+    terminados; el campo evento (único) evita duplicados. Los segmentos
+    llevan el pid y un identificador del arranque, así un proceso nuevo con
+    un pid reutilizado (PID 1 en contenedores) también recupera los del
+    proceso anterior.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+
+    # ------------------------------------------------------------------------
+    # Configuración
+    # ------------------------------------------------------------------------
+
+    @property
+    def asincrono(self):
+        return getattr(settings, 'AUDITORIA_ASINCRONA', True)
+
+    @property
+    def directorio(self):
+        return Path(settings.AUDITORIA_SPOOL_DIR)
+
+    def _iniciar(self):
+        """Estado del proceso actual (también después de un fork)"""
+        self._pid = os.getpid()
+        self._arranque = uuid.uuid4().hex[:12]
+        self._cola = queue.Queue()
+        self._pendientes = Counter()
+        self._segmento = None
+        self._archivo = None
+        self._numero_segmento = 0
+        self._estadisticas = Counter()
+        self._hilo = threading.Thread(
+            target=self._ejecutar, name='escritor-auditoria', daemon=True
+        )
+        self._hilo.start()
+
+    # ------------------------------------------------------------------------
+    # Productores
+    # ------------------------------------------------------------------------
+
+    def registrar(self, evento):
+        if not self.asincrono:
+            self._insertar([evento])
+            return
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._iniciar()
+            segmento = self._escribir_spool(evento)
+            self._estadisticas['encolados'] += 1
+        self._cola.put((segmento, evento))
+
+    def _escribir_spool(self, evento):
+        if self._archivo is None:
+            self.directorio.mkdir(parents=True, exist_ok=True)
+            self._numero_segmento += 1
+            self._segmento = self.directorio / (
+                f'auditoria-{self._pid}-{self._arranque}-{self._numero_segmento}.jsonl'
+            )
+            self._archivo = open(self._segmento, 'x', encoding='utf-8')
+        segmento = self._segmento
+        self._archivo.write(json.dumps(evento, separators=(',', ':')) + '\n')
+        self._archivo.flush()
+        if getattr(settings, 'AUDITORIA_FSYNC', False):
+            os.fsync(self._archivo.fileno())
+        self._pendientes[segmento] += 1
+        if self._archivo.tell() >= settings.AUDITORIA_SEGMENTO_BYTES:
+            self._cerrar_segmento()
+        return segmento
+
+    def _cerrar_segmento(self):
+        """Los eventos siguientes van a un segmento nuevo"""
+        segmento = self._segmento
+        self._archivo.close()
+        self._archivo = None
+        if not self._pendientes[segmento]:
+            self._borrar_segmento(segmento)
+
+    def _borrar_segmento(self, segmento):
+        self._pendientes.pop(segmento, None)
+        try:
+            segmento.unlink()
+        except FileNotFoundError:
+            pass
+
+    # ------------------------------------------------------------------------
+    # Hilo escritor
+    # ------------------------------------------------------------------------
+
+    def _ejecutar(self):
+        self._recuperar_spool()
+        while True:
+            lote, fin = self._tomar_lote()
+            espera = REINTENTO_INICIAL
+            while lote and not self._escribir_lote(lote):
+                # Los eventos siguen en el spool y en el lote; la base de datos
+                # puede estar caída o bloqueada un momento
+                time.sleep(espera)
+                espera = min(espera * 2, REINTENTO_MAXIMO)
+            if fin:
+                connections.close_all()
+                self._cola.task_done()
+                return
+
+    def _tomar_lote(self):
+        """Eventos del próximo lote y si llegó la orden de terminar"""
+        elemento = self._cola.get()
+        if elemento is _FIN:
+            return [], True
+        lote = [elemento]
+        limite = time.monotonic() + settings.AUDITORIA_INTERVALO
+        while len(lote) < settings.AUDITORIA_LOTE:
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                elemento = self._cola.get(timeout=restante)
+            except queue.Empty:
+                break
+            if elemento is _FIN:
+                return lote, True
+            lote.append(elemento)
+        return lote, False
+
+    def _escribir_lote(self, lote):
+        """True si el lote quedó en la base de datos"""
+        close_old_connections()
+        try:
+            self._insertar([evento for _, evento in lote])
+        except Exception:
+            logger.exception('No se pudo escribir un lote de %s eventos de auditoría', len(lote))
+            with self._lock:
+                self._estadisticas['errores'] += 1
+            return False
+
+        with self._lock:
+            self._estadisticas['escritos'] += len(lote)
+            self._estadisticas['lotes'] += 1
+            for segmento, cantidad in Counter(segmento for segmento, _ in lote).items():
+                self._pendientes[segmento] -= cantidad
+                if self._pendientes[segmento] > 0:
+                    continue
+                if segmento == self._segmento and self._archivo is not None:
+                    self._cerrar_segmento()
+                else:
+                    self._borrar_segmento(segmento)
+        # Después de limpiar el spool, para que vaciar() lo encuentre al día
+        for _ in lote:
+            self._cola.task_done()
+        return True
+
+    def _insertar(self, eventos):
+        AuditoriaLog.objects.bulk_create(
+            [AuditoriaLog(**evento) for evento in eventos],
+            batch_size=settings.AUDITORIA_LOTE,
+            ignore_conflicts=True,
+        )
+
+    def _recuperar_spool(self):
+        """
+        Inserta los segmentos de procesos que ya no existen, incluidos los de
+        un proceso anterior con el mismo pid (otro identificador de arranque)
+        """
+        if not self.directorio.exists():
+            return
+        for segmento in sorted(self.directorio.glob('auditoria-*.jsonl')):
+            # auditoria-<pid>-<arranque>-<n>, o auditoria-<pid>-<n> de versiones anteriores
+            partes = segmento.stem.split('-')
+            try:
+                pid = int(partes[1])
+            except (IndexError, ValueError):
+                continue
+            arranque = partes[2] if len(partes) == 4 else None
+            if pid == self._pid:
+                if arranque == self._arranque:
+                    continue
+            elif proceso_vivo(pid):
+                continue
+            close_old_connections()
+            try:
+                self._insertar(leer_segmento(segmento))
+                segmento.unlink()
+                with self._lock:
+                    self._estadisticas['recuperados'] += 1
+            except Exception:
+                logger.exception('No se pudo recuperar el spool de auditoría %s', segmento)
+
+    # ------------------------------------------------------------------------
+    # Control
+    # ------------------------------------------------------------------------
+
+    def vaciar(self, espera=None):
+        """
+        Espera a que el hilo escriba todo lo encolado (pruebas y apagado), a
+        lo sumo espera segundos. Retorna True si no quedó nada pendiente.
+        """
+        if self._pid != os.getpid():
+            return True
+        with self._cola.all_tasks_done:
+            return self._cola.all_tasks_done.wait_for(
+                lambda: not self._cola.unfinished_tasks, espera
+            )
+
+    def detener(self, espera=None):
+        """
+        Escribe lo encolado, cierra las conexiones del hilo y lo termina; el
+        próximo evento arranca uno nuevo. Retorna True si el hilo terminó.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                return True
+            self._pid = None
+            hilo = self._hilo
+        self._cola.put(_FIN)
+        hilo.join(espera)
+        return not hilo.is_alive()
+
+    def estadisticas(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                return {'activo': False}
+            return {
+                'activo': self._hilo.is_alive(),
+                'en_cola': self._cola.qsize(),
+                'pendientes_spool': sum(self._pendientes.values()),
+                'encolados': self._estadisticas['encolados'],
+                'escritos': self._estadisticas['escritos'],
+                'lotes': self._estadisticas['lotes'],
+                'errores': self._estadisticas['errores'],
+                'segmentos_recuperados': self._estadisticas['recuperados'],
+            }
+
+
+def proceso_vivo(pid):
+    if os.name == 'nt':
+        return proceso_vivo_windows(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def proceso_vivo_windows(pid):
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # Existe pero pertenece a otro usuario
+        return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+    try:
+        codigo = ctypes.c_ulong()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(codigo)):
+            return True
+        return codigo.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def leer_segmento(segmento):
+    eventos = []
+    with open(segmento, encoding='utf-8') as archivo:
+        for linea in archivo:
+            try:
+                eventos.append(json.loads(linea))
+            except json.JSONDecodeError:
+                # Última línea cortada por una caída a mitad de escritura
+                continue
+    return eventos
+
+
+escritor = EscritorAuditoria()
+
+
+@atexit.register
+def _vaciar_al_salir():
+    try:
+        # Si la base de datos no responde los eventos quedan en el spool
+        escritor.detener(ESPERA_AL_SALIR)
+    except Exception:
+        pass
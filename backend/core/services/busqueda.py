@@ -0,0 +1,221 @@
+# backend/core/services/busqueda.py
+
+import re
+import unicodedata
+from functools import reduce
+from operator import and_
+
+from django.db import connection
+from django.db.models import CharField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from core.models import Trabajador
+
+# SQLite: tabla FTS5 con nombre completo y documento de cada trabajador;
+# rowid = Trabajador.id. La crea la migración 0010 y la mantienen las señales.
+TABLA_FTS = 'core_trabajador_fts'
+
+# bm25 por columna: una coincidencia en el documento pesa más que en el nombre
+PESOS_FTS = (1.0, 2.0)
+
+# PostgreSQL: índice GIN de trigramas sobre esta expresión (migración 0011);
+# la consulta debe usar la misma expresión para que el índice aplique
+NOMBRE_TRIGRAMAS = (
+    "core_unaccent(lower(core_trabajador.nombres || ' ' || core_trabajador.apellidos))"
+)
+FUNCION_TRIGRAMAS = 'core_unaccent'
+
+MAX_TERMINOS = 6
+
+# Motores de búsqueda
+FTS5 = 'fts5'
+TRIGRAMAS = 'trigramas'
+
+# Resultado de motor() en este proceso; el centinela indica que aún no se detectó
+_SIN_DETECTAR = object()
+_motor = _SIN_DETECTAR
+
+
+def normalizar(texto):
+    """Minúsculas, sin tildes ni signos: 'Muñoz-Peña' -> 'munoz pena'"""
+    texto = unicodedata.normalize('NFKD', str(texto or ''))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(re.sub(r'[^\w]+', ' ', texto.lower()).split())
+
+
+def terminos(texto):
+    return normalizar(texto).split()[:MAX_TERMINOS]
+
+
+def motor():
+    """
+    FTS5 en SQLite, TRIGRAMAS en PostgreSQL con pg_trgm, o None si la base
+    de datos no tiene índice de búsqueda (se usan consultas icontains).
+    Se detecta una vez por proceso, también cuando no hay índice.
+    """
+    global _motor
+    if _motor is _SIN_DETECTAR:
+        _motor = _detectar_motor()
+    return _motor
+
+
+def _detectar_motor():
+    if connection.vendor == 'sqlite':
+        return FTS5 if TABLA_FTS in connection.introspection.table_names() else None
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1 FROM pg_proc WHERE proname = %s', [FUNCION_TRIGRAMAS])
+            return TRIGRAMAS if cursor.fetchone() else None
+    return None
+
+
+def olvidar_motor():
+    """Vuelve a detectar el motor en la próxima búsqueda (tras migrar o reindexar)"""
+    global _motor
+    _motor = _SIN_DETECTAR
+
+
+def fts_disponible():
+    return motor() == FTS5
+
+
+# ============================================================================
+# CONSULTAS
+# ============================================================================
+
+def filtrar(queryset, texto):
+    """Filtra un queryset de Trabajador por el texto (sin ordenar por relevancia)"""
+    if motor() == FTS5:
+        consulta = consulta_fts(texto)
+        if consulta is None:
+            return queryset
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {TABLA_FTS} WHERE {TABLA_FTS} MATCH %s', [consulta]
+        ))
+    if motor() == TRIGRAMAS:
+        return filtrar_trigramas(queryset, texto)
+    return queryset.filter(condicion_icontains(texto))
+
+
+def buscar(texto, limite=20, estado=None):
+    """Ids de los trabajadores que coinciden, del más relevante al menos"""
+    if motor() == FTS5:
+        return buscar_fts(texto, limite, estado)
+
+    queryset = Trabajador.objects.all()
+    if estado:
+        queryset = queryset.filter(estado=estado)
+    if motor() == TRIGRAMAS:
+        queryset = filtrar_trigramas(queryset, texto).annotate(
+            relevancia=RawSQL(
+                f'similarity({NOMBRE_TRIGRAMAS}, %s)', [normalizar(texto)],
+                output_field=FloatField(),
+            )
+        ).order_by('-relevancia', 'apellidos', 'nombres')
+    else:
+        queryset = queryset.filter(condicion_icontains(texto))
+    return list(queryset.values_list('id', flat=True)[:limite])
+
+
+def condicion_icontains(texto):
+    """Sin índice: cada término debe aparecer en el nombre o el documento"""
+    condiciones = [
+        Q(nombres__icontains=termino) | Q(apellidos__icontains=termino) |
+        Q(numero_documento__startswith=termino)
+        for termino in texto.split()[:MAX_TERMINOS]
+    ]
+    return reduce(and_, condiciones, Q())
+
+
+# ----------------------------------------------------------------------------
+# SQLite (FTS5)
+# ----------------------------------------------------------------------------
+
+def consulta_fts(texto):
+    """
+    Expresión MATCH con todos los términos como prefijo; los términos
+    numéricos solo buscan en el documento. None si no hay términos.
+    """
+    partes = []
+    for termino in terminos(texto):
+        if termino.isdigit():
+            partes.append(f'documento : "{termino}"*')
+        else:
+            partes.append(f'"{termino}"*')
+    return ' AND '.join(partes) or None
+
+
+def buscar_fts(texto, limite, estado):
+    consulta = consulta_fts(texto)
+    if consulta is None:
+        return []
+    sql = (
+        f'SELECT f.rowid FROM {TABLA_FTS} f '
+        f'JOIN {Trabajador._meta.db_table} t ON t.id = f.rowid '
+        f'WHERE {TABLA_FTS} MATCH %s'
+    )
+    parametros = [consulta]
+    if estado:
+        sql += ' AND t.estado = %s'
+        parametros.append(estado)
+    sql += f' ORDER BY bm25({TABLA_FTS}, %s, %s), t.apellidos, t.nombres LIMIT %s'
+    parametros += [*PESOS_FTS, limite]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, parametros)
+        return [fila[0] for fila in cursor.fetchall()]
+
+
+# ----------------------------------------------------------------------------
+# PostgreSQL (pg_trgm)
+# ----------------------------------------------------------------------------
+
+def filtrar_trigramas(queryset, texto):
+    """
+    Cada término debe aparecer en el nombre sin tildes (LIKE '%x%', que
+    resuelve el índice de trigramas) o, si es numérico, iniciar el documento.
+    """
+    queryset = queryset.alias(
+        nombre_busqueda=RawSQL(NOMBRE_TRIGRAMAS, [], output_field=CharField())
+    )
+    for termino in terminos(texto):
+        if termino.isdigit():
+            queryset = queryset.filter(numero_documento__startswith=termino)
+        else:
+            queryset = queryset.filter(nombre_busqueda__contains=termino)
+    return queryset
+
+
+# ============================================================================
+# MANTENIMIENTO DEL ÍNDICE (solo FTS5; los índices de PostgreSQL se mantienen solos)
+# ============================================================================
+
+def indexar(trabajador):
+    if not fts_disponible():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLA_FTS} WHERE rowid = %s', [trabajador.pk])
+        cursor.execute(
+            f'INSERT INTO {TABLA_FTS} (rowid, nombre, documento) VALUES (%s, %s, %s)',
+            [trabajador.pk, f'{trabajador.nombres} {trabajador.apellidos}', trabajador.numero_documento]
+        )
+
+
+def desindexar(trabajador_id):
+    if not fts_disponible():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLA_FTS} WHERE rowid = %s', [trabajador_id])
+
+
+def reconstruir():
+    """Vuelve a llenar el índice desde core_trabajador (tras cargas con bulk_create)"""
+    if not fts_disponible():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLA_FTS}')
+        cursor.execute(
+            f"INSERT INTO {TABLA_FTS} (rowid, nombre, documento) "
+            f"SELECT id, nombres || ' ' || apellidos, numero_documento "
+            f"FROM {Trabajador._meta.db_table}"
+        )
+        return cursor.rowcount
@@ -0,0 +1,165 @@
+# backend/core/services/calendario.py
+
+from datetime import date, timedelta
+
+from core.models import DiaCalendario
+
+# ============================================================================
+# FESTIVOS DE COLOMBIA
+# ============================================================================
+
+# Festivos que no se trasladan
+FESTIVOS_FIJOS = [
+    (1, 1, 'Año Nuevo'),
+    (5, 1, 'Día del Trabajo'),
+    (7, 20, 'Día de la Independencia'),
+    (8, 7, 'Batalla de Boyacá'),
+    (12, 8, 'Inmaculada Concepción'),
+    (12, 25, 'Navidad'),
+]
+
+# Festivos que la Ley Emiliani (Ley 51 de 1983) traslada al lunes siguiente
+FESTIVOS_EMILIANI = [
+    (1, 6, 'Reyes Magos'),
+    (3, 19, 'San José'),
+    (6, 29, 'San Pedro y San Pablo'),
+    (8, 15, 'Asunción de la Virgen'),
+    (10, 12, 'Día de la Raza'),
+    (11, 1, 'Todos los Santos'),
+    (11, 11, 'Independencia de Cartagena'),
+]
+
+# Festivos relativos al domingo de Pascua (días de diferencia)
+FESTIVOS_PASCUA = [
+    (-3, 'Jueves Santo'),
+    (-2, 'Viernes Santo'),
+    (43, 'Ascensión del Señor'),
+    (64, 'Corpus Christi'),
+    (71, 'Sagrado Corazón'),
+]
+
+
+def domingo_de_pascua(año):
+    """Fecha del domingo de Pascua (algoritmo anónimo gregoriano)"""
+    a = año % 19
+    b, c = divmod(año, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return date(año, mes, dia + 1)
+
+
+def siguiente_lunes(fecha):
+    """La misma fecha si es lunes, si no el lunes siguiente"""
+    return fecha + timedelta(days=(7 - fecha.weekday()) % 7)
+
+
+def festivos_colombia(año):
+    """Retorna {fecha: nombre} de los festivos nacionales del año"""
+    pascua = domingo_de_pascua(año)
+    fechas = (
+        [(date(año, mes, dia), nombre) for mes, dia, nombre in FESTIVOS_FIJOS] +
+        [(siguiente_lunes(date(año, mes, dia)), nombre) for mes, dia, nombre in FESTIVOS_EMILIANI] +
+        [(pascua + timedelta(days=dias), nombre) for dias, nombre in FESTIVOS_PASCUA]
+    )
+
+    # Dos festivos trasladados pueden caer el mismo lunes
+    festivos = {}
+    for fecha, nombre in sorted(fechas):
+        festivos[fecha] = f"{festivos[fecha]} / {nombre}" if fecha in festivos else nombre
+    return festivos
+
+
+def generar_dias(año):
+    """DiaCalendario (sin guardar) para los domingos y festivos del año"""
+    festivos = festivos_colombia(año)
+    dias = []
+    fecha = date(año, 1, 1)
+    while fecha.year == año:
+        es_domingo = fecha.weekday() == 6
+        if es_domingo or fecha in festivos:
+            dias.append(DiaCalendario(
+                fecha=fecha,
+                es_domingo=es_domingo,
+                es_festivo=fecha in festivos,
+                nombre_festivo=festivos.get(fecha, ''),
+            ))
+        fecha += timedelta(days=1)
+    return dias
+
+
+# ============================================================================
+# CONSULTA EN MEMORIA
+# ============================================================================
+
+class CalendarioLaboral:
+    """Domingos y festivos de un período cargados con una sola consulta"""
+
+    def __init__(self, filas=()):
+        """filas: iterable de (fecha, es_domingo, es_festivo)"""
+        self.domingos = set()
+        self.festivos = set()
+        for fecha, es_domingo, es_festivo in filas:
+            if es_domingo:
+                self.domingos.add(fecha)
+            if es_festivo:
+                self.festivos.add(fecha)
+
+    @classmethod
+    def cargar(cls, fecha_desde, fecha_hasta):
+        return cls(
+            DiaCalendario.objects.filter(
+                fecha__gte=fecha_desde, fecha__lte=fecha_hasta
+            ).values_list('fecha', 'es_domingo', 'es_festivo')
+        )
+
+    def es_domingo(self, fecha):
+        return fecha in self.domingos
+
+    def es_festivo(self, fecha):
+        return fecha in self.festivos
+
+    def descansos(self, fecha_desde, fecha_hasta):
+        """
+        Lista ordenada de (fecha, concepto) con los días de descanso del
+        período. Un festivo que cae en domingo se cuenta una sola vez, como
+        FESTIVO.
+        """
+        return sorted(
+            (fecha, 'FESTIVO' if fecha in self.festivos else 'DOMINICAL')
+            for fecha in self.domingos | self.festivos
+            if fecha_desde <= fecha <= fecha_hasta
+        )
+
+    def laborables_semana(self, fecha):
+        """
+        Días laborables (lunes a sábado que no son festivos) de la semana
+        que remunera el descanso de la fecha: la semana que termina en ese
+        domingo, o la semana del festivo.
+        """
+        lunes = fecha - timedelta(days=fecha.weekday())
+        return frozenset(
+            dia for dia in (lunes + timedelta(days=n) for n in range(6))
+            if dia not in self.festivos
+        )
+
+    def faltantes(self, fecha_desde, fecha_hasta):
+        """Domingos del período que no están en el calendario (no se generó el año)"""
+        primero = fecha_desde + timedelta(days=(6 - fecha_desde.weekday()) % 7)
+        domingos = []
+        while primero <= fecha_hasta:
+            if primero not in self.domingos:
+                domingos.append(primero)
+            primero += timedelta(days=7)
+        return domingos
+
+    def contar(self, fecha_desde, fecha_hasta):
+        """Retorna (dominicales, festivos) del período"""
+        descansos = self.descansos(fecha_desde, fecha_hasta)
+        festivos = sum(1 for _, concepto in descansos if concepto == 'FESTIVO')
+        return len(descansos) - festivos, festivos
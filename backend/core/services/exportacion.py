@@ -0,0 +1,61 @@
+# backend/core/services/exportacion.py
+
+import csv
+from datetime import datetime
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+# Filas leídas de la BD por viaje en las exportaciones
+TAMAÑO_CHUNK = 2000
+
+# Prefijos que Excel interpreta como fórmula
+PREFIJOS_FORMULA = ('=', '+', '-', '@')
+
+
+class Eco:
+    """Pseudo-buffer: csv.writer escribe y la línea se devuelve tal cual"""
+
+    def write(self, valor):
+        return valor
+
+
+def _celda(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, datetime):
+        # Hora local en ISO 8601, como en el resto de la API
+        return timezone.localtime(valor).isoformat()
+    if isinstance(valor, str) and valor.startswith(PREFIJOS_FORMULA):
+        return f"'{valor}"
+    return valor
+
+
+def respuesta_csv(nombre_archivo, encabezado, filas):
+    """
+    StreamingHttpResponse que genera el CSV a medida que se leen las filas,
+    con memoria constante sin importar el tamaño de la exportación.
+    filas: iterable de tuplas (normalmente values_list().iterator()).
+    """
+    escritor = csv.writer(Eco())
+
+    def generar():
+        yield '\ufeff'  # BOM para que Excel detecte UTF-8
+        yield escritor.writerow(encabezado)
+        for fila in filas:
+            yield escritor.writerow([_celda(valor) for valor in fila])
+
+    respuesta = StreamingHttpResponse(generar(), content_type='text/csv; charset=utf-8')
+    respuesta['Content-Disposition'] = f'attachment; filename="{nombre_archivo}"'
+    return respuesta
+
+
+def exportar_queryset(queryset, columnas, nombre_archivo):
+    """
+    Exporta un queryset como CSV. columnas: [(encabezado, lookup)] donde
+    lookup es un campo válido para values_list().
+    """
+    filas = queryset.values_list(
+        *[lookup for _, lookup in columnas]
+    ).iterator(chunk_size=TAMAÑO_CHUNK)
+    return respuesta_csv(nombre_archivo, [encabezado for encabezado, _ in columnas], filas)
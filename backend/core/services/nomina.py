@@ -0,0 +1,558 @@
+# backend/core/services/nomina.py
+
+import multiprocessing
+import os
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, ROUND_HALF_UP
+
+import django
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import (
+    Labor, VariablesNomina, Quincena,
+    RegistroLabor, Trabajador, Nomina, DetalleNomina
+)
+from .precios import ResolvedorPrecios
+from .variables import variables_nomina
+from .pendientes import pendientes_de, limpiar_pendientes
+from .calendario import CalendarioLaboral
+from .prestamos import cargar_cuotas, planificar_descuentos, aplicar_descuentos
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+CENTAVOS = Decimal('0.01')
+CERO = Decimal('0.00')
+
+# Códigos de labores especiales creados por cargar_datos_iniciales
+CODIGO_FESTIVO = 'LAB002'
+CODIGO_DOMINICAL = 'LAB003'
+CODIGO_AUSENCIA = 'LAB005'
+
+CONCEPTO_POR_CODIGO = {
+    CODIGO_FESTIVO: 'FESTIVO',
+    CODIGO_DOMINICAL: 'DOMINICAL',
+}
+
+# Días sobre los que se liquida el auxilio de transporte mensual
+DIAS_MES = 30
+DIAS_QUINCENA = 15
+
+# La semana del primer descanso de la quincena puede empezar hasta 6 días antes
+DIAS_SEMANA_PREVIA = 6
+
+# Nóminas que ya no pueden ser modificadas por un recálculo
+ESTADOS_NOMINA_BLOQUEADOS = ('APROBADA', 'PAGADA')
+
+# Estados de quincena desde los que se permite calcular
+ESTADOS_QUINCENA_CALCULABLES = ('ABIERTA', 'CALCULADA')
+
+# Lotes por proceso en el cálculo paralelo (equilibra trabajadores con más registros)
+LOTES_POR_PROCESO = 4
+
+
+class CalculoNominaError(Exception):
+    """Error de negocio que impide calcular la nómina de una quincena"""
+
+
+# Estructuras planas usadas durante el cálculo (sin acceso a la BD)
+DatosTrabajador = namedtuple(
+    'DatosTrabajador',
+    ['id', 'aplica_deducciones', 'aplica_dominicales', 'aplica_auxilio_transporte']
+)
+DatosLabor = namedtuple(
+    'DatosLabor',
+    ['id', 'codigo', 'nombre', 'es_especial', 'solo_con_contrato']
+)
+Linea = namedtuple(
+    'Linea',
+    ['tipo', 'concepto', 'descripcion', 'labor_id', 'cantidad', 'valor_unitario', 'valor_total']
+)
+# Datos comunes a todos los trabajadores de la quincena.
+# descansos: [(fecha, labor_id, valor_unitario, laborables)] de dominicales y
+# festivos; laborables son los días de la semana que remunera cada descanso
+Contexto = namedtuple('Contexto', ['labores', 'precios', 'variables', 'descansos'])
+# Resultado de liquidar una quincena, listo para escribir: resultados es {trabajador_id: [Linea]}
+Liquidacion = namedtuple(
+    'Liquidacion',
+    ['resultados', 'bloqueados', 'registros', 'procesos', 'dominicales', 'festivos']
+)
+
+
+def redondear(valor):
+    """Redondea un valor monetario a centavos"""
+    return valor.quantize(CENTAVOS, rounding=ROUND_HALF_UP)
+
+
+# ============================================================================
+# CARGA DE DATOS (una consulta por tabla)
+# ============================================================================
+
+def cargar_labores():
+    """Catálogo completo de labores indexado por id"""
+    return {
+        fila[0]: DatosLabor(*fila)
+        for fila in Labor.objects.values_list(
+            'id', 'codigo', 'nombre', 'es_especial', 'solo_con_contrato'
+        )
+    }
+
+
+def cargar_trabajadores(quincena, trabajador_ids=None):
+    """Trabajadores con registros o con nómina en la quincena"""
+    con_registros = RegistroLabor.objects.filter(quincena=quincena).values('trabajador_id')
+    con_nomina = Nomina.objects.filter(quincena=quincena).values('trabajador_id')
+    queryset = Trabajador.objects.filter(Q(id__in=con_registros) | Q(id__in=con_nomina))
+    if trabajador_ids is not None:
+        queryset = queryset.filter(id__in=list(trabajador_ids))
+    filas = queryset.order_by('id').values_list(
+        'id',
+        'tipo_contrato__aplica_deducciones',
+        'tipo_contrato__aplica_dominicales',
+        'tipo_contrato__aplica_auxilio_transporte',
+    )
+    return {fila[0]: DatosTrabajador(*fila) for fila in filas}
+
+
+def cargar_registros(quincena, trabajador_ids=None):
+    """Registros de la quincena agrupados por trabajador: {id: [(labor, fecha, cantidad)]}"""
+    registros = defaultdict(list)
+    queryset = RegistroLabor.objects.filter(quincena=quincena)
+    if trabajador_ids is not None:
+        queryset = queryset.filter(trabajador_id__in=list(trabajador_ids))
+    filas = queryset.order_by(
+        'trabajador_id', 'fecha', 'id'
+    ).values_list('trabajador_id', 'labor_id', 'fecha', 'cantidad')
+    for trabajador_id, labor_id, fecha, cantidad in filas:
+        registros[trabajador_id].append((labor_id, fecha, cantidad))
+    return registros
+
+
+def cargar_dias_previos(quincena, trabajador_ids=None):
+    """
+    Días trabajados en la semana anterior al inicio de la quincena, que
+    cuentan para el primer dominical: {trabajador_id: frozenset(fechas)}
+    """
+    dias = defaultdict(set)
+    queryset = RegistroLabor.objects.filter(
+        fecha__gte=quincena.fecha_inicio - timedelta(days=DIAS_SEMANA_PREVIA),
+        fecha__lt=quincena.fecha_inicio,
+    ).exclude(labor__codigo=CODIGO_AUSENCIA)
+    if trabajador_ids is not None:
+        queryset = queryset.filter(trabajador_id__in=list(trabajador_ids))
+    for trabajador_id, fecha in queryset.values_list('trabajador_id', 'fecha').distinct():
+        dias[trabajador_id].add(fecha)
+    return {trabajador_id: frozenset(fechas) for trabajador_id, fechas in dias.items()}
+
+
+# ============================================================================
+# CÁLCULO (funciones puras)
+# ============================================================================
+
+def preparar_descansos(calendario, fecha_desde, fecha_hasta, labores, precios, variables):
+    """
+    Resuelve una sola vez por quincena el valor de cada domingo y festivo
+    (el precio de la labor Dominical/Festivo si tiene, o un día de salario
+    mínimo) y los días laborables de la semana que remunera, sin pasar del
+    fin de la quincena (la semana de un festivo puede terminar después).
+    """
+    labor_por_codigo = {labor.codigo: labor.id for labor in labores.values()}
+    salario_minimo = variables.get(VariablesNomina.SALARIO_MINIMO)
+    valor_dia = redondear(salario_minimo / DIAS_MES) if salario_minimo else CERO
+
+    descansos = []
+    for fecha, concepto in calendario.descansos(fecha_desde, fecha_hasta):
+        codigo = CODIGO_FESTIVO if concepto == 'FESTIVO' else CODIGO_DOMINICAL
+        labor_id = labor_por_codigo.get(codigo)
+        if labor_id is None:
+            continue
+        valor_unitario = precios.precio(labor_id, fecha)
+        descansos.append((
+            fecha, labor_id, valor_dia if valor_unitario is None else valor_unitario,
+            frozenset(
+                dia for dia in calendario.laborables_semana(fecha) if dia <= fecha_hasta
+            ),
+        ))
+    return descansos
+
+
+def calcular_lineas(trabajador, registros, contexto, dias_previos=frozenset()):
+    """
+    Calcula las líneas de DetalleNomina de un trabajador a partir de sus
+    registros. No consulta la base de datos.
+    Cada dominical o festivo no registrado a mano se paga en proporción a
+    los días laborables trabajados en su semana (CST art. 173): la semana
+    completa da un día; tres de seis, medio día. dias_previos son los días
+    trabajados antes de la quincena que caen en la semana del primer descanso.
+    """
+    labores = contexto.labores
+    variables = contexto.variables
+    cantidades = defaultdict(Decimal)
+    dias_trabajados = set()
+    registrados = set()
+
+    for labor_id, fecha, cantidad in registros:
+        labor = labores[labor_id]
+        if labor.solo_con_contrato and not trabajador.aplica_dominicales:
+            continue
+
+        valor_unitario = contexto.precios.precio(labor_id, fecha)
+        if valor_unitario is None:
+            if not labor.es_especial:
+                raise CalculoNominaError(
+                    f"La labor {labor.codigo} no tiene precio vigente para el {fecha}"
+                )
+            valor_unitario = CERO
+
+        cantidades[(labor_id, valor_unitario)] += cantidad
+        registrados.add((labor_id, fecha))
+        if labor.codigo != CODIGO_AUSENCIA:
+            dias_trabajados.add(fecha)
+
+    # Dominicales y festivos del calendario que no se registraron a mano
+    if trabajador.aplica_dominicales:
+        trabajados = dias_trabajados | dias_previos
+        for fecha, labor_id, valor_unitario, laborables in contexto.descansos:
+            if (labor_id, fecha) in registrados or not laborables:
+                continue
+            proporcion = redondear(Decimal(len(laborables & trabajados)) / len(laborables))
+            if proporcion:
+                cantidades[(labor_id, valor_unitario)] += proporcion
+
+    lineas = []
+    for (labor_id, valor_unitario), cantidad in sorted(
+        cantidades.items(), key=lambda item: (labores[item[0][0]].codigo, item[0][1])
+    ):
+        labor = labores[labor_id]
+        lineas.append(Linea(
+            'DEVENGO',
+            CONCEPTO_POR_CODIGO.get(labor.codigo, 'LABOR'),
+            f"{labor.codigo} - {labor.nombre}",
+            labor_id,
+            cantidad,
+            valor_unitario,
+            redondear(cantidad * valor_unitario),
+        ))
+
+    base_deducciones = sum((linea.valor_total for linea in lineas), CERO)
+
+    auxilio = variables.get(VariablesNomina.AUXILIO_TRANSPORTE)
+    if trabajador.aplica_auxilio_transporte and auxilio and dias_trabajados:
+        dias = min(len(dias_trabajados), DIAS_QUINCENA)
+        valor_dia = auxilio / DIAS_MES
+        lineas.append(Linea(
+            'DEVENGO', 'AUXILIO_TRANSPORTE',
+            f"Auxilio de transporte ({dias} días)",
+            None, Decimal(dias), redondear(valor_dia), redondear(valor_dia * dias),
+        ))
+
+    if trabajador.aplica_deducciones:
+        for concepto, variable, nombre in (
+            ('SALUD', VariablesNomina.PORCENTAJE_SALUD, 'Salud'),
+            ('PENSION', VariablesNomina.PORCENTAJE_PENSION, 'Pensión'),
+        ):
+            porcentaje = variables.get(variable)
+            if not porcentaje:
+                continue
+            lineas.append(Linea(
+                'DEDUCCION', concepto,
+                f"{nombre} ({porcentaje}%)",
+                None, None, None, redondear(base_deducciones * porcentaje / 100),
+            ))
+
+    return lineas
+
+
+def calcular_lote(lote, contexto):
+    """
+    Calcula un lote de trabajadores: [(trabajador, registros, dias_previos)]
+    -> [(id, [Linea])]. Solo recibe tuplas y estructuras planas, por lo que
+    puede ejecutarse en otro proceso.
+    """
+    return [
+        (trabajador.id, calcular_lineas(trabajador, registros, contexto, dias_previos))
+        for trabajador, registros, dias_previos in lote
+    ]
+
+
+def calcular_en_paralelo(entradas, contexto, procesos):
+    """
+    Reparte las entradas [(trabajador, registros, dias_previos)] en lotes contiguos entre
+    un ProcessPoolExecutor y une los resultados en el mismo orden, de modo
+    que el resultado es idéntico al cálculo en serie.
+    """
+    tamaño = max(1, -(-len(entradas) // (procesos * LOTES_POR_PROCESO)))
+    lotes = [entradas[i:i + tamaño] for i in range(0, len(entradas), tamaño)]
+    resultados = {}
+    # spawn: un fork copiaría los bloqueos de los hilos del proceso (escritor
+    # de auditoría) y las conexiones abiertas a la base de datos
+    with ProcessPoolExecutor(
+        max_workers=procesos, mp_context=multiprocessing.get_context('spawn'),
+        initializer=django.setup,
+    ) as executor:
+        futuros = [
+            executor.submit(calcular_lote, lote, contexto)
+            for lote in lotes
+        ]
+        for futuro in futuros:
+            resultados.update(futuro.result())
+    return resultados
+
+
+def totalizar(lineas, ajustes=()):
+    """Retorna (devengado, deducciones, neto) incluyendo ajustes manuales"""
+    devengado = CERO
+    deducciones = CERO
+    for tipo, valor in [(linea.tipo, linea.valor_total) for linea in lineas] + list(ajustes):
+        if tipo == 'DEVENGO':
+            devengado += valor
+        else:
+            deducciones += valor
+    return devengado, deducciones, devengado - deducciones
+
+
+# ============================================================================
+# ESCRITURA
+# ============================================================================
+
+def guardar_resultados(quincena, resultados, usuario=None):
+    """
+    Escribe las nóminas y sus detalles con operaciones masivas.
+    resultados: {trabajador_id: [Linea]}
+    Los detalles AJUSTE_MANUAL existentes se conservan y suman a los totales.
+    Retorna ({trabajador_id: Nomina}, resumen).
+    """
+    ahora = timezone.now()
+    existentes = {
+        nomina.trabajador_id: nomina
+        for nomina in Nomina.objects.filter(
+            quincena=quincena, trabajador_id__in=list(resultados)
+        )
+    }
+
+    ajustes = defaultdict(list)
+    for nomina_id, tipo, valor in DetalleNomina.objects.filter(
+        nomina__quincena=quincena, concepto='AJUSTE_MANUAL'
+    ).values_list('nomina_id', 'tipo', 'valor_total'):
+        ajustes[nomina_id].append((tipo, valor))
+
+    nuevas = []
+    actualizadas = []
+    for trabajador_id, lineas in resultados.items():
+        nomina = existentes.get(trabajador_id)
+        if nomina is None:
+            nomina = Nomina(
+                trabajador_id=trabajador_id,
+                quincena=quincena,
+                created_by=usuario,
+            )
+            nuevas.append(nomina)
+            devengado, deducciones, neto = totalizar(lineas)
+        else:
+            actualizadas.append(nomina)
+            devengado, deducciones, neto = totalizar(lineas, ajustes.get(nomina.id, ()))
+        nomina.total_devengado = devengado
+        nomina.total_deducciones = deducciones
+        nomina.total_neto = neto
+        nomina.estado = 'CALCULADA'
+        nomina.fecha_calculo = ahora
+        nomina.updated_at = ahora
+
+    Nomina.objects.bulk_create(nuevas)
+    Nomina.objects.bulk_update(
+        actualizadas,
+        ['total_devengado', 'total_deducciones', 'total_neto',
+         'estado', 'fecha_calculo', 'updated_at'],
+    )
+
+    if actualizadas:
+        DetalleNomina.objects.filter(
+            nomina__quincena=quincena,
+            nomina__trabajador_id__in=[n.trabajador_id for n in actualizadas],
+        ).exclude(concepto='AJUSTE_MANUAL').delete()
+
+    nominas = {nomina.trabajador_id: nomina for nomina in nuevas + actualizadas}
+    detalles = [
+        DetalleNomina(
+            nomina=nominas[trabajador_id],
+            tipo=linea.tipo,
+            concepto=linea.concepto,
+            descripcion=linea.descripcion,
+            labor_id=linea.labor_id,
+            cantidad=linea.cantidad,
+            valor_unitario=linea.valor_unitario,
+            valor_total=linea.valor_total,
+        )
+        for trabajador_id, lineas in resultados.items()
+        for linea in lineas
+    ]
+    DetalleNomina.objects.bulk_create(detalles)
+
+    return nominas, {
+        'nominas_creadas': len(nuevas),
+        'nominas_actualizadas': len(actualizadas),
+        'detalles': len(detalles),
+        'total_neto': sum((n.total_neto for n in nominas.values()), CERO),
+    }
+
+
+# ============================================================================
+# PUNTO DE ENTRADA
+# ============================================================================
+
+def calcular_quincena(quincena, usuario=None, incremental=False, procesos=None):
+    """
+    Calcula la nómina de todos los trabajadores de la quincena en una sola
+    pasada: lee los registros con una consulta, liquida en memoria (fuera de
+    toda transacción, para no retener el bloqueo de escritura mientras se
+    calcula) y escribe con bulk_create/bulk_update dentro de una transacción.
+    Con incremental=True solo se recalculan los pares marcados como
+    pendientes (ver services.pendientes); si la quincena nunca se ha
+    calculado se hace el cálculo completo.
+    procesos > 1 reparte la liquidación entre varios procesos (por defecto
+    settings.NOMINA_PROCESOS); el resultado es el mismo que en serie.
+    La quincena pasa por EN_CALCULO y termina en CALCULADA.
+    """
+    estado_anterior = quincena.estado
+    marcada = Quincena.objects.filter(
+        pk=quincena.pk, estado__in=ESTADOS_QUINCENA_CALCULABLES
+    ).update(estado='EN_CALCULO')
+    if not marcada:
+        raise CalculoNominaError(
+            f"La quincena {quincena} no se puede calcular en estado {quincena.get_estado_display()}"
+        )
+
+    incremental = incremental and estado_anterior == 'CALCULADA'
+    try:
+        pendientes = pendientes_de(quincena)
+        trabajador_ids = set(pendientes.values()) if incremental else None
+        liquidacion = liquidar(quincena, trabajador_ids, procesos)
+        with transaction.atomic():
+            resumen = guardar_liquidacion(quincena, liquidacion, usuario, incremental)
+            limpiar_pendientes(pendientes)
+            Quincena.objects.filter(pk=quincena.pk).update(estado='CALCULADA')
+    except Exception:
+        Quincena.objects.filter(pk=quincena.pk).update(estado=estado_anterior)
+        raise
+
+    quincena.estado = 'CALCULADA'
+    resumen['modo'] = 'incremental' if incremental else 'completo'
+    return resumen
+
+
+def nominas_bloqueadas(quincena):
+    return set(
+        Nomina.objects.filter(
+            quincena=quincena, estado__in=ESTADOS_NOMINA_BLOQUEADOS
+        ).values_list('trabajador_id', flat=True)
+    )
+
+
+def liquidar(quincena, trabajador_ids=None, procesos=None):
+    """Lee los datos de la quincena y calcula las líneas de cada trabajador (sin escribir)"""
+    bloqueados = nominas_bloqueadas(quincena)
+    if trabajador_ids is not None:
+        trabajador_ids = trabajador_ids - bloqueados
+    trabajadores = cargar_trabajadores(quincena, trabajador_ids)
+    registros = cargar_registros(quincena, trabajador_ids)
+    dias_previos = cargar_dias_previos(quincena, trabajador_ids)
+    labores = cargar_labores()
+    labor_ids = {labor_id for filas in registros.values() for labor_id, _, _ in filas}
+    labor_ids.update(
+        labor.id for labor in labores.values()
+        if labor.codigo in (CODIGO_FESTIVO, CODIGO_DOMINICAL)
+    )
+    precios = ResolvedorPrecios.cargar(labor_ids, quincena.fecha_inicio, quincena.fecha_fin)
+    variables = variables_nomina.vigentes(quincena.fecha_fin)
+    calendario = CalendarioLaboral.cargar(
+        quincena.fecha_inicio - timedelta(days=DIAS_SEMANA_PREVIA), quincena.fecha_fin
+    )
+    faltantes = calendario.faltantes(quincena.fecha_inicio, quincena.fecha_fin)
+    if faltantes:
+        # Sin calendario no se pagarían dominicales ni festivos
+        raise CalculoNominaError(
+            f"El calendario no tiene los días de descanso del {faltantes[0]}; "
+            f"ejecute manage.py generar_calendario --desde {faltantes[0].year}"
+        )
+    contexto = Contexto(
+        labores, precios, variables,
+        preparar_descansos(
+            calendario, quincena.fecha_inicio, quincena.fecha_fin, labores, precios, variables
+        ),
+    )
+
+    entradas = [
+        (
+            trabajador, registros.get(trabajador_id, ()),
+            dias_previos.get(trabajador_id, frozenset()),
+        )
+        for trabajador_id, trabajador in trabajadores.items()
+        if trabajador_id not in bloqueados
+    ]
+    if procesos is None:
+        procesos = getattr(settings, 'NOMINA_PROCESOS', 1)
+    procesos = min(procesos, os.cpu_count() or 1)
+    if procesos > 1 and len(entradas) > procesos:
+        resultados = calcular_en_paralelo(entradas, contexto, procesos)
+    else:
+        procesos = 1
+        resultados = dict(calcular_lote(entradas, contexto))
+
+    dominicales, festivos = calendario.contar(quincena.fecha_inicio, quincena.fecha_fin)
+    return Liquidacion(
+        resultados, bloqueados, sum(len(filas) for filas in registros.values()),
+        procesos, dominicales, festivos,
+    )
+
+
+def guardar_liquidacion(quincena, liquidacion, usuario=None, incremental=False):
+    """
+    Escribe la liquidación dentro de la transacción en curso. Las nóminas
+    aprobadas o pagadas mientras se calculaba no se tocan. Las cuotas de
+    préstamos se planifican aquí, con los saldos que se van a actualizar.
+    """
+    bloqueados = nominas_bloqueadas(quincena)
+    resultados = {
+        trabajador_id: lineas
+        for trabajador_id, lineas in liquidacion.resultados.items()
+        if trabajador_id not in bloqueados
+    }
+
+    # Cuotas de préstamos: se planifican antes de guardar para que entren en los totales
+    descuentos = planificar_descuentos(
+        cargar_cuotas(quincena, resultados),
+        {trabajador_id: totalizar(lineas)[2] for trabajador_id, lineas in resultados.items()},
+    )
+    for descuento in descuentos:
+        if descuento.aplicado:
+            resultados[descuento.trabajador_id].append(Linea(
+                'DEDUCCION', 'PRESTAMO',
+                f"Préstamo #{descuento.prestamo_id} - cuota "
+                f"{descuento.numero_cuota}/{descuento.total_cuotas}",
+                None, None, None, descuento.monto,
+            ))
+
+    nominas, resumen = guardar_resultados(quincena, resultados, usuario)
+    resumen.update(aplicar_descuentos(quincena, descuentos, nominas))
+    omitidas = 0
+    if incremental:
+        omitidas = Nomina.objects.filter(quincena=quincena).exclude(
+            trabajador_id__in=list(resultados)
+        ).exclude(estado__in=ESTADOS_NOMINA_BLOQUEADOS).count()
+    resumen.update({
+        'quincena': quincena.pk,
+        'trabajadores': len(resultados),
+        'nominas_omitidas': omitidas,
+        'nominas_bloqueadas': len(bloqueados),
+        'registros': liquidacion.registros,
+        'procesos': liquidacion.procesos,
+        'dominicales': liquidacion.dominicales,
+        'festivos': liquidacion.festivos,
+    })
+    return resumen
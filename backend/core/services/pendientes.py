@@ -0,0 +1,56 @@
+# backend/core/services/pendientes.py
+
+from core.models import RegistroLabor, Nomina, NominaPendiente
+
+# Nóminas que un cambio de préstamo obliga a recalcular
+ESTADOS_NOMINA_RECALCULABLES = ('BORRADOR', 'CALCULADA')
+
+
+def marcar_pendientes(pares):
+    """Marca como pendientes los pares (trabajador_id, quincena_id) con un solo INSERT"""
+    pares = {par for par in pares if None not in par}
+    if not pares:
+        return 0
+    NominaPendiente.objects.bulk_create(
+        [
+            NominaPendiente(trabajador_id=trabajador_id, quincena_id=quincena_id)
+            for trabajador_id, quincena_id in pares
+        ],
+        ignore_conflicts=True,
+    )
+    return len(pares)
+
+
+def marcar_por_precio(labor_id, fecha_desde, fecha_hasta=None):
+    """Marca los trabajadores con registros de la labor dentro de la vigencia"""
+    registros = RegistroLabor.objects.filter(labor_id=labor_id, fecha__gte=fecha_desde)
+    if fecha_hasta is not None:
+        registros = registros.filter(fecha__lte=fecha_hasta)
+    return marcar_pendientes(
+        registros.exclude(quincena__estado='PAGADA').values_list(
+            'trabajador_id', 'quincena_id'
+        ).distinct()
+    )
+
+
+def marcar_por_prestamos(trabajador_ids):
+    """Marca las nóminas aún modificables de los trabajadores"""
+    return marcar_pendientes(
+        Nomina.objects.filter(
+            trabajador_id__in=list(trabajador_ids),
+            estado__in=ESTADOS_NOMINA_RECALCULABLES,
+        ).exclude(quincena__estado='PAGADA').values_list('trabajador_id', 'quincena_id')
+    )
+
+
+def pendientes_de(quincena):
+    """Retorna {id_pendiente: trabajador_id} de la quincena"""
+    return dict(
+        NominaPendiente.objects.filter(quincena=quincena).values_list('id', 'trabajador_id')
+    )
+
+
+def limpiar_pendientes(ids):
+    """Elimina las marcas ya atendidas (las creadas después se conservan)"""
+    if ids:
+        NominaPendiente.objects.filter(id__in=list(ids)).delete()
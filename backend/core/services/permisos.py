@@ -0,0 +1,52 @@
+# backend/core/services/permisos.py
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from core.models import Usuario
+
+
+def clave_permisos(usuario_id):
+    return f'permisos:usuario:{usuario_id}'
+
+
+def estado_permisos(usuario_id):
+    """
+    (version_permisos, activo) del usuario. Se guarda en el cache 'default'
+    durante PERMISOS_CACHE_SEGUNDOS, así que la mayoría de peticiones no
+    consultan la base de datos; otro proceso ve un cambio a más tardar al
+    vencer ese tiempo.
+    """
+    clave = clave_permisos(usuario_id)
+    estado = cache.get(clave)
+    if estado is None:
+        fila = Usuario.objects.filter(pk=usuario_id).values_list(
+            'version_permisos', 'is_active'
+        ).first()
+        estado = tuple(fila) if fila else (None, False)
+        cache.set(clave, estado, settings.PERMISOS_CACHE_SEGUNDOS)
+    return estado
+
+
+def olvidar_permisos(usuario_ids):
+    cache.delete_many([clave_permisos(usuario_id) for usuario_id in usuario_ids])
+
+
+def incrementar_version_permisos(usuario_ids, sesion=False):
+    """
+    Invalida los tokens emitidos a los usuarios: deben refrescarlos o, con
+    sesion=True (cambio de contraseña o de estado), iniciar sesión de nuevo
+    """
+    usuario_ids = list(usuario_ids)
+    if not usuario_ids:
+        return
+    versiones = {'version_permisos': F('version_permisos') + 1}
+    if sesion:
+        versiones['version_sesion'] = F('version_sesion') + 1
+    Usuario.objects.filter(pk__in=usuario_ids).update(**versiones)
+    # Borrar ya y de nuevo al confirmar, por si otra petición volvió a
+    # guardar la versión anterior mientras la transacción seguía abierta
+    olvidar_permisos(usuario_ids)
+    transaction.on_commit(lambda: olvidar_permisos(usuario_ids))
@@ -0,0 +1,68 @@
+# backend/core/services/precios.py
+
+from bisect import bisect_right
+from collections import defaultdict
+
+from django.db.models import Q
+
+from core.models import ListaPrecios
+
+
+class ResolvedorPrecios:
+    """
+    Índice en memoria de las vigencias de ListaPrecios.
+    Carga las vigencias de un conjunto de labores con una sola consulta y
+    responde "precio de la labor en la fecha" con búsqueda binaria.
+    """
+
+    def __init__(self, filas=()):
+        """filas: iterable de (labor_id, fecha_inicio, fecha_fin, precio)"""
+        vigencias = defaultdict(list)
+        for labor_id, inicio, fin, precio in filas:
+            vigencias[labor_id].append((inicio, fin, precio))
+
+        self._vigencias = {}
+        self._inicios = {}
+        for labor_id, filas_labor in vigencias.items():
+            filas_labor.sort(key=lambda fila: fila[0])
+            self._vigencias[labor_id] = filas_labor
+            self._inicios[labor_id] = [fila[0] for fila in filas_labor]
+
+    @classmethod
+    def cargar(cls, labor_ids=None, fecha_desde=None, fecha_hasta=None):
+        """
+        Carga las vigencias de las labores indicadas (todas si labor_ids es
+        None), limitadas opcionalmente a las que se cruzan con el período.
+        """
+        queryset = ListaPrecios.objects.all()
+        if labor_ids is not None:
+            queryset = queryset.filter(labor_id__in=list(labor_ids))
+        if fecha_hasta is not None:
+            queryset = queryset.filter(fecha_inicio_vigencia__lte=fecha_hasta)
+        if fecha_desde is not None:
+            queryset = queryset.filter(
+                Q(fecha_fin_vigencia__isnull=True) | Q(fecha_fin_vigencia__gte=fecha_desde)
+            )
+        return cls(queryset.values_list(
+            'labor_id', 'fecha_inicio_vigencia', 'fecha_fin_vigencia', 'precio'
+        ))
+
+    def precio(self, labor_id, fecha):
+        """
+        Precio vigente de la labor en la fecha, o None si no hay vigencia.
+        Si dos vigencias se tocan en la fecha de corte gana la más reciente.
+        """
+        inicios = self._inicios.get(labor_id)
+        if not inicios:
+            return None
+        posicion = bisect_right(inicios, fecha) - 1
+        if posicion < 0:
+            return None
+        _, fin, valor = self._vigencias[labor_id][posicion]
+        if fin is not None and fecha > fin:
+            return None
+        return valor
+
+    def precios(self, consultas):
+        """Resuelve una lista de (labor_id, fecha) en el mismo orden"""
+        return [self.precio(labor_id, fecha) for labor_id, fecha in consultas]
@@ -0,0 +1,192 @@
+# backend/core/services/prestamos.py
+
+from collections import namedtuple
+from decimal import Decimal, ROUND_DOWN
+
+from django.db.models import OuterRef, Q, Subquery
+
+from core.models import Prestamo, CuotaPrestamo
+
+CENTAVOS = Decimal('0.01')
+
+# Estados de préstamo que el cálculo de nómina puede cambiar entre sí
+ESTADOS_CALCULADOS = ('ACTIVO', 'PAGADO')
+
+# Cuota a descontar (o a revertir) de un préstamo en la quincena.
+# cuota_id es None para préstamos de pago único que aún no tienen cuota.
+Descuento = namedtuple(
+    'Descuento',
+    ['trabajador_id', 'prestamo_id', 'cuota_id', 'numero_cuota', 'total_cuotas',
+     'monto', 'saldo', 'aplicado']
+)
+
+
+# ============================================================================
+# PLAN DE CUOTAS
+# ============================================================================
+
+def calcular_valor_cuota(monto_total, numero_cuotas):
+    """Valor de cada cuota truncado a centavos (la última absorbe el residuo)"""
+    return (monto_total / numero_cuotas).quantize(CENTAVOS, rounding=ROUND_DOWN)
+
+
+def generar_cuotas(prestamo):
+    """CuotaPrestamo (sin guardar) del plan de pagos de un préstamo a cuotas"""
+    numero_cuotas = prestamo.numero_cuotas
+    valor_cuota = prestamo.valor_cuota
+    ultima = prestamo.monto_total - valor_cuota * (numero_cuotas - 1)
+    return [
+        CuotaPrestamo(
+            prestamo=prestamo,
+            numero_cuota=numero,
+            valor_cuota=valor_cuota if numero < numero_cuotas else ultima,
+            estado='PENDIENTE',
+        )
+        for numero in range(1, numero_cuotas + 1)
+    ]
+
+
+# ============================================================================
+# DESCUENTO EN NÓMINA
+# ============================================================================
+
+def cargar_cuotas(quincena, trabajador_ids):
+    """
+    Candidatas a descontar en la quincena, con una consulta por tipo de pago:
+    la siguiente cuota PENDIENTE de cada préstamo ACTIVO, o la que ya se
+    descontó en esta quincena si se está recalculando.
+    Retorna [(trabajador_id, prestamo_id, cuota_id, numero, total, valor, saldo_base)]
+    ordenadas por trabajador y antigüedad del préstamo.
+    """
+    trabajador_ids = list(trabajador_ids)
+    siguiente = CuotaPrestamo.objects.filter(
+        prestamo=OuterRef('prestamo'), estado='PENDIENTE'
+    ).order_by('numero_cuota').values('numero_cuota')[:1]
+
+    filas = CuotaPrestamo.objects.filter(
+        prestamo__trabajador_id__in=trabajador_ids
+    ).filter(
+        Q(quincena=quincena, estado='DESCONTADA') |
+        Q(
+            estado='PENDIENTE',
+            prestamo__estado='ACTIVO',
+            prestamo__fecha_prestamo__lte=quincena.fecha_fin,
+            numero_cuota=Subquery(siguiente),
+        )
+    ).values_list(
+        'id', 'prestamo_id', 'prestamo__trabajador_id', 'prestamo__fecha_prestamo',
+        'numero_cuota', 'valor_cuota', 'estado',
+        'prestamo__saldo_pendiente', 'prestamo__numero_cuotas',
+    )
+
+    candidatas = {}
+    for (cuota_id, prestamo_id, trabajador_id, fecha_prestamo, numero, valor,
+         estado, saldo, total) in filas:
+        if estado == 'DESCONTADA':
+            # Ya descontada en esta quincena: se vuelve a liquidar desde el saldo previo
+            candidatas[prestamo_id] = (
+                trabajador_id, fecha_prestamo, prestamo_id, cuota_id, numero, total, valor, saldo + valor
+            )
+        elif prestamo_id not in candidatas:
+            candidatas[prestamo_id] = (
+                trabajador_id, fecha_prestamo, prestamo_id, cuota_id, numero, total, valor, saldo
+            )
+
+    # Préstamos de pago único registrados sin cuotas
+    for prestamo_id, trabajador_id, fecha_prestamo, saldo in Prestamo.objects.filter(
+        trabajador_id__in=trabajador_ids,
+        estado='ACTIVO',
+        tipo_pago='UNICO',
+        fecha_prestamo__lte=quincena.fecha_fin,
+        cuotas__isnull=True,
+    ).values_list('id', 'trabajador_id', 'fecha_prestamo', 'saldo_pendiente'):
+        candidatas[prestamo_id] = (
+            trabajador_id, fecha_prestamo, prestamo_id, None, 1, 1, saldo, saldo
+        )
+
+    return [
+        (trabajador_id, prestamo_id, cuota_id, numero, total, valor, saldo)
+        for trabajador_id, _, prestamo_id, cuota_id, numero, total, valor, saldo
+        in sorted(candidatas.values(), key=lambda c: (c[0], c[1], c[2]))
+    ]
+
+
+def planificar_descuentos(candidatas, disponibles):
+    """
+    Decide qué cuotas se descuentan sin dejar el neto del trabajador en
+    negativo. disponibles: {trabajador_id: neto antes de préstamos}.
+    La última cuota descuenta todo el saldo restante.
+    """
+    disponibles = dict(disponibles)
+    descuentos = []
+    for trabajador_id, prestamo_id, cuota_id, numero, total, valor, saldo_base in candidatas:
+        es_ultima = total is None or numero >= total
+        monto = saldo_base if es_ultima else min(valor, saldo_base)
+        aplicado = 0 < monto <= disponibles.get(trabajador_id, 0)
+        if aplicado:
+            disponibles[trabajador_id] -= monto
+        descuentos.append(Descuento(
+            trabajador_id, prestamo_id, cuota_id, numero, total or 1,
+            monto, saldo_base - monto if aplicado else saldo_base, aplicado,
+        ))
+    return descuentos
+
+
+def aplicar_descuentos(quincena, descuentos, nominas):
+    """
+    Marca las cuotas descontadas (o revierte las que ya no caben), y
+    actualiza saldos y estados de los préstamos con operaciones masivas.
+    nominas: {trabajador_id: Nomina}
+    """
+    cuotas_actualizadas = []
+    cuotas_nuevas = []
+    prestamos = []
+    for descuento in descuentos:
+        if descuento.aplicado:
+            cuota = CuotaPrestamo(
+                id=descuento.cuota_id,
+                prestamo_id=descuento.prestamo_id,
+                numero_cuota=descuento.numero_cuota,
+                valor_cuota=descuento.monto,
+                estado='DESCONTADA',
+                quincena=quincena,
+                nomina=nominas[descuento.trabajador_id],
+                fecha_descuento=quincena.fecha_fin,
+            )
+        elif descuento.cuota_id is not None:
+            cuota = CuotaPrestamo(
+                id=descuento.cuota_id, valor_cuota=descuento.monto, estado='PENDIENTE',
+                quincena=None, nomina=None, fecha_descuento=None,
+            )
+        else:
+            continue
+
+        if cuota.id is None:
+            cuotas_nuevas.append(cuota)
+        else:
+            cuotas_actualizadas.append(cuota)
+        prestamos.append(Prestamo(
+            id=descuento.prestamo_id,
+            saldo_pendiente=descuento.saldo,
+            estado='PAGADO' if descuento.saldo <= 0 else 'ACTIVO',
+        ))
+
+    CuotaPrestamo.objects.bulk_create(cuotas_nuevas)
+    # valor_cuota guarda lo descontado (la última cuota lleva el residuo):
+    # cargar_cuotas reconstruye el saldo previo con él al recalcular
+    CuotaPrestamo.objects.bulk_update(
+        cuotas_actualizadas, ['valor_cuota', 'estado', 'quincena', 'nomina', 'fecha_descuento']
+    )
+    # Solo los estados que gobierna el cálculo: un préstamo CANCELADO mientras
+    # se calculaba no se reactiva
+    vigentes = set(Prestamo.objects.select_for_update().filter(
+        id__in=[prestamo.id for prestamo in prestamos], estado__in=ESTADOS_CALCULADOS
+    ).values_list('id', flat=True))
+    prestamos = [prestamo for prestamo in prestamos if prestamo.id in vigentes]
+    Prestamo.objects.bulk_update(prestamos, ['saldo_pendiente', 'estado'])
+
+    return {
+        'cuotas_descontadas': sum(1 for d in descuentos if d.aplicado),
+        'cuotas_omitidas': sum(1 for d in descuentos if not d.aplicado),
+        'prestamos_pagados': sum(1 for p in prestamos if p.estado == 'PAGADO'),
+    }
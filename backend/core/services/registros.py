@@ -0,0 +1,68 @@
+# backend/core/services/registros.py
+
+from collections import Counter
+
+from django.db.models import Count, F
+
+from core.models import Quincena, RegistroLabor
+from .pendientes import marcar_pendientes
+from .auditoria import registrar_creados
+
+# Filas por INSERT en las cargas masivas
+TAMAÑO_LOTE = 500
+
+
+def insertar_registros(registros, batch_size=TAMAÑO_LOTE):
+    """
+    Inserta RegistroLabor (sin guardar) con bulk_create, suma los totales de
+    sus quincenas, marca sus nóminas como pendientes de recálculo y los
+    audita, ya que bulk_create no envía señales.
+    """
+    creados = RegistroLabor.objects.bulk_create(registros, batch_size=batch_size)
+    ajustar_totales(Counter(registro.quincena_id for registro in creados))
+    marcar_pendientes({
+        (registro.trabajador_id, registro.quincena_id) for registro in creados
+    })
+    registrar_creados(creados)
+    return creados
+
+
+# ============================================================================
+# TOTAL DE REGISTROS POR QUINCENA
+# ============================================================================
+
+def ajustar_totales(cambios):
+    """
+    Aplica {quincena_id: diferencia} a Quincena.total_registros con un
+    UPDATE ... SET total = total + n por quincena (atómico en la base de datos).
+    """
+    for quincena_id, diferencia in cambios.items():
+        if quincena_id is not None and diferencia:
+            Quincena.objects.filter(pk=quincena_id).update(
+                total_registros=F('total_registros') + diferencia
+            )
+
+
+def recalcular_totales(guardar=True):
+    """
+    Recalcula total_registros de todas las quincenas con una consulta
+    agrupada. Retorna [(quincena, total_anterior, total_real)] de las que
+    estaban desfasadas.
+    """
+    reales = dict(
+        RegistroLabor.objects.order_by().values('quincena_id').annotate(
+            total=Count('id')
+        ).values_list('quincena_id', 'total')
+    )
+    desfasadas = []
+    for quincena in Quincena.objects.only('id', 'año', 'mes', 'numero', 'total_registros'):
+        real = reales.get(quincena.id, 0)
+        if quincena.total_registros != real:
+            desfasadas.append((quincena, quincena.total_registros, real))
+            quincena.total_registros = real
+
+    if guardar:
+        Quincena.objects.bulk_update(
+            [quincena for quincena, _, _ in desfasadas], ['total_registros']
+        )
+    return desfasadas
@@ -0,0 +1,53 @@
+# backend/core/services/respuestas.py
+
+import threading
+from collections import defaultdict
+
+from django.core.cache import caches
+
+
+class CacheRespuestas:
+    """
+    Datos serializados de las respuestas de catálogos, guardados en el cache
+    'catalogos' de settings.CACHES. La clave incluye las versiones de los
+    catálogos, así que no hace falta invalidar: al escribir un catálogo su
+    versión cambia y las claves viejas simplemente dejan de usarse.
+    """
+
+    def __init__(self, alias='catalogos'):
+        self.alias = alias
+        self._lock = threading.Lock()
+        self._por_vista = defaultdict(lambda: {'aciertos': 0, 'fallos': 0})
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def obtener(self, vista, clave):
+        """Datos guardados para la clave, o None; cuenta el acierto o fallo de la vista"""
+        datos = self.cache.get(clave)
+        with self._lock:
+            self._por_vista[vista]['aciertos' if datos is not None else 'fallos'] += 1
+        return datos
+
+    def guardar(self, clave, datos):
+        self.cache.set(clave, datos)
+
+    def estadisticas(self, vista=None):
+        with self._lock:
+            por_vista = {nombre: dict(valores) for nombre, valores in self._por_vista.items()}
+        if vista is not None:
+            por_vista = {vista: por_vista.get(vista, {'aciertos': 0, 'fallos': 0})}
+
+        aciertos = sum(valores['aciertos'] for valores in por_vista.values())
+        fallos = sum(valores['fallos'] for valores in por_vista.values())
+        consultas = aciertos + fallos
+        return {
+            'aciertos': aciertos,
+            'fallos': fallos,
+            'tasa_aciertos': round(aciertos / consultas, 4) if consultas else None,
+            'por_vista': por_vista,
+        }
+
+
+respuestas_catalogos = CacheRespuestas()
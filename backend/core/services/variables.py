@@ -0,0 +1,88 @@
+# backend/core/services/variables.py
+
+import threading
+
+from django.db.models import Q
+
+from core.models import VariablesNomina
+from .versiones import nombre_catalogo, versiones
+
+CATALOGO = nombre_catalogo(VariablesNomina)
+
+
+def cargar_variables(fecha):
+    """Retorna {nombre: valor} de las variables de nómina vigentes en la fecha"""
+    variables = {}
+    filas = VariablesNomina.objects.filter(
+        fecha_inicio_vigencia__lte=fecha
+    ).filter(
+        Q(fecha_fin_vigencia__isnull=True) | Q(fecha_fin_vigencia__gte=fecha)
+    ).order_by('nombre', '-fecha_inicio_vigencia').values_list('nombre', 'valor')
+    for nombre, valor in filas:
+        variables.setdefault(nombre, valor)
+    return variables
+
+
+class CacheVariablesNomina:
+    """
+    Cache de proceso de las variables de nómina vigentes, indexado por fecha.
+    Cada consulta (una por cálculo de quincena) lee la versión compartida del
+    catálogo variablesnomina (services.versiones), que sube con cada escritura
+    en cualquier proceso: si cambió, el cache se vacía. core.signals además
+    lo invalida de inmediato en el proceso que escribe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._por_fecha = {}
+        self._version = None
+        self._generacion = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+    def vigentes(self, fecha):
+        """Copia de {nombre: valor} de las variables vigentes en la fecha"""
+        version = versiones([CATALOGO])[CATALOGO]
+        with self._lock:
+            if version != self._version:
+                self._por_fecha.clear()
+                self._version = version
+                self._generacion += 1
+            variables = self._por_fecha.get(fecha)
+            if variables is not None:
+                self.aciertos += 1
+                return dict(variables)
+            self.fallos += 1
+            generacion = self._generacion
+
+        variables = cargar_variables(fecha)
+
+        with self._lock:
+            # Si hubo una invalidación mientras se consultaba, no guardar
+            if generacion == self._generacion:
+                self._por_fecha[fecha] = variables
+        return dict(variables)
+
+    def valor(self, nombre, fecha):
+        """Valor de una variable en la fecha, o None si no está definida"""
+        return self.vigentes(fecha).get(nombre)
+
+    def invalidar(self):
+        with self._lock:
+            self._por_fecha.clear()
+            self._generacion += 1
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tasa_aciertos': round(self.aciertos / consultas, 4) if consultas else None,
+                'fechas_en_cache': len(self._por_fecha),
+                'version': self._version,
+                'invalidaciones': self._generacion,
+            }
+
+
+variables_nomina = CacheVariablesNomina()
@@ -0,0 +1,43 @@
+# backend/core/services/versiones.py
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from core.models import VersionCatalogo
+
+
+def nombre_catalogo(modelo):
+    return modelo._meta.model_name
+
+
+def incrementar(*nombres):
+    """
+    Incrementa la versión de los catálogos dentro de la transacción en curso,
+    así quien lea la versión nueva también ve los datos nuevos.
+    """
+    for nombre in nombres:
+        actualizadas = VersionCatalogo.objects.filter(nombre=nombre).update(
+            version=F('version') + 1
+        )
+        if actualizadas:
+            continue
+        try:
+            with transaction.atomic():
+                VersionCatalogo.objects.create(nombre=nombre, version=1)
+        except IntegrityError:
+            # Otro proceso la creó al mismo tiempo
+            VersionCatalogo.objects.filter(nombre=nombre).update(version=F('version') + 1)
+
+
+def versiones(nombres):
+    """Retorna {nombre: version} con una consulta (0 si nunca se ha escrito)"""
+    nombres = list(nombres)
+    actuales = dict(
+        VersionCatalogo.objects.filter(nombre__in=nombres).values_list('nombre', 'version')
+    )
+    return {nombre: actuales.get(nombre, 0) for nombre in nombres}
+
+
+def sello(nombres):
+    """Texto estable con las versiones de los catálogos, p. ej. 'labor:3;rol:1'"""
+    return ';'.join(f'{nombre}:{version}' for nombre, version in sorted(versiones(nombres).items()))
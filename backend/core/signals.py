@@ -0,0 +1,242 @@
+# backend/core/signals.py
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import (
+    Rol, Usuario, TipoContrato, Trabajador, UnidadMedida, Labor,
+    VariablesNomina, ListaPrecios, Quincena, RegistroLabor, Nomina, Prestamo
+)
+from .services import auditoria, busqueda
+from .services.variables import variables_nomina
+from .services.pendientes import marcar_pendientes, marcar_por_precio, marcar_por_prestamos
+from .services.registros import ajustar_totales
+from .services.versiones import incrementar, nombre_catalogo
+from .services.permisos import incrementar_version_permisos
+
+
+# ============================================================================
+# VARIABLES DE NÓMINA
+# ============================================================================
+
+@receiver([post_save, post_delete], sender=VariablesNomina)
+def invalidar_cache_variables(sender, **kwargs):
+    """Invalidar el cache de variables al escribir y de nuevo al confirmar"""
+    variables_nomina.invalidar()
+    transaction.on_commit(variables_nomina.invalidar)
+
+
+# ============================================================================
+# VERSIONES DE CATÁLOGOS
+# ============================================================================
+
+@receiver([post_save, post_delete], sender=Rol)
+@receiver([post_save, post_delete], sender=TipoContrato)
+@receiver([post_save, post_delete], sender=UnidadMedida)
+@receiver([post_save, post_delete], sender=Labor)
+@receiver([post_save, post_delete], sender=ListaPrecios)
+@receiver([post_save, post_delete], sender=VariablesNomina)
+def incrementar_version_catalogo(sender, **kwargs):
+    incrementar(nombre_catalogo(sender))
+
+
+# ============================================================================
+# AUDITORÍA (solo dentro de peticiones de los viewsets de core)
+# ============================================================================
+
+AUDITADOS = [
+    Rol, Usuario, TipoContrato, Trabajador, UnidadMedida, Labor, ListaPrecios,
+    VariablesNomina, Quincena, RegistroLabor, Nomina, Prestamo,
+]
+
+
+def recordar_auditoria(sender, instance, raw=False, **kwargs):
+    instance._auditoria_anterior = None
+    if raw or not instance.pk or not auditoria.contexto_activo():
+        return
+    instance._auditoria_anterior = auditoria.a_json(
+        sender.objects.filter(pk=instance.pk).values().first()
+    )
+
+
+def auditar_guardado(sender, instance, created, raw=False, **kwargs):
+    """CREATE con los campos no vacíos; UPDATE solo con los campos que cambiaron"""
+    if raw or not auditoria.contexto_activo():
+        return
+    datos_nuevos = auditoria.instantanea(instance)
+    anteriores = getattr(instance, '_auditoria_anterior', None)
+    if created or anteriores is None:
+        auditoria.registrar(
+            'CREATE' if created else 'UPDATE', sender, instance.pk,
+            datos_nuevos=auditoria.compactar(datos_nuevos),
+        )
+        return
+
+    anteriores, datos_nuevos = auditoria.diferencias(
+        anteriores, datos_nuevos, ignorar=auditoria.campos_automaticos(sender)
+    )
+    if datos_nuevos:
+        auditoria.registrar(
+            'UPDATE', sender, instance.pk,
+            datos_anteriores=anteriores, datos_nuevos=datos_nuevos,
+        )
+
+
+def auditar_borrado(sender, instance, **kwargs):
+    if not auditoria.contexto_activo():
+        return
+    auditoria.registrar(
+        'DELETE', sender, instance.pk,
+        datos_anteriores=auditoria.compactar(auditoria.instantanea(instance)),
+    )
+
+
+for modelo in AUDITADOS:
+    pre_save.connect(recordar_auditoria, sender=modelo, dispatch_uid=f'auditoria_pre_{modelo.__name__}')
+    post_save.connect(auditar_guardado, sender=modelo, dispatch_uid=f'auditoria_post_{modelo.__name__}')
+    post_delete.connect(auditar_borrado, sender=modelo, dispatch_uid=f'auditoria_delete_{modelo.__name__}')
+
+
+# ============================================================================
+# ÍNDICE DE BÚSQUEDA DE TRABAJADORES
+# ============================================================================
+
+@receiver(post_save, sender=Trabajador)
+def indexar_trabajador(sender, instance, **kwargs):
+    busqueda.indexar(instance)
+
+
+@receiver(post_delete, sender=Trabajador)
+def desindexar_trabajador(sender, instance, **kwargs):
+    busqueda.desindexar(instance.pk)
+
+
+# ============================================================================
+# VERSIÓN DE PERMISOS (claims de los tokens JWT)
+# ============================================================================
+
+@receiver(pre_save, sender=Usuario)
+def recordar_permisos_usuario(sender, instance, **kwargs):
+    instance._permisos_anteriores = None
+    if instance.pk:
+        instance._permisos_anteriores = sender.objects.filter(pk=instance.pk).values_list(
+            'rol_id', 'is_active', 'password'
+        ).first()
+
+
+@receiver(post_save, sender=Usuario)
+def invalidar_tokens_usuario(sender, instance, created, **kwargs):
+    anteriores = getattr(instance, '_permisos_anteriores', None)
+    if created or anteriores is None:
+        return
+    if anteriores != (instance.rol_id, instance.is_active, instance.password):
+        # Contraseña o estado: también los refresh tokens (cierra las sesiones)
+        sesion = anteriores[1:] != (instance.is_active, instance.password)
+        incrementar_version_permisos([instance.pk], sesion=sesion)
+        # Para que un save() posterior de la misma instancia no las devuelva
+        instance.version_permisos, instance.version_sesion = sender.objects.values_list(
+            'version_permisos', 'version_sesion'
+        ).get(pk=instance.pk)
+
+
+@receiver(pre_save, sender=Rol)
+def recordar_permisos_rol(sender, instance, **kwargs):
+    instance._permisos_anteriores = None
+    if instance.pk:
+        instance._permisos_anteriores = sender.objects.filter(pk=instance.pk).values_list(
+            'nombre', 'permisos'
+        ).first()
+
+
+@receiver(post_save, sender=Rol)
+def invalidar_tokens_rol(sender, instance, created, **kwargs):
+    anteriores = getattr(instance, '_permisos_anteriores', None)
+    if created or anteriores is None:
+        return
+    if anteriores != (instance.nombre, instance.permisos):
+        incrementar_version_permisos(instance.usuarios.values_list('id', flat=True))
+
+
+# ============================================================================
+# NÓMINAS PENDIENTES DE RECÁLCULO
+# ============================================================================
+
+def _borrado_en_cascada(origin, *modelos):
+    """True si el borrado viene de eliminar un objeto de alguno de los modelos"""
+    modelo = getattr(origin, 'model', type(origin))
+    return origin is not None and modelo in modelos
+
+
+@receiver(pre_save, sender=RegistroLabor)
+def recordar_par_registro(sender, instance, **kwargs):
+    """Guardar el par (trabajador, quincena) anterior para marcarlo también"""
+    instance._par_anterior = None
+    if instance.pk:
+        instance._par_anterior = sender.objects.filter(pk=instance.pk).values_list(
+            'trabajador_id', 'quincena_id'
+        ).first()
+
+
+@receiver([post_save, post_delete], sender=RegistroLabor)
+def marcar_registro_pendiente(sender, instance, origin=None, **kwargs):
+    if _borrado_en_cascada(origin, Trabajador, Quincena):
+        return
+    pares = {(instance.trabajador_id, instance.quincena_id)}
+    par_anterior = getattr(instance, '_par_anterior', None)
+    if par_anterior:
+        pares.add(par_anterior)
+    marcar_pendientes(pares)
+
+
+# ============================================================================
+# TOTAL DE REGISTROS POR QUINCENA
+# ============================================================================
+
+@receiver(post_save, sender=RegistroLabor)
+def sumar_registro_quincena(sender, instance, created, **kwargs):
+    cambios = Counter()
+    par_anterior = getattr(instance, '_par_anterior', None)
+    if created:
+        cambios[instance.quincena_id] += 1
+    elif par_anterior and par_anterior[1] != instance.quincena_id:
+        # El registro cambió de quincena
+        cambios[par_anterior[1]] -= 1
+        cambios[instance.quincena_id] += 1
+    ajustar_totales(cambios)
+
+
+@receiver(post_delete, sender=RegistroLabor)
+def restar_registro_quincena(sender, instance, origin=None, **kwargs):
+    if _borrado_en_cascada(origin, Quincena):
+        return
+    ajustar_totales({instance.quincena_id: -1})
+
+
+@receiver(pre_save, sender=ListaPrecios)
+def recordar_vigencia_precio(sender, instance, **kwargs):
+    """Guardar la vigencia anterior para marcar también el rango que deja de cubrir"""
+    instance._vigencia_anterior = None
+    if instance.pk:
+        instance._vigencia_anterior = sender.objects.filter(pk=instance.pk).values_list(
+            'labor_id', 'fecha_inicio_vigencia', 'fecha_fin_vigencia'
+        ).first()
+
+
+@receiver([post_save, post_delete], sender=ListaPrecios)
+def marcar_precio_pendiente(sender, instance, **kwargs):
+    marcar_por_precio(
+        instance.labor_id, instance.fecha_inicio_vigencia, instance.fecha_fin_vigencia
+    )
+    vigencia_anterior = getattr(instance, '_vigencia_anterior', None)
+    if vigencia_anterior:
+        marcar_por_precio(*vigencia_anterior)
+
+
+@receiver([post_save, post_delete], sender=Prestamo)
+def marcar_prestamo_pendiente(sender, instance, origin=None, **kwargs):
+    if _borrado_en_cascada(origin, Trabajador):
+        return
+    marcar_por_prestamos([instance.trabajador_id])
@@ -0,0 +1,70 @@
+# backend/core/tests/conftest.py
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+
+from core.db import router
+from core.models import DiaCalendario, ListaPrecios, Quincena, Rol, Usuario, VariablesNomina
+from core.services.calendario import generar_dias
+
+from .datos import FECHA_FIN, FECHA_INICIO, VIGENCIA, cliente_de
+
+
+@pytest.fixture(autouse=True)
+def limpiar_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def sin_replica(request, monkeypatch):
+    """
+    Las pruebas sin la marca replica leen todo de la primaria: la réplica de
+    pruebas es otra conexión y no ve lo que la prueba no ha confirmado
+    """
+    if request.node.get_closest_marker('replica') is None:
+        monkeypatch.setattr(router, 'replica_configurada', lambda: False)
+
+
+@pytest.fixture
+def datos_iniciales(db):
+    call_command('cargar_datos_iniciales', stdout=StringIO())
+    ListaPrecios.objects.update(fecha_inicio_vigencia=VIGENCIA)
+    VariablesNomina.objects.update(fecha_inicio_vigencia=VIGENCIA)
+
+
+@pytest.fixture
+def calendario(db):
+    DiaCalendario.objects.bulk_create(generar_dias(2025) + generar_dias(2026))
+
+
+@pytest.fixture
+def admin(datos_iniciales):
+    return Usuario.objects.create_user(
+        'admin', password='clave12345', rol=Rol.objects.get(nombre=Rol.SUPER_ADMIN)
+    )
+
+
+@pytest.fixture
+def digitador(datos_iniciales):
+    return Usuario.objects.create_user(
+        'digitador', password='clave12345', rol=Rol.objects.get(nombre=Rol.DIGITADOR)
+    )
+
+
+@pytest.fixture
+def cliente(admin):
+    return cliente_de(admin)
+
+
+@pytest.fixture
+def quincena(datos_iniciales):
+    return Quincena.objects.create(
+        año=FECHA_INICIO.year, mes=FECHA_INICIO.month, numero=1,
+        fecha_inicio=FECHA_INICIO, fecha_fin=FECHA_FIN,
+        fecha_cierre_registro=FECHA_FIN + timedelta(days=5),
+    )
@@ -0,0 +1,43 @@
+# backend/core/tests/datos.py
+
+from datetime import date
+from decimal import Decimal
+
+from rest_framework.test import APIClient
+
+from core.models import Labor, RegistroLabor, TipoContrato, Trabajador
+
+# Precios y variables de cargar_datos_iniciales vigentes desde VIGENCIA
+VIGENCIA = date(2020, 1, 1)
+FECHA_INICIO = date(2026, 3, 1)
+FECHA_FIN = date(2026, 3, 15)
+
+
+def cliente_de(usuario):
+    cliente = APIClient()
+    cliente.force_authenticate(usuario)
+    return cliente
+
+
+def crear_trabajadores(cantidad, con_contrato=True):
+    tipo = TipoContrato.objects.get(nombre='CON_CONTRATO' if con_contrato else 'SIN_CONTRATO')
+    inicial = Trabajador.objects.count()
+    return [
+        Trabajador.objects.create(
+            nombres=f'Nombre{i}', apellidos=f'Apellido{i}', tipo_documento='CC',
+            numero_documento=str(10000 + i), fecha_nacimiento=date(1990, 1, 1),
+            tipo_contrato=tipo, fecha_ingreso=date(2020, 1, 1),
+        )
+        for i in range(inicial, inicial + cantidad)
+    ]
+
+
+def registrar_dias(trabajador, quincena, fechas, codigo='LAB001'):
+    labor = Labor.objects.get(codigo=codigo)
+    return RegistroLabor.objects.bulk_create([
+        RegistroLabor(
+            trabajador=trabajador, labor=labor, quincena=quincena,
+            fecha=fecha, cantidad=Decimal('1'),
+        )
+        for fecha in fechas
+    ])
@@ -0,0 +1,82 @@
+# backend/core/tests/test_archivo_auditoria.py
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from core.models import AuditoriaLog
+
+URL = '/api/auditoria/'
+
+
+@pytest.fixture
+def archivo(settings, tmp_path):
+    settings.AUDITORIA_ARCHIVO_DIR = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def entradas(admin):
+    """Dos entradas por día durante 20 días; las de cada día con el mismo created_at"""
+    ahora = timezone.now()
+    AuditoriaLog.objects.bulk_create([
+        AuditoriaLog(
+            usuario=admin, accion='UPDATE', tabla_afectada='core_trabajador',
+            registro_id=dia * 10 + n, ip_address='127.0.0.1',
+            created_at=ahora - timedelta(days=dia),
+        )
+        for dia in range(20) for n in range(2)
+    ])
+    return list(AuditoriaLog.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+
+def recorrer(cliente, **parametros):
+    """Páginas de ids siguiendo next y luego, desde la última, previous"""
+    datos = cliente.get(URL, parametros).data
+    adelante = [[fila['id'] for fila in datos['results']]]
+    while datos['next']:
+        datos = cliente.get(datos['next']).data
+        adelante.append([fila['id'] for fila in datos['results']])
+    atras = []
+    while datos['previous']:
+        datos = cliente.get(datos['previous']).data
+        atras.append([fila['id'] for fila in datos['results']])
+    return adelante, atras
+
+
+def archivar(dias):
+    call_command('archivar_auditoria', dias=dias, stdout=StringIO())
+
+
+def test_listado_continua_en_el_archivo_en_orden(cliente, archivo, entradas):
+    archivar(10)
+    assert AuditoriaLog.objects.count() == 20
+
+    adelante, atras = recorrer(cliente, incluir_archivo=1, page_size=7)
+
+    # La frontera entre la tabla y el archivo cae dentro de la tercera página
+    assert sum(adelante, []) == entradas
+    assert [len(pagina) for pagina in adelante] == [7, 7, 7, 7, 7, 5]
+    assert atras == adelante[-2::-1]
+
+    # Sin incluir_archivo solo la tabla
+    adelante, _ = recorrer(cliente, page_size=7)
+    assert sum(adelante, []) == entradas[:20]
+
+
+def test_entradas_archivadas_y_aun_en_la_tabla_no_se_repiten(cliente, archivo, entradas):
+    copia = list(AuditoriaLog.objects.filter(created_at__lt=timezone.now() - timedelta(days=15)))
+    archivar(15)
+    # Caída entre escribir el archivo y borrar de la tabla
+    AuditoriaLog.objects.bulk_create(copia)
+
+    adelante, _ = recorrer(cliente, incluir_archivo=1, page_size=6)
+    assert sum(adelante, []) == entradas
+
+    # La siguiente ejecución las vuelve a archivar; el archivo descarta los repetidos
+    archivar(10)
+    adelante, _ = recorrer(cliente, incluir_archivo=1, page_size=6)
+    assert sum(adelante, []) == entradas
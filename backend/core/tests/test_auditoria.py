@@ -0,0 +1,71 @@
+# backend/core/tests/test_auditoria.py
+
+import json
+import os
+import uuid
+
+import pytest
+from django.utils import timezone
+
+from core.models import AuditoriaLog
+from core.services import auditoria
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def evento(registro_id):
+    return {
+        'evento': uuid.uuid4().hex,
+        'usuario_id': None,
+        'accion': 'UPDATE',
+        'tabla_afectada': 'core_trabajador',
+        'registro_id': registro_id,
+        'datos_anteriores': None,
+        'datos_nuevos': {'nombres': 'X'},
+        'ip_address': '127.0.0.1',
+        'created_at': timezone.now().isoformat(),
+    }
+
+
+@pytest.fixture
+def escritor(settings, tmp_path):
+    settings.AUDITORIA_ASINCRONA = True
+    settings.AUDITORIA_SPOOL_DIR = str(tmp_path)
+    settings.AUDITORIA_INTERVALO = 0.01
+    escritor = auditoria.EscritorAuditoria()
+    yield escritor
+    # El hilo cierra su conexión (PostgreSQL no borra la base de pruebas con sesiones abiertas)
+    assert escritor.detener(5)
+
+
+def test_recupera_segmentos_de_un_arranque_anterior_con_el_mismo_pid(escritor, tmp_path):
+    # Proceso caído que tenía el mismo pid (p. ej. PID 1 tras reiniciar el contenedor)
+    anterior = tmp_path / f'auditoria-{os.getpid()}-{uuid.uuid4().hex[:12]}-1.jsonl'
+    anterior.write_text(json.dumps(evento(1)) + '\n', encoding='utf-8')
+
+    escritor.registrar(evento(2))
+
+    assert escritor.vaciar(5)
+    assert sorted(AuditoriaLog.objects.values_list('registro_id', flat=True)) == [1, 2]
+    assert escritor.estadisticas()['segmentos_recuperados'] == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_reintenta_un_lote_que_fallo(escritor, tmp_path, monkeypatch):
+    monkeypatch.setattr(auditoria, 'REINTENTO_INICIAL', 0.01)
+    insertar = escritor._insertar
+    fallos = []
+
+    def fallar_una_vez(eventos):
+        if not fallos:
+            fallos.append(True)
+            raise RuntimeError('base de datos no disponible')
+        insertar(eventos)
+
+    monkeypatch.setattr(escritor, '_insertar', fallar_una_vez)
+    escritor.registrar(evento(3))
+
+    assert escritor.vaciar(5)
+    assert AuditoriaLog.objects.filter(registro_id=3).exists()
+    assert escritor.estadisticas()['errores'] == 1
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,75 @@
+# backend/core/tests/test_autenticacion.py
+
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from core.authentication import CLAIM_ROL
+from core.models import Rol
+from core.serializers import TokenRolObtainPairSerializer
+
+
+@pytest.fixture
+def api():
+    return APIClient()
+
+
+def con_token(api, token):
+    api.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return api
+
+
+def test_token_con_version_autentica(api, admin):
+    refresh = TokenRolObtainPairSerializer.get_token(admin)
+    assert con_token(api, refresh.access_token).get('/api/trabajadores/').status_code == 200
+
+
+def test_token_sin_version_se_rechaza(api, admin):
+    # Emitido antes de los claims de rol y versión de permisos
+    refresh = RefreshToken.for_user(admin)
+
+    assert con_token(api, refresh.access_token).get('/api/trabajadores/').status_code == 401
+    assert con_token(api, refresh.access_token).post('/api/trabajadores/', {}).status_code == 401
+
+
+def test_refresh_sin_version_se_rechaza(api, admin):
+    refresh = RefreshToken.for_user(admin)
+    respuesta = api.post('/api/auth/refresh/', {'refresh': str(refresh)}, format='json')
+    assert respuesta.status_code == 401
+
+
+def refrescar(api, refresh):
+    return api.post('/api/auth/refresh/', {'refresh': str(refresh)}, format='json')
+
+
+def test_refresh_tras_cambio_de_rol_entrega_claims_actuales(api, admin):
+    refresh = TokenRolObtainPairSerializer.get_token(admin)
+    admin.rol = Rol.objects.get(nombre=Rol.DIGITADOR)
+    admin.save()
+    assert con_token(api, refresh.access_token).get('/api/trabajadores/').status_code == 401
+
+    respuesta = refrescar(api, refresh)
+
+    assert respuesta.status_code == 200
+    assert AccessToken(respuesta.data['access'])[CLAIM_ROL] == Rol.DIGITADOR
+    assert con_token(api, respuesta.data['access']).get('/api/trabajadores/').status_code == 200
+
+
+def test_refresh_tras_cambio_de_contrasena_se_rechaza(api, admin):
+    refresh = TokenRolObtainPairSerializer.get_token(admin)
+    admin.set_password('otra-clave-12345')
+    admin.save()
+
+    assert con_token(api, refresh.access_token).get('/api/trabajadores/').status_code == 401
+    assert refrescar(api, refresh).status_code == 401
+
+
+def test_refresh_tras_desactivar_y_reactivar_se_rechaza(api, admin):
+    refresh = TokenRolObtainPairSerializer.get_token(admin)
+    admin.is_active = False
+    admin.save()
+    assert refrescar(api, refresh).status_code == 401
+
+    admin.is_active = True
+    admin.save()
+    assert refrescar(api, refresh).status_code == 401
@@ -0,0 +1,124 @@
+# backend/core/tests/test_busqueda.py
+
+from datetime import date
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from core.models import TipoContrato, Trabajador
+from core.services import busqueda
+
+from .datos import cliente_de
+
+solo_sqlite = pytest.mark.skipif(connection.vendor != 'sqlite', reason='FTS5 es de SQLite')
+
+
+def crear(nombres, apellidos, documento):
+    return Trabajador.objects.create(
+        nombres=nombres, apellidos=apellidos, tipo_documento='CC',
+        numero_documento=documento, fecha_nacimiento=date(1990, 1, 1),
+        tipo_contrato=TipoContrato.objects.get(nombre='CON_CONTRATO'),
+        fecha_ingreso=date(2020, 1, 1),
+    )
+
+
+@pytest.fixture
+def trabajadores(datos_iniciales):
+    return {
+        'ana': crear('Ana María', 'Muñoz Peña', '1012345678'),
+        'andres': crear('Andrés', 'Gómez', '1098765432'),
+        'pedro': crear('Pedro', 'Muñoz', '52111222'),
+    }
+
+
+def test_motor_segun_la_base_de_datos(db):
+    if connection.vendor == 'sqlite':
+        assert busqueda.motor() == busqueda.FTS5
+    else:
+        # Sin permiso para crear pg_trgm/unaccent la migración 0011 no crea el índice
+        assert busqueda.motor() in (busqueda.TRIGRAMAS, None)
+
+
+def test_motor_recuerda_que_no_hay_indice(db, monkeypatch, django_assert_num_queries):
+    monkeypatch.setattr(busqueda, '_motor', None)
+    with django_assert_num_queries(0):
+        assert busqueda.motor() is None
+        assert busqueda.motor() is None
+
+    busqueda.olvidar_motor()
+    if connection.vendor == 'sqlite':
+        assert busqueda.motor() == busqueda.FTS5
+
+
+@solo_sqlite
+def test_reindexar_vuelve_a_detectar_el_motor(trabajadores, monkeypatch):
+    monkeypatch.setattr(busqueda, '_motor', None)
+
+    call_command('reindexar_trabajadores', stdout=StringIO())
+
+    assert busqueda.motor() == busqueda.FTS5
+
+
+def test_busca_por_prefijo_del_documento(trabajadores):
+    assert busqueda.buscar('10123') == [trabajadores['ana'].id]
+    assert busqueda.buscar('5211') == [trabajadores['pedro'].id]
+
+
+def test_todos_los_terminos_deben_coincidir(trabajadores):
+    assert set(busqueda.buscar('Muñoz')) == {trabajadores['ana'].id, trabajadores['pedro'].id}
+    assert busqueda.buscar('Muñoz Pedro') == [trabajadores['pedro'].id]
+    assert busqueda.buscar('Muñoz 1098') == []
+
+
+def test_busca_sin_tildes(trabajadores):
+    if busqueda.motor() is None:
+        pytest.skip('Sin índice de búsqueda las consultas icontains distinguen tildes')
+    assert set(busqueda.buscar('munoz')) == {trabajadores['ana'].id, trabajadores['pedro'].id}
+    assert busqueda.buscar('andres') == [trabajadores['andres'].id]
+
+
+def test_filtro_del_listado(trabajadores, admin):
+    respuesta = cliente_de(admin).get('/api/trabajadores/', {'search': '1098'})
+
+    assert respuesta.status_code == 200
+    assert [t['id'] for t in respuesta.data['results']] == [trabajadores['andres'].id]
+
+
+def test_endpoint_buscar(trabajadores, admin):
+    cliente = cliente_de(admin)
+
+    respuesta = cliente.get('/api/trabajadores/buscar/', {'q': 'Muñoz', 'limite': 1})
+    assert respuesta.status_code == 200
+    assert len(respuesta.data) == 1
+
+    assert cliente.get('/api/trabajadores/buscar/').status_code == 400
+
+
+@solo_sqlite
+def test_el_indice_fts_sigue_los_cambios(trabajadores):
+    pedro = trabajadores['pedro']
+    pedro.apellidos = 'Zuluaga'
+    pedro.save()
+    assert busqueda.buscar('zuluaga') == [pedro.id]
+    assert busqueda.buscar('Muñoz') == [trabajadores['ana'].id]
+
+    pedro.delete()
+    assert busqueda.buscar('zuluaga') == []
+
+
+@solo_sqlite
+def test_reconstruir_indexa_las_cargas_masivas(trabajadores):
+    tipo = TipoContrato.objects.get(nombre='CON_CONTRATO')
+    Trabajador.objects.bulk_create([
+        Trabajador(
+            nombres='Lucía', apellidos='Ríos', tipo_documento='CC',
+            numero_documento='77000111', fecha_nacimiento=date(1990, 1, 1),
+            tipo_contrato=tipo, fecha_ingreso=date(2020, 1, 1),
+        )
+    ])
+    assert busqueda.buscar('rios') == []
+
+    assert busqueda.reconstruir() == Trabajador.objects.count()
+    assert busqueda.buscar('rios') == [Trabajador.objects.get(numero_documento='77000111').id]
@@ -0,0 +1,46 @@
+# backend/core/tests/test_catalogos.py
+
+from datetime import date, timedelta
+
+from django.contrib.auth.models import update_last_login
+
+from core.models import ListaPrecios, VersionCatalogo
+
+
+def test_inicio_de_sesion_no_invalida_catalogos(cliente, admin):
+    etags = {
+        url: cliente.get(url)['ETag']
+        for url in ('/api/precios/', '/api/variables-nomina/')
+    }
+
+    update_last_login(None, admin)
+    admin.first_name = 'Otro'
+    admin.save()
+
+    assert not VersionCatalogo.objects.filter(nombre='usuario').exists()
+    for url, etag in etags.items():
+        assert cliente.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+
+def test_respuesta_y_etag_dependen_del_host(cliente, settings):
+    settings.ALLOWED_HOSTS = ['*']
+    # Más de una página, para que la respuesta tenga el enlace next
+    precio = ListaPrecios.objects.first()
+    ListaPrecios.objects.bulk_create([
+        ListaPrecios(
+            labor=precio.labor, precio=precio.precio,
+            fecha_inicio_vigencia=date(2000, 1, 1) + timedelta(days=i),
+        )
+        for i in range(25)
+    ])
+
+    lan = cliente.get('/api/precios/', HTTP_HOST='192.168.1.10')
+    publica = cliente.get('/api/precios/', HTTP_HOST='agromax.example.com', secure=True)
+
+    assert lan.data['next'].startswith('http://192.168.1.10/')
+    assert publica.data['next'].startswith('https://agromax.example.com/')
+    assert lan['ETag'] != publica['ETag']
+    assert cliente.get(
+        '/api/precios/', HTTP_HOST='agromax.example.com', secure=True,
+        HTTP_IF_NONE_MATCH=lan['ETag'],
+    ).status_code == 200
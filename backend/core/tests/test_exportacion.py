@@ -0,0 +1,26 @@
+# backend/core/tests/test_exportacion.py
+
+import csv
+import io
+from datetime import datetime
+
+from django.utils import timezone
+
+from .datos import crear_trabajadores, registrar_dias
+
+
+def leer_csv(respuesta):
+    contenido = b''.join(respuesta.streaming_content).decode('utf-8-sig')
+    return list(csv.DictReader(io.StringIO(contenido)))
+
+
+def test_fechas_y_horas_en_hora_local(cliente, quincena):
+    trabajador, = crear_trabajadores(1)
+    registro, = registrar_dias(trabajador, quincena, [quincena.fecha_inicio])
+
+    filas = leer_csv(cliente.get('/api/registros-labor/export/'))
+
+    creado = datetime.fromisoformat(filas[0]['created_at'])
+    assert creado.utcoffset() == timezone.localtime(registro.created_at).utcoffset()
+    assert creado == registro.created_at
+    assert filas[0]['fecha'] == quincena.fecha_inicio.isoformat()
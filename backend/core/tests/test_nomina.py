@@ -0,0 +1,126 @@
+# backend/core/tests/test_nomina.py
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+
+from core.models import DetalleNomina, DiaCalendario, Nomina, Quincena
+from core.services import nomina
+from core.services.nomina import CalculoNominaError, calcular_quincena
+
+from .datos import crear_trabajadores, registrar_dias
+
+# 1-15 de enero de 2026: festivos el jueves 1 y el lunes 12 (Reyes),
+# domingos 4 y 11
+ENERO = (date(2026, 1, 1), date(2026, 1, 15))
+
+
+def crear_quincena(inicio, fin, numero):
+    return Quincena.objects.create(
+        año=fin.year, mes=fin.month, numero=numero, fecha_inicio=inicio,
+        fecha_fin=fin, fecha_cierre_registro=fin + timedelta(days=5),
+    )
+
+
+def laborables(desde, hasta):
+    """Lunes a sábado del rango, sin los festivos de enero"""
+    return [
+        desde + timedelta(days=n) for n in range((hasta - desde).days + 1)
+        if (desde + timedelta(days=n)).weekday() < 6
+        and desde + timedelta(days=n) not in (date(2026, 1, 1), date(2026, 1, 12))
+    ]
+
+
+def descansos(trabajador):
+    """{concepto: cantidad} de los dominicales y festivos liquidados"""
+    return {
+        concepto: cantidad
+        for concepto, cantidad in DetalleNomina.objects.filter(
+            nomina__trabajador=trabajador, concepto__in=['DOMINICAL', 'FESTIVO']
+        ).values_list('concepto', 'cantidad')
+    }
+
+
+@pytest.fixture
+def enero(datos_iniciales, calendario):
+    return crear_quincena(*ENERO, numero=1)
+
+
+def test_descansos_proporcionales_a_la_semana(enero):
+    trabajador, = crear_trabajadores(1)
+    # Lunes a miércoles de la semana del domingo 11
+    registrar_dias(trabajador, enero, laborables(date(2026, 1, 5), date(2026, 1, 7)))
+
+    calcular_quincena(enero)
+
+    assert descansos(trabajador) == {'DOMINICAL': Decimal('0.50')}
+
+
+def test_semanas_completas_incluyen_la_quincena_anterior(enero):
+    completo, sin_previos = crear_trabajadores(2)
+    diciembre = crear_quincena(date(2025, 12, 16), date(2025, 12, 31), numero=2)
+    registrar_dias(completo, diciembre, laborables(date(2025, 12, 29), date(2025, 12, 31)))
+    for trabajador in (completo, sin_previos):
+        registrar_dias(trabajador, enero, laborables(*ENERO))
+
+    calcular_quincena(enero)
+
+    # El festivo del 12 solo cuenta su semana hasta el fin de la quincena
+    assert descansos(completo) == {'DOMINICAL': Decimal('2.00'), 'FESTIVO': Decimal('2.00')}
+    # Semana del 29 al 3 sin los días de diciembre: 2 de 5
+    assert descansos(sin_previos) == {'DOMINICAL': Decimal('1.40'), 'FESTIVO': Decimal('1.40')}
+
+
+def test_sin_contrato_no_recibe_descansos(enero):
+    trabajador, = crear_trabajadores(1, con_contrato=False)
+    registrar_dias(trabajador, enero, laborables(*ENERO))
+
+    calcular_quincena(enero)
+
+    assert descansos(trabajador) == {}
+
+
+def test_calendario_faltante_impide_el_calculo(enero):
+    trabajador, = crear_trabajadores(1)
+    registrar_dias(trabajador, enero, laborables(*ENERO))
+    DiaCalendario.objects.filter(fecha__year=2026).delete()
+
+    with pytest.raises(CalculoNominaError, match='generar_calendario'):
+        calcular_quincena(enero)
+
+    enero.refresh_from_db()
+    assert enero.estado == 'ABIERTA'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_liquida_fuera_de_la_transaccion(datos_iniciales, calendario, monkeypatch):
+    quincena = crear_quincena(*ENERO, numero=1)
+    trabajador, = crear_trabajadores(1)
+    registrar_dias(trabajador, quincena, laborables(*ENERO))
+    en_transaccion = []
+    calcular_lote = nomina.calcular_lote
+
+    def espiar(lote, contexto):
+        en_transaccion.append(connection.in_atomic_block)
+        return calcular_lote(lote, contexto)
+
+    monkeypatch.setattr(nomina, 'calcular_lote', espiar)
+    calcular_quincena(quincena, procesos=1)
+
+    assert en_transaccion == [False]
+    assert Nomina.objects.filter(quincena=quincena).count() == 1
+
+
+def test_calculo_en_paralelo_igual_al_serie(enero, monkeypatch):
+    trabajadores = crear_trabajadores(6) + crear_trabajadores(6, con_contrato=False)
+    for numero, trabajador in enumerate(trabajadores):
+        registrar_dias(trabajador, enero, laborables(*ENERO)[numero % 4:])
+    monkeypatch.setattr(nomina.os, 'cpu_count', lambda: 2)
+
+    serie = nomina.liquidar(enero, procesos=1)
+    paralelo = nomina.liquidar(enero, procesos=2)
+
+    assert paralelo.procesos == 2
+    assert paralelo.resultados == serie.resultados
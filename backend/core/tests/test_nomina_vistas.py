@@ -0,0 +1,44 @@
+# backend/core/tests/test_nomina_vistas.py
+
+from datetime import timedelta
+
+import pytest
+
+from .datos import crear_trabajadores, registrar_dias
+from core.models import Nomina
+from core.services.nomina import calcular_quincena
+
+
+@pytest.fixture
+def nominas(quincena, calendario):
+    for trabajador in crear_trabajadores(6) + crear_trabajadores(6, con_contrato=False):
+        registrar_dias(trabajador, quincena, [
+            quincena.fecha_inicio + timedelta(days=dia) for dia in range(1, 6)
+        ])
+    calcular_quincena(quincena)
+    return Nomina.objects.order_by('id')
+
+
+# Consultas por petición: no deben crecer con la cantidad de nóminas
+
+def test_listado_sin_detalles(cliente, nominas, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        respuesta = cliente.get('/api/nominas/')
+    assert respuesta.status_code == 200
+    assert respuesta.data['count'] == 12
+    assert 'detalles' not in respuesta.data['results'][0]
+
+
+def test_listado_con_detalles(cliente, nominas, django_assert_num_queries):
+    with django_assert_num_queries(4):
+        respuesta = cliente.get('/api/nominas/?incluir_detalles=1')
+    assert respuesta.status_code == 200
+    assert all(nomina['detalles'] for nomina in respuesta.data['results'])
+
+
+def test_detalle(cliente, nominas, django_assert_num_queries):
+    nomina = nominas.first()
+    with django_assert_num_queries(3):
+        respuesta = cliente.get(f'/api/nominas/{nomina.pk}/')
+    assert respuesta.status_code == 200
+    assert respuesta.data['detalles']
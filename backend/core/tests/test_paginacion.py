@@ -0,0 +1,71 @@
+# backend/core/tests/test_paginacion.py
+
+import base64
+import json
+from datetime import timedelta
+
+import pytest
+
+from core.models import RegistroLabor
+
+from .datos import crear_trabajadores, registrar_dias
+
+URL = '/api/registros-labor/'
+
+
+@pytest.fixture
+def registros(quincena):
+    # Varios registros por fecha: empates en la primera columna del orden
+    fechas = [quincena.fecha_inicio + timedelta(days=i) for i in range(4)]
+    for trabajador in crear_trabajadores(3):
+        registrar_dias(trabajador, quincena, fechas)
+    return list(
+        RegistroLabor.objects.order_by('-fecha', 'trabajador_id', 'id').values_list('id', flat=True)
+    )
+
+
+def pagina(cliente, url, **parametros):
+    respuesta = cliente.get(url, parametros)
+    assert respuesta.status_code == 200
+    return respuesta.data
+
+
+def ids(datos):
+    return [fila['id'] for fila in datos['results']]
+
+
+def cursor(contenido):
+    return base64.urlsafe_b64encode(json.dumps(contenido).encode()).decode()
+
+
+def test_recorre_todas_las_paginas_y_vuelve(cliente, registros):
+    datos = pagina(cliente, URL, page_size=5)
+    assert datos['previous'] is None
+    paginas = [ids(datos)]
+    while datos['next']:
+        datos = pagina(cliente, datos['next'])
+        paginas.append(ids(datos))
+
+    assert [len(p) for p in paginas] == [5, 5, 2]
+    assert sum(paginas, []) == registros
+
+    # Hacia atrás desde la última página
+    hacia_atras = []
+    while datos['previous']:
+        datos = pagina(cliente, datos['previous'])
+        hacia_atras.append(ids(datos))
+    assert hacia_atras == paginas[-2::-1]
+    assert datos['next'] is not None
+
+
+@pytest.mark.parametrize('valor', [
+    'no-es-base64!',
+    cursor({'v': ['2026-03-01', '1']}),  # faltan columnas
+    cursor({'v': ['no-es-fecha', '1', '1']}),
+    cursor({'v': ['2026-03-01', 'x', '1']}),
+    cursor(['2026-03-01', '1', '1']),
+])
+def test_cursor_invalido_responde_404(cliente, registros, valor):
+    respuesta = cliente.get(URL, {'cursor': valor})
+
+    assert respuesta.status_code == 404
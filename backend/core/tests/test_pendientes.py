@@ -0,0 +1,148 @@
+# backend/core/tests/test_pendientes.py
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from core.models import (
+    DetalleNomina, Labor, ListaPrecios, Nomina, NominaPendiente, Prestamo, Quincena, RegistroLabor,
+)
+from core.services.nomina import calcular_quincena
+from core.services.registros import recalcular_totales
+
+from .datos import crear_trabajadores, registrar_dias
+
+
+def pendientes():
+    return set(NominaPendiente.objects.values_list('trabajador_id', 'quincena_id'))
+
+
+def dias(quincena, *numeros):
+    return [quincena.fecha_inicio + timedelta(days=numero) for numero in numeros]
+
+
+def registrar(trabajador, quincena, dia):
+    """Un registro guardado uno a uno (con señales, a diferencia de registrar_dias)"""
+    return RegistroLabor.objects.create(
+        trabajador=trabajador, labor=Labor.objects.get(codigo='LAB001'), quincena=quincena,
+        fecha=dias(quincena, dia)[0], cantidad=Decimal('1'),
+    )
+
+
+@pytest.fixture
+def calculada(quincena, calendario):
+    """Quincena calculada: uno y dos con días básicos, tres con embolse"""
+    uno, dos, tres = crear_trabajadores(3)
+    registrar_dias(uno, quincena, dias(quincena, 1, 2, 3))
+    registrar_dias(dos, quincena, dias(quincena, 1, 2, 3))
+    registrar_dias(tres, quincena, dias(quincena, 1, 2), codigo='LAB006')
+    recalcular_totales()
+    calcular_quincena(quincena)
+    assert pendientes() == set()
+    return uno, dos, tres
+
+
+def nomina_de(trabajador):
+    return Nomina.objects.get(trabajador=trabajador)
+
+
+# ============================================================================
+# CÁLCULO INCREMENTAL
+# ============================================================================
+
+def test_incremental_recalcula_solo_los_pendientes(quincena, calculada):
+    uno, dos, _ = calculada
+    antes = {t.pk: nomina_de(t) for t in (uno, dos)}
+    registro = RegistroLabor.objects.filter(trabajador=uno).first()
+    registro.cantidad = Decimal('0.5')
+    registro.save()
+    assert pendientes() == {(uno.pk, quincena.pk)}
+
+    resumen = calcular_quincena(quincena, incremental=True)
+
+    assert resumen['modo'] == 'incremental'
+    assert resumen['trabajadores'] == 1
+    assert resumen['nominas_omitidas'] == 2
+    assert nomina_de(uno).total_devengado < antes[uno.pk].total_devengado
+    assert nomina_de(dos).fecha_calculo == antes[dos.pk].fecha_calculo
+    assert pendientes() == set()
+
+
+def test_ajuste_manual_se_conserva_al_recalcular(quincena, calculada):
+    uno, _, _ = calculada
+    nomina = nomina_de(uno)
+    DetalleNomina.objects.create(
+        nomina=nomina, tipo='DEVENGO', concepto='AJUSTE_MANUAL',
+        descripcion='Bonificación', valor_total=Decimal('10000'),
+    )
+    registrar(uno, quincena, 4)
+    assert pendientes() == {(uno.pk, quincena.pk)}
+
+    calcular_quincena(quincena, incremental=True)
+
+    nomina = nomina_de(uno)
+    ajuste = nomina.detalles.get(concepto='AJUSTE_MANUAL')
+    assert ajuste.valor_total == Decimal('10000')
+    devengos = sum(
+        nomina.detalles.filter(tipo='DEVENGO').values_list('valor_total', flat=True), Decimal('0')
+    )
+    assert nomina.total_devengado == devengos
+
+
+def test_nomina_aprobada_no_se_recalcula(quincena, calculada):
+    uno, _, _ = calculada
+    Nomina.objects.filter(trabajador=uno).update(estado='APROBADA')
+    aprobada = nomina_de(uno)
+    registrar(uno, quincena, 4)
+    assert pendientes() == {(uno.pk, quincena.pk)}
+
+    resumen = calcular_quincena(quincena, incremental=True)
+
+    assert resumen['trabajadores'] == 0
+    assert resumen['nominas_bloqueadas'] == 1
+    assert nomina_de(uno).total_neto == aprobada.total_neto
+    assert nomina_de(uno).fecha_calculo == aprobada.fecha_calculo
+
+
+# ============================================================================
+# MARCAS DE LAS SEÑALES
+# ============================================================================
+
+def test_cambio_de_precio_marca_los_trabajadores_de_la_labor(quincena, calculada):
+    uno, dos, _ = calculada
+    precio = ListaPrecios.objects.get(labor__codigo='LAB001')
+    precio.precio += 1000
+    precio.save()
+
+    assert pendientes() == {(uno.pk, quincena.pk), (dos.pk, quincena.pk)}
+
+
+def test_cambio_de_prestamo_marca_la_nomina_del_trabajador(quincena, calculada):
+    _, _, tres = calculada
+    Prestamo.objects.create(
+        trabajador=tres, monto_total=Decimal('50000'), tipo_pago='UNICO',
+        numero_cuotas=1, valor_cuota=Decimal('50000'), saldo_pendiente=Decimal('50000'),
+        fecha_prestamo=quincena.fecha_inicio,
+    )
+
+    assert pendientes() == {(tres.pk, quincena.pk)}
+
+
+def test_mover_un_registro_marca_el_par_anterior_y_el_nuevo(quincena, calculada):
+    uno, dos, _ = calculada
+    registro = RegistroLabor.objects.filter(trabajador=uno).first()
+
+    registro.trabajador = dos
+    registro.save()
+    assert pendientes() == {(uno.pk, quincena.pk), (dos.pk, quincena.pk)}
+
+    NominaPendiente.objects.all().delete()
+    siguiente = Quincena.objects.create(
+        año=2026, mes=3, numero=2, fecha_inicio=date(2026, 3, 16),
+        fecha_fin=date(2026, 3, 31), fecha_cierre_registro=date(2026, 4, 5),
+    )
+    registro.quincena = siguiente
+    registro.fecha = siguiente.fecha_inicio
+    registro.save()
+    assert pendientes() == {(dos.pk, quincena.pk), (dos.pk, siguiente.pk)}
@@ -0,0 +1,73 @@
+# backend/core/tests/test_prestamos.py
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+
+from core.models import CuotaPrestamo, DetalleNomina, Prestamo
+from core.services import nomina
+from core.services.nomina import calcular_quincena
+
+from .datos import crear_trabajadores, registrar_dias
+
+
+@pytest.fixture
+def prestamo_con_residuo(quincena, calendario):
+    """Préstamo antiguo de 3 x 33.33 cuyo saldo (33.34) lleva el residuo del redondeo"""
+    trabajador, = crear_trabajadores(1)
+    registrar_dias(trabajador, quincena, [
+        quincena.fecha_inicio + timedelta(days=dia) for dia in range(1, 6)
+    ])
+    prestamo = Prestamo.objects.create(
+        trabajador=trabajador, monto_total=Decimal('100.00'), tipo_pago='CUOTAS',
+        numero_cuotas=3, valor_cuota=Decimal('33.33'), saldo_pendiente=Decimal('33.34'),
+        fecha_prestamo=quincena.fecha_inicio - timedelta(days=60),
+    )
+    CuotaPrestamo.objects.bulk_create([
+        CuotaPrestamo(
+            prestamo=prestamo, numero_cuota=numero, valor_cuota=Decimal('33.33'),
+            estado='DESCONTADA' if numero < 3 else 'PENDIENTE',
+        )
+        for numero in (1, 2, 3)
+    ])
+    return prestamo
+
+
+def descontado(prestamo):
+    return DetalleNomina.objects.get(
+        nomina__trabajador=prestamo.trabajador, concepto='PRESTAMO'
+    ).valor_total
+
+
+def test_recalculo_conserva_residuo_de_la_ultima_cuota(quincena, prestamo_con_residuo):
+    prestamo = prestamo_con_residuo
+    for _ in range(2):
+        calcular_quincena(quincena)
+        prestamo.refresh_from_db()
+        cuota = prestamo.cuotas.get(numero_cuota=3)
+        assert descontado(prestamo) == Decimal('33.34')
+        assert cuota.valor_cuota == Decimal('33.34')
+        assert cuota.estado == 'DESCONTADA'
+        assert prestamo.saldo_pendiente == Decimal('0.00')
+        assert prestamo.estado == 'PAGADO'
+
+
+def test_prestamo_cancelado_durante_el_calculo_no_se_reactiva(
+    quincena, prestamo_con_residuo, monkeypatch
+):
+    prestamo = prestamo_con_residuo
+    guardar = nomina.guardar_resultados
+
+    def cancelar_y_guardar(*args, **kwargs):
+        # Se cancela después de planificar los descuentos y antes de aplicarlos
+        Prestamo.objects.filter(pk=prestamo.pk).update(estado='CANCELADO')
+        return guardar(*args, **kwargs)
+
+    monkeypatch.setattr(nomina, 'guardar_resultados', cancelar_y_guardar)
+    resumen = calcular_quincena(quincena)
+
+    prestamo.refresh_from_db()
+    assert prestamo.estado == 'CANCELADO'
+    assert prestamo.saldo_pendiente == Decimal('33.34')
+    assert resumen['prestamos_pagados'] == 0
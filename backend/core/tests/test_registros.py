@@ -0,0 +1,113 @@
+# backend/core/tests/test_registros.py
+
+from datetime import date, timedelta
+
+import pytest
+from django.utils import timezone
+
+from core.models import Labor, NominaPendiente, Quincena, RegistroLabor
+
+from .datos import cliente_de, crear_trabajadores
+
+
+def crear_quincena(numero, cierre):
+    return Quincena.objects.create(
+        año=2026, mes=4, numero=numero,
+        fecha_inicio=date(2026, 4, 1) if numero == 1 else date(2026, 4, 16),
+        fecha_fin=date(2026, 4, 15) if numero == 1 else date(2026, 4, 30),
+        fecha_cierre_registro=cierre,
+    )
+
+
+@pytest.fixture
+def abierta(datos_iniciales):
+    return crear_quincena(1, timezone.now().date() + timedelta(days=30))
+
+
+@pytest.fixture
+def cerrada(datos_iniciales):
+    # Pasó la fecha de cierre de registro
+    return crear_quincena(2, timezone.now().date() - timedelta(days=1))
+
+
+@pytest.fixture
+def trabajadores(datos_iniciales):
+    return crear_trabajadores(2)
+
+
+def fila(trabajador_id, quincena, dia=0):
+    return {
+        'trabajador': trabajador_id,
+        'labor': Labor.objects.get(codigo='LAB001').pk,
+        'quincena': quincena.pk,
+        'fecha': (quincena.fecha_inicio + timedelta(days=dia)).isoformat(),
+        'cantidad': '1',
+    }
+
+
+def cargar(usuario, filas, **opciones):
+    return cliente_de(usuario).post(
+        '/api/registros-labor/batch/', {'registros': filas, **opciones}, format='json'
+    )
+
+
+def pendientes():
+    return set(NominaPendiente.objects.values_list('trabajador_id', 'quincena_id'))
+
+
+def test_lote_parcial_crea_las_filas_validas(digitador, abierta, trabajadores):
+    uno, dos = trabajadores
+    respuesta = cargar(digitador, [
+        fila(uno.pk, abierta, 0),
+        fila(999999, abierta, 0),  # trabajador inexistente
+        fila(dos.pk, abierta, 1),
+        fila(uno.pk, abierta, 20),  # fuera de la quincena
+        fila(uno.pk, abierta, 2),
+    ])
+
+    assert respuesta.status_code == 201
+    assert respuesta.data['creados'] == 3
+    assert [error['fila'] for error in respuesta.data['errores']] == [1, 3]
+    assert 'trabajador' in respuesta.data['errores'][0]['errores']
+
+    assert RegistroLabor.objects.filter(quincena=abierta).count() == 3
+    abierta.refresh_from_db()
+    assert abierta.total_registros == 3
+    assert pendientes() == {(uno.pk, abierta.pk), (dos.pk, abierta.pk)}
+
+
+def test_todo_o_nada_no_crea_nada_si_una_fila_falla(digitador, abierta, trabajadores):
+    uno, dos = trabajadores
+    respuesta = cargar(digitador, [
+        fila(uno.pk, abierta, 0),
+        fila(dos.pk, abierta, 1),
+        fila(uno.pk, abierta, 20),
+    ], todo_o_nada=True)
+
+    assert respuesta.status_code == 400
+    assert respuesta.data['creados'] == 0
+    assert [error['fila'] for error in respuesta.data['errores']] == [2]
+
+    assert not RegistroLabor.objects.exists()
+    abierta.refresh_from_db()
+    assert abierta.total_registros == 0
+    assert pendientes() == set()
+
+
+def test_filas_de_una_quincena_cerrada_se_rechazan(digitador, abierta, cerrada, trabajadores):
+    uno, dos = trabajadores
+
+    respuesta = cargar(digitador, [fila(uno.pk, cerrada, 0), fila(dos.pk, abierta, 0)])
+
+    assert respuesta.status_code == 201
+    assert respuesta.data['creados'] == 1
+    assert [error['fila'] for error in respuesta.data['errores']] == [0]
+    assert not RegistroLabor.objects.filter(quincena=cerrada).exists()
+    cerrada.refresh_from_db()
+    assert cerrada.total_registros == 0
+    assert pendientes() == {(dos.pk, abierta.pk)}
+
+    # Sin ninguna fila válida no se crea nada
+    respuesta = cargar(digitador, [fila(uno.pk, cerrada, 0), fila(dos.pk, cerrada, 1)])
+    assert respuesta.status_code == 400
+    assert len(respuesta.data['errores']) == 2
@@ -0,0 +1,158 @@
+# backend/core/tests/test_replica.py
+
+import os
+import sqlite3
+import subprocess
+import sys
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from core.db import router
+from core.management.commands.sincronizar_replica import Command as SincronizarReplica
+
+from .datos import cliente_de, crear_trabajadores, registrar_dias
+
+
+def consultas(cliente, url):
+    """SQL ejecutado en la primaria y en la réplica al pedir url"""
+    with CaptureQueriesContext(connections['default']) as primaria, \
+            CaptureQueriesContext(connections['replica']) as copia:
+        respuesta = cliente.get(url)
+        assert respuesta.status_code == 200
+        if respuesta.streaming:
+            b''.join(respuesta.streaming_content)
+    return [q['sql'] for q in primaria], [q['sql'] for q in copia]
+
+
+def usa_tabla(sentencias, tabla):
+    return any(f'"{tabla}"' in sql for sql in sentencias)
+
+
+@pytest.fixture
+def registros(quincena):
+    trabajador, = crear_trabajadores(1)
+    return registrar_dias(trabajador, quincena, [quincena.fecha_inicio])
+
+
+# ============================================================================
+# ENRUTAMIENTO
+# ============================================================================
+
+@pytest.mark.parametrize('url, tabla', [
+    ('/api/nominas/', 'core_nomina'),
+    ('/api/registros-labor/', 'core_registrolabor'),
+    ('/api/registros-labor/export/', 'core_registrolabor'),
+    ('/api/auditoria/', 'core_auditorialog'),
+])
+@pytest.mark.usefixtures('registros')
+@pytest.mark.replica
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+def test_reportes_y_listados_leen_de_la_replica(admin, url, tabla):
+    primaria, copia = consultas(cliente_de(admin), url)
+
+    assert usa_tabla(copia, tabla)
+    assert not usa_tabla(primaria, tabla)
+
+
+@pytest.mark.usefixtures('registros')
+@pytest.mark.replica
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+def test_las_demas_vistas_leen_de_la_primaria(admin):
+    primaria, copia = consultas(cliente_de(admin), '/api/trabajadores/')
+
+    assert usa_tabla(primaria, 'core_trabajador')
+    assert copia == []
+
+
+# ============================================================================
+# LECTURAS DESPUÉS DE ESCRIBIR
+# ============================================================================
+
+@pytest.mark.usefixtures('registros')
+@pytest.mark.replica
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+def test_quien_escribio_lee_de_la_primaria(admin, digitador):
+    trabajador, = crear_trabajadores(1)
+    cliente = cliente_de(admin)
+    assert cliente.post(f'/api/trabajadores/{trabajador.pk}/inactivar/').status_code == 200
+
+    assert router.fijado_a_primaria(admin.pk)
+    primaria, copia = consultas(cliente, '/api/registros-labor/')
+    assert usa_tabla(primaria, 'core_registrolabor')
+    assert copia == []
+
+    # Solo el usuario que escribió
+    _, copia = consultas(cliente_de(digitador), '/api/registros-labor/')
+    assert usa_tabla(copia, 'core_registrolabor')
+
+
+@pytest.mark.replica
+def test_la_fijacion_se_ve_desde_otro_proceso(admin):
+    router.fijar_primaria(admin.pk)
+
+    cache = settings.CACHES[router.CACHE_FIJADOS]
+    codigo = (
+        'import django; django.setup()\n'
+        'from core.db import router\n'
+        f'print(router.fijado_a_primaria({admin.pk}))\n'
+    )
+    salida = subprocess.run(
+        [sys.executable, '-c', codigo], capture_output=True, text=True, check=True,
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'config.settings',
+            'REPLICA_CACHE_BACKEND': cache['BACKEND'],
+            'REPLICA_CACHE_LOCATION': cache['LOCATION'],
+        },
+    ).stdout
+    assert salida.strip() == 'True'
+
+
+# ============================================================================
+# sincronizar_replica
+# ============================================================================
+
+def crear_primaria(ruta, filas):
+    conexion = sqlite3.connect(ruta)
+    conexion.execute('PRAGMA journal_mode = WAL')
+    conexion.execute('CREATE TABLE dato (id INTEGER PRIMARY KEY)')
+    conexion.executemany('INSERT INTO dato VALUES (?)', [(i,) for i in range(filas)])
+    conexion.commit()
+    return conexion
+
+
+def test_sincronizar_replica_actualiza_el_archivo_abierto(tmp_path):
+    origen, destino = tmp_path / 'primaria.sqlite3', tmp_path / 'replica.sqlite3'
+    primaria = crear_primaria(origen, 100)
+    comando = SincronizarReplica()
+
+    comando.copiar(origen, destino)
+    # Como la abre settings.DATABASES['replica']
+    lectora = sqlite3.connect(f'file:{destino}?mode=ro', uri=True)
+    assert lectora.execute('SELECT count(*) FROM dato').fetchone() == (100,)
+
+    primaria.execute('INSERT INTO dato VALUES (100)')
+    primaria.commit()
+    comando.copiar(origen, destino)
+
+    # La conexión abierta ve la copia nueva; la réplica no queda en WAL
+    assert lectora.execute('SELECT count(*) FROM dato').fetchone() == (101,)
+    assert lectora.execute('PRAGMA journal_mode').fetchone() == ('delete',)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        'primaria.sqlite3', 'primaria.sqlite3-shm', 'primaria.sqlite3-wal', 'replica.sqlite3',
+    ]
+    lectora.close()
+    primaria.close()
+
+
+def test_sincronizar_replica_requiere_db_replica(db, settings):
+    settings.DB_REPLICA = ''
+    with pytest.raises(CommandError):
+        call_command('sincronizar_replica', stdout=StringIO())
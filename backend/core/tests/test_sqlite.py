@@ -0,0 +1,120 @@
+# backend/core/tests/test_sqlite.py
+
+import sqlite3
+import threading
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections, transaction
+
+from core.db.conexiones import con_reintentos
+from core.db.sqlite3.base import DatabaseWrapper
+
+pytestmark = [
+    pytest.mark.skipif(connection.vendor != 'sqlite', reason='Perfil de SQLite'),
+    pytest.mark.django_db,
+]
+
+ALIAS = 'archivo'
+
+
+@pytest.fixture
+def archivo(tmp_path):
+    """
+    Conexión del proyecto (core.db.sqlite3) sobre un archivo: la base de
+    pruebas está en memoria y no admite WAL ni bloqueos entre conexiones
+    """
+    ruta = tmp_path / 'prueba.sqlite3'
+    conexion = DatabaseWrapper({**connections['default'].settings_dict, 'NAME': str(ruta)}, ALIAS)
+    connections[ALIAS] = conexion
+    with conexion.cursor() as cursor:
+        cursor.execute('CREATE TABLE dato (id INTEGER PRIMARY KEY, valor TEXT)')
+    yield ruta
+    conexion.close()
+    del connections[ALIAS]
+
+
+def otra_conexion(ruta):
+    """Conexión de otro proceso, sin espera ante bloqueos"""
+    return sqlite3.connect(ruta, timeout=0, isolation_level=None, check_same_thread=False)
+
+
+def pragma(nombre):
+    with connections[ALIAS].cursor() as cursor:
+        cursor.execute(f'PRAGMA {nombre}')
+        return cursor.fetchone()[0]
+
+
+def test_pragmas_de_la_conexion(archivo, settings):
+    assert pragma('journal_mode') == 'wal'
+    assert pragma('synchronous') == 1  # NORMAL
+    assert pragma('busy_timeout') == settings.SQLITE_PRAGMAS['busy_timeout']
+    assert pragma('query_only') == 0
+
+
+def test_la_transaccion_toma_el_bloqueo_de_escritura_al_empezar(archivo):
+    otra = otra_conexion(archivo)
+    with transaction.atomic(using=ALIAS):
+        # Solo lecturas: con BEGIN diferido otro escritor todavía podría entrar
+        connections[ALIAS].cursor().execute('SELECT count(*) FROM dato')
+        with pytest.raises(sqlite3.OperationalError, match='locked'):
+            otra.execute('BEGIN IMMEDIATE')
+    otra.execute('BEGIN IMMEDIATE')
+    otra.execute('ROLLBACK')
+    otra.close()
+
+
+def test_begin_reintenta_mientras_otro_proceso_escribe(archivo, settings):
+    settings.SQLITE_REINTENTOS_ESCRITURA = 10
+    settings.SQLITE_ESPERA_REINTENTO = 0.01
+    connections[ALIAS].close()
+    settings.SQLITE_PRAGMAS = {**settings.SQLITE_PRAGMAS, 'busy_timeout': 0}
+
+    otra = otra_conexion(archivo)
+    otra.execute('BEGIN IMMEDIATE')
+    liberar = threading.Timer(0.1, lambda: otra.execute('COMMIT'))
+    liberar.start()
+    try:
+        with transaction.atomic(using=ALIAS):
+            connections[ALIAS].cursor().execute("INSERT INTO dato (valor) VALUES ('x')")
+    finally:
+        liberar.join()
+        otra.close()
+
+    with connections[ALIAS].cursor() as cursor:
+        cursor.execute('SELECT count(*) FROM dato')
+        assert cursor.fetchone()[0] == 1
+
+
+def test_con_reintentos_solo_reintenta_bloqueos(settings):
+    settings.SQLITE_ESPERA_REINTENTO = 0
+    intentos = []
+
+    def bloqueada():
+        intentos.append(1)
+        if len(intentos) < 3:
+            raise OperationalError('database is locked')
+        return 'ok'
+
+    assert con_reintentos(bloqueada) == 'ok'
+    assert len(intentos) == 3
+
+    def sin_tabla():
+        intentos.append(1)
+        raise OperationalError('no such table: dato')
+
+    intentos.clear()
+    with pytest.raises(OperationalError, match='no such table'):
+        con_reintentos(sin_tabla)
+    assert len(intentos) == 1
+
+
+def test_medir_concurrencia_sqlite():
+    salida = StringIO()
+    call_command(
+        'medir_concurrencia_sqlite', segundos=0.2, escritores=2, lectores=1, filas=100,
+        stdout=salida,
+    )
+    assert 'defecto' in salida.getvalue()
+    assert 'producción' in salida.getvalue()
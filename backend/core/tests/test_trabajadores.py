@@ -0,0 +1,47 @@
+# backend/core/tests/test_trabajadores.py
+
+import pytest
+
+from core.models import AuditoriaLog
+
+from .datos import cliente_de, crear_trabajadores
+
+
+@pytest.fixture
+def trabajador(datos_iniciales):
+    trabajador, = crear_trabajadores(1)
+    return trabajador
+
+
+@pytest.fixture
+def cuenta_vista(django_capture_on_commit_callbacks):
+    def ver(usuario, trabajador):
+        # La auditoría se encola al confirmar la transacción
+        with django_capture_on_commit_callbacks(execute=True):
+            respuesta = cliente_de(usuario).get(f'/api/trabajadores/{trabajador.pk}/')
+        assert respuesta.status_code == 200
+        return respuesta.data['numero_cuenta_bancaria']
+    return ver
+
+
+def vistas_sensibles(trabajador):
+    return AuditoriaLog.objects.filter(accion='VIEW_SENSITIVE', registro_id=trabajador.pk).count()
+
+
+def test_digitador_ve_la_cuenta_oculta(cuenta_vista, digitador, trabajador):
+    assert cuenta_vista(digitador, trabajador) == 'N/A'
+
+    trabajador.numero_cuenta_bancaria = '0011223344'
+    trabajador.save()
+    assert cuenta_vista(digitador, trabajador) == '****3344'
+    assert vistas_sensibles(trabajador) == 0
+
+
+def test_super_admin_ve_la_cuenta_y_queda_auditado(cuenta_vista, admin, trabajador):
+    assert cuenta_vista(admin, trabajador) in ('', None)
+    assert vistas_sensibles(trabajador) == 0
+
+    trabajador.numero_cuenta_bancaria = '0011223344'
+    trabajador.save()
+    assert cuenta_vista(admin, trabajador) == '0011223344'
+    assert vistas_sensibles(trabajador) == 1
@@ -0,0 +1,36 @@
+# backend/core/tests/test_variables.py
+
+from decimal import Decimal
+
+import pytest
+
+from core.models import VariablesNomina
+from core.services.variables import CacheVariablesNomina
+from core.services.versiones import incrementar
+
+from .datos import FECHA_FIN
+
+
+@pytest.fixture
+def cache_variables(datos_iniciales):
+    return CacheVariablesNomina()
+
+
+def test_reutiliza_variables_mientras_no_cambie_la_version(cache_variables, django_assert_num_queries):
+    cache_variables.vigentes(FECHA_FIN)
+    # Solo la consulta de la versión
+    with django_assert_num_queries(1):
+        cache_variables.vigentes(FECHA_FIN)
+    assert cache_variables.aciertos == 1
+
+
+def test_ve_cambios_hechos_por_otro_proceso(cache_variables):
+    antes = cache_variables.valor(VariablesNomina.SALARIO_MINIMO, FECHA_FIN)
+
+    # Otro proceso: su señal invalida solo su propio cache, pero sube la versión
+    VariablesNomina.objects.filter(nombre=VariablesNomina.SALARIO_MINIMO).update(
+        valor=antes + Decimal('1000')
+    )
+    incrementar('variablesnomina')
+
+    assert cache_variables.valor(VariablesNomina.SALARIO_MINIMO, FECHA_FIN) == antes + Decimal('1000')
@@ -1,8 +1,15 @@
 # backend/core/views.py
 
-from rest_framework import viewsets, status, permissions
+import hashlib
+
+from rest_framework import viewsets, status, permissions, serializers
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
@@ -15,21 +22,221 @@ from .models import (
 from .serializers import *
 from .permissions import IsSuperAdmin, IsDigitadorOrAbove, ReadOnly
 from .filters import *
+from .pagination import RegistroLaborPagination, AuditoriaLogPagination
+from .querysets import (
+    optimizar, precio_actual_subquery,
+    PLAN_USUARIOS, PLAN_TRABAJADORES, PLAN_LABORES, PLAN_PRECIOS, PLAN_VARIABLES,
+    PLAN_REGISTROS, PLAN_NOMINAS, PLAN_PRESTAMOS, PLAN_AUDITORIA
+)
+from .services.nomina import calcular_quincena, CalculoNominaError
+from .services.precios import ResolvedorPrecios
+from .services.variables import variables_nomina
+from .services.registros import insertar_registros
+from .services.exportacion import exportar_queryset
+from .services.versiones import nombre_catalogo, sello
+from .services.respuestas import respuestas_catalogos
+from .services import auditoria, busqueda
+from .db import router
+
+# ============================================================================
+# CAMPOS DINÁMICOS
+# ============================================================================
+
+class CamposDinamicosMixin:
+    """
+    ?fields=id,trabajador,... limita los campos de list/retrieve y
+    ?expand=labor_info,... elige qué objetos anidados (*_info, detalles,
+    cuotas) se incluyen; un anidado nombrado en fields también se incluye.
+    Sin ninguno de los dos parámetros la respuesta es completa.
+    plan_consulta relaciona cada campo anidado con lo que hay que cargar,
+    para no hacer joins ni prefetch de lo que no se va a serializar.
+    """
+    plan_consulta = {}
+    acciones_lectura = ('list', 'retrieve')
+    
+    def parametro_lista(self, nombre):
+        """Conjunto de valores separados por comas, o None si no viene"""
+        valor = self.request.query_params.get(nombre)
+        if valor is None:
+            return None
+        return {campo.strip() for campo in valor.split(',') if campo.strip()}
+    
+    def campos_expandidos(self):
+        """Campos anidados a incluir, o None si se incluyen todos"""
+        campos = self.parametro_lista('fields')
+        expandir = self.parametro_lista('expand')
+        if campos is None and expandir is None:
+            return None
+        # expand=labor equivale a expand=labor_info
+        expandidos = set(campos or ())
+        for nombre in expandir or ():
+            expandidos.update((nombre, f'{nombre}_info'))
+        return expandidos
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in self.acciones_lectura and self.plan_consulta:
+            queryset = optimizar(queryset, self.plan_consulta, self.campos_expandidos())
+        return queryset
+    
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.action in self.acciones_lectura:
+            self.recortar_campos(getattr(serializer, 'child', serializer))
+        return serializer
+    
+    def recortar_campos(self, serializer):
+        expandidos = self.campos_expandidos()
+        if expandidos is None:
+            return
+        campos = self.parametro_lista('fields')
+        for nombre, campo in list(serializer.fields.items()):
+            if isinstance(campo, serializers.BaseSerializer):
+                incluir = nombre in expandidos
+            else:
+                incluir = campos is None or nombre in campos
+            if not incluir:
+                serializer.fields.pop(nombre)
+
+
+# ============================================================================
+# RESPUESTAS CONDICIONALES
+# ============================================================================
+
+class ETagCatalogoMixin:
+    """
+    ETag fuerte en list/retrieve calculado con las versiones de los
+    catálogos de los que depende la respuesta (services.versiones), sin
+    consultar los datos. Si If-None-Match coincide responde 304 sin
+    serializar nada.
+    """
+    catalogos = ()  # modelos cuyos cambios alteran la respuesta
+    etag_diario = False  # la respuesta depende de la fecha (precio_actual)
+    
+    def calcular_etag(self, request):
+        # Las versiones se leen antes que los datos: si la versión es nueva,
+        # los datos que se consulten después también lo son
+        partes = [
+            sello(nombre_catalogo(modelo) for modelo in self.catalogos),
+            # Con esquema y host: los enlaces next/previous de la paginación son absolutos
+            request.build_absolute_uri(),
+            request.accepted_renderer.format,
+        ]
+        if self.etag_diario:
+            partes.append(timezone.now().date().isoformat())
+        return '"%s"' % hashlib.sha1('|'.join(partes).encode()).hexdigest()
+    
+    def respuesta_condicional(self, request, generar, *args, **kwargs):
+        etag = self.calcular_etag(request)
+        etags_cliente = parse_etags(request.headers.get('If-None-Match', ''))
+        if etag in etags_cliente or '*' in etags_cliente:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = self.generar_respuesta(etag, generar, request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+    
+    def generar_respuesta(self, etag, generar, request, *args, **kwargs):
+        return generar(request, *args, **kwargs)
+    
+    def list(self, request, *args, **kwargs):
+        return self.respuesta_condicional(request, super().list, *args, **kwargs)
+    
+    def retrieve(self, request, *args, **kwargs):
+        return self.respuesta_condicional(request, super().retrieve, *args, **kwargs)
+
+
+class CacheCatalogoMixin(ETagCatalogoMixin):
+    """
+    Además del ETag, guarda los datos serializados de list/retrieve en
+    services.respuestas con el ETag como clave, que ya incluye las versiones
+    de los catálogos, la URL (con el host) y el formato.
+    """
+    
+    def generar_respuesta(self, etag, generar, request, *args, **kwargs):
+        vista = self.basename
+        clave = 'respuesta:%s:%s' % (vista, etag.strip('"'))
+        datos = respuestas_catalogos.obtener(vista, clave)
+        if datos is not None:
+            return Response(datos)
+        
+        response = generar(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            respuestas_catalogos.guardar(clave, response.data)
+        return response
+    
+    @action(detail=False, methods=['get'])
+    def cache(self, request):
+        """Aciertos y fallos del cache de respuestas de esta vista en el proceso"""
+        return Response(respuestas_catalogos.estadisticas(self.basename))
+
+
+class AuditoriaMixin:
+    """
+    Activa la auditoría (core.services.auditoria) durante las peticiones que
+    escriben: las señales registran CREATE, UPDATE y DELETE con el usuario y
+    la IP de la petición.
+    """
+    
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in permissions.SAFE_METHODS:
+            self._contexto_auditoria = auditoria.activar_contexto(
+                request.user.pk, auditoria.ip_cliente(request)
+            )
+    
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_contexto_auditoria', None)
+        if token is not None:
+            auditoria.desactivar_contexto(token)
+            self._contexto_auditoria = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ReplicaLecturaMixin:
+    """
+    Las acciones de acciones_replica leen de la réplica (core.db.router)
+    cuando está configurada y el usuario no escribió hace poco; el resto, y
+    cualquier escritura, usan la primaria.
+    """
+    acciones_replica = ()
+    
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            request.method in permissions.SAFE_METHODS
+            and self.action in self.acciones_replica
+            and router.replica_configurada()
+            and not router.fijado_a_primaria(request.user.pk)
+        ):
+            router.usar_replica()
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Explícito: las exportaciones se consumen después de la vista
+        if router.leyendo_replica():
+            queryset = queryset.using(router.ALIAS_REPLICA)
+        return queryset
+
 
 # ============================================================================
 # USUARIOS Y ROLES
 # ============================================================================
 
-class RolViewSet(viewsets.ReadOnlyModelViewSet):
+class RolViewSet(CacheCatalogoMixin, CamposDinamicosMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet de solo lectura para Roles"""
     queryset = Rol.objects.all()
+    catalogos = (Rol,)
     serializer_class = RolSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
-class UsuarioViewSet(viewsets.ModelViewSet):
+class UsuarioViewSet(AuditoriaMixin, CamposDinamicosMixin, viewsets.ModelViewSet):
     """ViewSet para gestión de usuarios"""
     queryset = Usuario.objects.all()
+    plan_consulta = PLAN_USUARIOS
     permission_classes = [IsSuperAdmin]
     filter_backends = [SearchFilter, OrderingFilter]
     search_fields = ['username', 'email', 'first_name', 'last_name']
@@ -46,30 +253,61 @@ class UsuarioViewSet(viewsets.ModelViewSet):
 # TRABAJADORES
 # ============================================================================
 
-class TipoContratoViewSet(viewsets.ReadOnlyModelViewSet):
+class TipoContratoViewSet(CacheCatalogoMixin, CamposDinamicosMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet de solo lectura para Tipos de Contrato"""
     queryset = TipoContrato.objects.all()
+    catalogos = (TipoContrato,)
     serializer_class = TipoContratoSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
-class TrabajadorViewSet(viewsets.ModelViewSet):
+class TrabajadorViewSet(AuditoriaMixin, CamposDinamicosMixin, viewsets.ModelViewSet):
     """ViewSet para gestión de trabajadores"""
     queryset = Trabajador.objects.all()
+    plan_consulta = PLAN_TRABAJADORES
+    acciones_lectura = ('list', 'retrieve', 'buscar')
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    # ?search= lo resuelve TrabajadorFilter con el índice de búsqueda
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = TrabajadorFilter
-    search_fields = ['nombres', 'apellidos', 'numero_documento']
     ordering_fields = ['apellidos', 'fecha_ingreso', 'created_at']
     ordering = ['apellidos', 'nombres']
     
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in ['list', 'buscar']:
             return TrabajadorListSerializer
         elif self.action in ['create', 'update', 'partial_update']:
             return TrabajadorCreateUpdateSerializer
         return TrabajadorDetailSerializer
     
+    @action(detail=False, methods=['get'])
+    def buscar(self, request):
+        """
+        Búsqueda para el selector de trabajadores, ordenada por relevancia:
+        ?q=munoz 1000 (sin tildes; cada término como prefijo de un nombre o
+        del documento), ?estado=ACTIVO y ?limite= (20 por defecto, máximo 100)
+        """
+        texto = request.query_params.get('q', '').strip()
+        if not texto:
+            return Response(
+                {'detail': 'Indique el texto a buscar en el parámetro q'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limite = min(max(int(request.query_params.get('limite', 20)), 1), 100)
+        except ValueError:
+            return Response(
+                {'detail': 'limite debe ser un número'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        ids = busqueda.buscar(texto, limite, estado=request.query_params.get('estado'))
+        trabajadores = self.get_queryset().in_bulk(ids)
+        serializer = self.get_serializer(
+            [trabajadores[pk] for pk in ids if pk in trabajadores], many=True
+        )
+        return Response(serializer.data)
+    
     @action(detail=True, methods=['post'])
     def activar(self, request, pk=None):
         """Activar trabajador"""
@@ -93,16 +331,20 @@ class TrabajadorViewSet(viewsets.ModelViewSet):
 # CATÁLOGOS
 # ============================================================================
 
-class UnidadMedidaViewSet(viewsets.ReadOnlyModelViewSet):
+class UnidadMedidaViewSet(CacheCatalogoMixin, CamposDinamicosMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet de solo lectura para Unidades de Medida"""
     queryset = UnidadMedida.objects.all()
+    catalogos = (UnidadMedida,)
     serializer_class = UnidadMedidaSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
-class LaborViewSet(viewsets.ModelViewSet):
+class LaborViewSet(CacheCatalogoMixin, AuditoriaMixin, CamposDinamicosMixin, viewsets.ModelViewSet):
     """ViewSet para gestión de labores"""
     queryset = Labor.objects.all()
+    plan_consulta = PLAN_LABORES
+    catalogos = (Labor, UnidadMedida, ListaPrecios)
+    etag_diario = True
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_class = LaborFilter
@@ -110,15 +352,24 @@ class LaborViewSet(viewsets.ModelViewSet):
     ordering_fields = ['codigo', 'nombre', 'created_at']
     ordering = ['nombre']
     
+    def get_queryset(self):
+        # precio_actual anotado con la fecha de cada petición
+        return super().get_queryset().annotate(precio_vigente=precio_actual_subquery())
+    
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
             return LaborCreateUpdateSerializer
         return LaborListSerializer
 
 
-class ListaPreciosViewSet(viewsets.ModelViewSet):
+class ListaPreciosViewSet(CacheCatalogoMixin, AuditoriaMixin, CamposDinamicosMixin, viewsets.ModelViewSet):
     """ViewSet para gestión de precios"""
     queryset = ListaPrecios.objects.all()
+    plan_consulta = PLAN_PRECIOS
+    # Sin Usuario: cada inicio de sesión invalidaría la respuesta. created_by_info
+    # muestra los datos del usuario de cuando se guardó la respuesta.
+    catalogos = (ListaPrecios, Labor, UnidadMedida)
+    etag_diario = True  # vigente y precio_actual dependen de la fecha
     permission_classes = [IsDigitadorOrAbove]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['labor', 'fecha_inicio_vigencia']
@@ -132,12 +383,35 @@ class ListaPreciosViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
-
-
-class VariablesNominaViewSet(viewsets.ModelViewSet):
+    
+    @action(detail=False, methods=['post'])
+    def resolver(self, request):
+        """Resolver en una sola llamada el precio de muchos pares (labor, fecha)"""
+        serializer = ResolverPreciosSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        consultas = [
+            (consulta['labor'], consulta['fecha'])
+            for consulta in serializer.validated_data['consultas']
+        ]
+        
+        resolvedor = ResolvedorPrecios.cargar(
+            labor_ids={labor_id for labor_id, _ in consultas},
+            fecha_desde=min(fecha for _, fecha in consultas),
+            fecha_hasta=max(fecha for _, fecha in consultas),
+        )
+        resultados = [
+            {'labor': labor_id, 'fecha': fecha, 'precio': precio}
+            for (labor_id, fecha), precio in zip(consultas, resolvedor.precios(consultas))
+        ]
+        return Response({'resultados': resultados})
+
+
+class VariablesNominaViewSet(ETagCatalogoMixin, AuditoriaMixin, CamposDinamicosMixin, viewsets.ModelViewSet):
     """ViewSet para gestión de variables de nómina"""
     queryset = VariablesNomina.objects.all()
     serializer_class = VariablesNominaSerializer
+    plan_consulta = PLAN_VARIABLES
+    catalogos = (VariablesNomina,)  # sin Usuario, como ListaPreciosViewSet
     permission_classes = [IsDigitadorOrAbove]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['nombre']
@@ -145,28 +419,67 @@ class VariablesNominaViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
+    
+    @action(detail=False, methods=['get'])
+    def cache(self, request):
+        """Estadísticas del cache de variables de nómina del proceso"""
+        return Response(variables_nomina.estadisticas())
 
 
 # ============================================================================
 # QUINCENAS Y REGISTROS
 # ============================================================================
 
-class QuincenaViewSet(viewsets.ModelViewSet):
+class QuincenaViewSet(AuditoriaMixin, CamposDinamicosMixin, viewsets.ModelViewSet):
     """ViewSet para gestión de quincenas"""
     queryset = Quincena.objects.all()
     serializer_class = QuincenaSerializer
     permission_classes = [IsDigitadorOrAbove]
     filter_backends = [OrderingFilter]
     ordering = ['-año', '-mes', '-numero']
-
-
-class RegistroLaborViewSet(viewsets.ModelViewSet):
+    
+    @action(detail=True, methods=['post'], permission_classes=[IsSuperAdmin])
+    def calcular(self, request, pk=None):
+        """
+        Calcular la nómina de la quincena.
+        modo=incremental recalcula solo las nóminas marcadas como pendientes.
+        procesos=N reparte el cálculo entre N procesos.
+        """
+        quincena = self.get_object()
+        modo = request.data.get('modo', 'completo')
+        if modo not in ('completo', 'incremental'):
+            return Response(
+                {'detail': "modo debe ser 'completo' o 'incremental'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            procesos = int(request.data.get('procesos', 0)) or None
+        except (TypeError, ValueError):
+            return Response(
+                {'detail': 'procesos debe ser un número entero'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            resumen = calcular_quincena(
+                quincena, usuario=request.user,
+                incremental=modo == 'incremental', procesos=procesos
+            )
+        except CalculoNominaError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = self.get_serializer(quincena)
+        return Response({'quincena': serializer.data, 'resumen': resumen})
+
+
+class RegistroLaborViewSet(ReplicaLecturaMixin, AuditoriaMixin, CamposDinamicosMixin, viewsets.ModelViewSet):
     """ViewSet para gestión de registros de labores"""
     queryset = RegistroLabor.objects.all()
+    plan_consulta = PLAN_REGISTROS
     permission_classes = [IsDigitadorOrAbove]
-    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    pagination_class = RegistroLaborPagination
+    acciones_replica = ('list', 'export')
+    filter_backends = [DjangoFilterBackend]
     filterset_class = RegistroLaborFilter
-    ordering = ['-fecha', 'trabajador']
     
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
@@ -178,29 +491,146 @@ class RegistroLaborViewSet(viewsets.ModelViewSet):
     
     def perform_update(self, serializer):
         serializer.save(updated_by=self.request.user)
+    
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """
+        Carga masiva de registros. Valida cada fila contra trabajadores,
+        labores y quincenas cargados una sola vez e inserta las válidas con
+        bulk_create. Con todo_o_nada=true no inserta nada si alguna falla.
+        """
+        lote = RegistroLaborBatchSerializer(data=request.data)
+        lote.is_valid(raise_exception=True)
+        filas = lote.validated_data['registros']
+        todo_o_nada = lote.validated_data['todo_o_nada']
+        
+        # Catálogos del lote con una consulta por tabla
+        def ids(campo):
+            return [
+                fila[campo] for fila in filas
+                if str(fila.get(campo, '')).isdigit()
+            ]
+        context = self.get_serializer_context()
+        context['trabajadores'] = Trabajador.objects.only('id').in_bulk(ids('trabajador'))
+        context['labores'] = Labor.objects.only('id').in_bulk(ids('labor'))
+        context['quincenas'] = Quincena.objects.in_bulk(ids('quincena'))
+        
+        # Un solo serializer reutilizado para todas las filas
+        serializer = RegistroLaborCreateUpdateSerializer(context=context)
+        registros = []
+        errores = []
+        for numero, fila in enumerate(filas):
+            try:
+                datos = serializer.run_validation(fila)
+            except ValidationError as exc:
+                errores.append({'fila': numero, 'errores': exc.detail})
+                continue
+            registros.append(RegistroLabor(**datos, created_by=request.user))
+        
+        if errores and (todo_o_nada or not registros):
+            return Response(
+                {'creados': 0, 'errores': errores},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        with transaction.atomic():
+            insertar_registros(registros)
+        
+        return Response(
+            {'creados': len(registros), 'errores': errores},
+            status=status.HTTP_201_CREATED
+        )
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Exportar a CSV (streaming) los registros que cumplen los filtros"""
+        queryset = self.filter_queryset(self.get_queryset())
+        return exportar_queryset(queryset, [
+            ('id', 'id'),
+            ('fecha', 'fecha'),
+            ('año', 'quincena__año'),
+            ('mes', 'quincena__mes'),
+            ('quincena', 'quincena__numero'),
+            ('numero_documento', 'trabajador__numero_documento'),
+            ('apellidos', 'trabajador__apellidos'),
+            ('nombres', 'trabajador__nombres'),
+            ('codigo_labor', 'labor__codigo'),
+            ('labor', 'labor__nombre'),
+            ('unidad_medida', 'labor__unidad_medida__nombre'),
+            ('cantidad', 'cantidad'),
+            ('observaciones', 'observaciones'),
+            ('created_at', 'created_at'),
+        ], 'registros_labor.csv')
 
 
 # ============================================================================
 # NÓMINA
 # ============================================================================
 
-class NominaViewSet(viewsets.ModelViewSet):
+class NominaViewSet(ReplicaLecturaMixin, AuditoriaMixin, CamposDinamicosMixin, viewsets.ModelViewSet):
     """ViewSet para gestión de nóminas"""
     queryset = Nomina.objects.all()
     serializer_class = NominaSerializer
+    plan_consulta = PLAN_NOMINAS
     permission_classes = [IsDigitadorOrAbove]
+    acciones_replica = ('list', 'retrieve', 'export')
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = NominaFilter
     ordering = ['-quincena', 'trabajador']
+    
+    def incluir_detalles(self):
+        """
+        El listado omite los detalles salvo que se pidan con
+        ?incluir_detalles=1 o ?expand=detalles
+        """
+        if self.action != 'list':
+            return True
+        pedidos = (self.parametro_lista('expand') or set()) | (self.parametro_lista('fields') or set())
+        valor = self.request.query_params.get('incluir_detalles', '')
+        return 'detalles' in pedidos or valor.lower() in ('1', 'true', 'si', 'sí')
+    
+    def campos_expandidos(self):
+        expandidos = super().campos_expandidos()
+        if self.incluir_detalles():
+            return expandidos
+        if expandidos is None:
+            expandidos = set(self.plan_consulta)
+        return expandidos - {'detalles'}
+    
+    def get_serializer_class(self):
+        if self.action == 'list' and not self.incluir_detalles():
+            return NominaListSerializer
+        return NominaSerializer
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Exportar a CSV (streaming) las nóminas que cumplen los filtros"""
+        queryset = self.filter_queryset(self.get_queryset())
+        return exportar_queryset(queryset, [
+            ('id', 'id'),
+            ('año', 'quincena__año'),
+            ('mes', 'quincena__mes'),
+            ('quincena', 'quincena__numero'),
+            ('numero_documento', 'trabajador__numero_documento'),
+            ('apellidos', 'trabajador__apellidos'),
+            ('nombres', 'trabajador__nombres'),
+            ('banco', 'trabajador__banco'),
+            ('total_devengado', 'total_devengado'),
+            ('total_deducciones', 'total_deducciones'),
+            ('total_neto', 'total_neto'),
+            ('estado', 'estado'),
+            ('fecha_calculo', 'fecha_calculo'),
+        ], 'nominas.csv')
 
 
 # ============================================================================
 # PRÉSTAMOS
 # ============================================================================
 
-class PrestamoViewSet(viewsets.ModelViewSet):
+class PrestamoViewSet(AuditoriaMixin, CamposDinamicosMixin, viewsets.ModelViewSet):
     """ViewSet para gestión de préstamos"""
     queryset = Prestamo.objects.all()
+    plan_consulta = PLAN_PRESTAMOS
     permission_classes = [IsDigitadorOrAbove]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = PrestamoFilter
@@ -213,17 +643,76 @@ class PrestamoViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Registrar un lote de préstamos en una sola transacción"""
+        datos = request.data
+        if not isinstance(datos, list):
+            return Response(
+                {'detail': 'Se espera una lista de préstamos'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Trabajadores del lote cargados con una sola consulta
+        trabajador_ids = {
+            item.get('trabajador') for item in datos if isinstance(item, dict)
+        }
+        context = self.get_serializer_context()
+        context['trabajadores'] = Trabajador.objects.in_bulk(
+            [pk for pk in trabajador_ids if str(pk).isdigit()]
+        )
+        
+        serializer = PrestamoCreateSerializer(data=datos, many=True, context=context)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            prestamos = serializer.save(created_by=request.user)
+        
+        return Response({
+            'creados': len(prestamos),
+            'prestamos': [
+                {
+                    'id': prestamo.id,
+                    'trabajador': prestamo.trabajador_id,
+                    'monto_total': prestamo.monto_total,
+                    'numero_cuotas': prestamo.numero_cuotas,
+                    'valor_cuota': prestamo.valor_cuota,
+                }
+                for prestamo in prestamos
+            ]
+        }, status=status.HTTP_201_CREATED)
 
 
 # ============================================================================
 # AUDITORÍA
 # ============================================================================
 
-class AuditoriaLogViewSet(viewsets.ReadOnlyModelViewSet):
+class AuditoriaLogViewSet(ReplicaLecturaMixin, CamposDinamicosMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet de solo lectura para logs de auditoría"""
     queryset = AuditoriaLog.objects.all()
     serializer_class = AuditoriaLogSerializer
+    plan_consulta = PLAN_AUDITORIA
     permission_classes = [IsSuperAdmin]
-    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    pagination_class = AuditoriaLogPagination
+    acciones_replica = ('list', 'retrieve')
+    filter_backends = [DjangoFilterBackend]
     filterset_fields = ['accion', 'tabla_afectada', 'usuario']
-    ordering = ['-created_at']
\ No newline at end of file
+    
+    def incluir_archivo(self):
+        """?incluir_archivo=1 agrega al listado las entradas archivadas"""
+        if self.action != 'list':
+            return False
+        valor = self.request.query_params.get('incluir_archivo', '')
+        return valor.lower() in ('1', 'true', 'si', 'sí')
+    
+    def filtros_archivo(self):
+        """Los mismos filtros de filterset_fields, para aplicarlos al archivo"""
+        return {
+            campo: self.request.query_params[campo]
+            for campo in self.filterset_fields if self.request.query_params.get(campo)
+        }
+    
+    @action(detail=False, methods=['get'])
+    def escritor(self, request):
+        """Estado del escritor de auditoría en segundo plano de este proceso"""
+        return Response(auditoria.escritor.estadisticas())